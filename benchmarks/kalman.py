@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""Compare the scalar and matrix forms of the time-to-empty Kalman filter.
+
+Both filters run over the same synthetic series of daily meter readings,
+and the best time per observation of each is reported.  The check fails
+if the two forms disagree or if the scalar form is not faster.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tsd.time_to_empty import (  # noqa: E402
+    kalman_filter_random_walk_rate,
+    kalman_filter_random_walk_rate_matrix,
+)
+
+SIGMAS = {"sigma_r": 0.5, "sigma_q": 0.25, "sigma_z": 0.5}
+
+
+def meter_readings(days: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return daily readings of a meter that is used and refilled."""
+
+    rng = np.random.default_rng(seed)
+    t_days = np.arange(days, dtype=float)
+    use = rng.gamma(2.0, 1.5, size=days)
+    quantities = np.round(1000.0 - np.cumsum(use)) % 1000.0
+    return t_days, quantities
+
+
+def best_seconds(run: Callable[[], object], repeat: int) -> float:
+    """Return the fastest of *repeat* timed calls of *run*."""
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Time both filters and check that they agree."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=3650,
+        help="Number of daily readings (default: 3650)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs per filter; the fastest counts (default: 5)",
+    )
+    args = parser.parse_args(argv)
+
+    t_days, quantities = meter_readings(args.days, seed=1)
+    scalar = kalman_filter_random_walk_rate(t_days, quantities, **SIGMAS)
+    matrix = kalman_filter_random_walk_rate_matrix(
+        t_days, quantities, **SIGMAS
+    )
+    agree = all(
+        np.allclose(fast, reference, rtol=1e-9, atol=1e-12)
+        for fast, reference in zip(scalar, matrix)
+    )
+
+    timings = {
+        "scalar": best_seconds(
+            lambda: kalman_filter_random_walk_rate(
+                t_days, quantities, **SIGMAS
+            ),
+            args.repeat,
+        ),
+        "matrix": best_seconds(
+            lambda: kalman_filter_random_walk_rate_matrix(
+                t_days, quantities, **SIGMAS
+            ),
+            args.repeat,
+        ),
+    }
+    for name, seconds in timings.items():
+        print(
+            f"kalman {name:6s} {args.days:6d} obs"
+            f" {seconds * 1000:8.2f} ms"
+            f" {seconds / args.days * 1e6:7.2f} us/obs"
+        )
+    speedup = timings["matrix"] / timings["scalar"]
+    print(f"kalman speedup {speedup:.1f}x")
+
+    failed = False
+    if not agree:
+        print("kalman scalar and matrix filters DISAGREE")
+        failed = True
+    if speedup <= 1.0:
+        print("kalman scalar filter is NOT FASTER")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
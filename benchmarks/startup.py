@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+"""Check the start-up cost of the command-line entry points.
+
+Each entry point's module is imported under ``python -X importtime``.
+The check fails if a module pulls in a heavy package it should not, or a
+third-party package that is not listed for it in ``startup_budget.json``,
+or if its cumulative import time exceeds the budget in the same file.
+Each import is timed several times and the fastest counts, and recorded
+budgets are several times the measured time, so that timing noise on
+shared machines does not fail the check.  Use ``--record`` to rewrite
+the budget from the current measurements.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import sysconfig
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "startup_budget.json"
+
+PLOTTING_MODULES = ("matplotlib", "seaborn")
+HEAVY_MODULES = PLOTTING_MODULES + ("dateutil", "numpy", "pandas")
+
+# Entry point -> (module imported to run it, packages it must not load).
+# The plotting commands compute with numpy but should only load a
+# plotting library when they draw.
+ENTRY_POINTS = {
+    "tsd": ("tsd.cli", HEAVY_MODULES),
+    "tsd-today": ("tsd.today", HEAVY_MODULES),
+    "tsd-plot": ("tsd_plot.cli", PLOTTING_MODULES),
+    "tsd-season-plot": ("tsd_plot.seasonal", PLOTTING_MODULES),
+}
+RECORD_HEADROOM = 5.0
+OWN_PACKAGES = ("tsd", "tsd_plot")
+STDLIB_DIRS = tuple(
+    os.path.realpath(sysconfig.get_paths()[key])
+    for key in ("stdlib", "platstdlib")
+)
+
+
+def import_profile(module: str) -> List[str]:
+    """Return the ``-X importtime`` lines for importing *module*."""
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    src_path = str(REPO_ROOT / "src")
+    existing = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = (
+        src_path if not existing else src_path + os.pathsep + existing
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return [
+        line
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+
+
+def cumulative_us(lines: List[str], module: str) -> int:
+    """Return the cumulative import time of top-level *module*."""
+
+    for line in lines:
+        _, cumulative, name = line.split("|")
+        if name.rstrip() == f" {module}":
+            return int(cumulative)
+    raise ValueError(f"{module} not found in import profile")
+
+
+def module_imports(lines: List[str], module: str) -> List[str]:
+    """Return the modules imported while importing top-level *module*.
+
+    A module's imports are listed just before it, indented, so they are
+    the lines since the previous unindented one.  Modules that the
+    interpreter loaded at start-up are not included.
+    """
+
+    names: List[str] = []
+    for line in lines:
+        name = line.split("|")[2].rstrip()
+        if name == f" {module}":
+            return names
+        if not name.startswith("  "):
+            names = []
+        else:
+            names.append(name.strip())
+    raise ValueError(f"{module} not found in import profile")
+
+
+def is_third_party(package: str) -> bool:
+    """Return True if top-level *package* is installed from outside.
+
+    The profile also lists failed optional imports; a package that
+    cannot be found is one of those and does not count.
+    """
+
+    if package in OWN_PACKAGES or package in sys.builtin_module_names:
+        return False
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        return False
+    if spec is None or spec.origin in ("built-in", "frozen"):
+        return False
+    stdlib_names = getattr(sys, "stdlib_module_names", None)
+    if stdlib_names is not None:
+        return package not in stdlib_names
+    if spec.origin is None:
+        return True
+    path = os.path.realpath(spec.origin)
+    parts = path.split(os.sep)
+    if "site-packages" in parts or "dist-packages" in parts:
+        return True
+    return not path.startswith(tuple(root + os.sep for root in STDLIB_DIRS))
+
+
+def third_party_packages(names: List[str]) -> List[str]:
+    """Return the top-level third-party packages among *names*."""
+
+    packages = {name.split(".")[0] for name in names}
+    return sorted(package for package in packages if is_third_party(package))
+
+
+def forbidden_imports(
+    names: List[str], forbidden: Tuple[str, ...]
+) -> List[str]:
+    """Return the *forbidden* top-level packages among *names*."""
+
+    return sorted({name.split(".")[0] for name in names} & set(forbidden))
+
+
+def measure(
+    module: str, forbidden: Tuple[str, ...], repeat: int
+) -> Dict[str, object]:
+    """Return the best import time and the packages *module* imports."""
+
+    import_profile(module)  # warm the bytecode cache
+    best = None
+    names: List[str] = []
+    for _ in range(repeat):
+        lines = import_profile(module)
+        elapsed = cumulative_us(lines, module)
+        best = elapsed if best is None else min(best, elapsed)
+        names = module_imports(lines, module)
+    return {
+        "us": best,
+        "heavy": forbidden_imports(names, forbidden),
+        "packages": third_party_packages(names),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Measure every entry point and compare with the budget."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Imports per entry point; the fastest counts (default: 5)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help=(
+            f"Write {RECORD_HEADROOM:g}x the measured times to "
+            f"{BUDGET_FILE.name} instead of checking them"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    budget = {}
+    if not args.record:
+        budget = json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+
+    failed = False
+    recorded = {}
+    for entry_point, (module, forbidden) in ENTRY_POINTS.items():
+        result = measure(module, forbidden, args.repeat)
+        elapsed = int(result["us"])
+        recorded[entry_point] = {
+            "packages": result["packages"],
+            "us": int(round(elapsed * RECORD_HEADROOM, -3)),
+        }
+        line = f"{entry_point:16s} {module:18s} {elapsed / 1000:7.1f} ms"
+        if not args.record:
+            limit = budget[entry_point]["us"]
+            line += f"  (budget {limit / 1000:.1f} ms)"
+            if elapsed > limit:
+                line += "  OVER BUDGET"
+                failed = True
+            unlisted = sorted(
+                set(result["packages"]) - set(budget[entry_point]["packages"])
+            )
+            if unlisted:
+                line += "  new packages " + ", ".join(unlisted)
+                failed = True
+        if result["heavy"]:
+            line += "  imports " + ", ".join(result["heavy"])
+            failed = True
+        print(line)
+
+    if args.record:
+        BUDGET_FILE.write_text(
+            json.dumps(recorded, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"Recorded budget in {BUDGET_FILE}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
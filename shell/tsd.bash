@@ -2,9 +2,19 @@
 # names and tsd subcommands.
 
 
-# Shared helper: list all known series names.
+# Shared helper: list all known series names.  tsd keeps them in a cache
+# whose first line is the series directory; the cache is valid while it is
+# newer than that directory.  Otherwise ask tsd, which refreshes it.
 _tsd_series_names() {
-    tsd -L 2>/dev/null
+    local cache="${XDG_CACHE_HOME:-$HOME/.cache}/tsd/series-names"
+    local dir names
+    if [ -r "$cache" ] && IFS= read -r dir < "$cache" \
+	    && [ "$cache" -nt "$dir" ]; then
+	mapfile -t -s 1 names < "$cache"
+	printf '%s\n' "${names[@]}"
+    else
+	tsd --complete "" 2>/dev/null
+    fi
 }
 
 # Completions for tsd
@@ -21,7 +31,7 @@ _tsd()
     fi
 
     if [ Xtsd = X${prev} ]; then
-	completions=$(tsd -L)
+	completions=$(_tsd_series_names)
 	COMPREPLY=( $(compgen -W "$completions" -- ${cur}) )
 	return 0
     fi
@@ -124,20 +134,26 @@ _tsd_plot() {
     case "$cur" in
         -*)
             local opts="--sum --bin --bin-width --bin-function
-                        --format -t --title -y --y-label --std -v --verbose"
+                        --format --density --log-density --zoom -t --title -y --y-label --std
+                        --no-plot --stats-format --quantiles
+                        -o --output --no-cache -v --verbose"
             COMPREPLY=( $(compgen -W "$opts" -- "$cur") )
             ;;
         *)
             case "$prev" in
-                --bin-function) COMPREPLY=( $(compgen -W "mean median sum" -- "$cur") ) ;;
+                --bin-function) COMPREPLY=( $(compgen -W "mean median sum min max count std p10 p25 p75 p90" -- "$cur") ) ;;
                 --format)       COMPREPLY=( $(compgen -W "bar line scatter stacked" -- "$cur") ) ;;
-                -t|--title|-y|--y-label|--bin-width) ;;
+                --stats-format) COMPREPLY=( $(compgen -W "tsv json" -- "$cur") ) ;;
+                --bin-width)    COMPREPLY=( $(compgen -W "week month year iso-week calendar-month quarter calendar-year" -- "$cur") ) ;;
+                -o|--output)    COMPREPLY=( $(compgen -f -- "$cur") ) ;;
+                -t|--title|-y|--y-label|--quantiles) ;;
                 *)              COMPREPLY=( $(compgen -W "$(_tsd_series_names)" -- "$cur") ) ;;
             esac
             ;;
     esac
 }
 complete -F _tsd_plot tsd-plot
+complete -F _tsd_plot tsd-summary
 
 # Completion for tsd-season-plot: multiple series names plus options.
 _tsd_season_plot() {
@@ -146,8 +162,9 @@ _tsd_season_plot() {
     COMPREPLY=()
     case "$cur" in
         -*)
-            local opts="--sum --period --color --min-size --max-size --alpha
-                        --heatmap --heatmap-style --heatmap-mode
+            local opts="--sum --grid --period --color --min-size --max-size
+                        --alpha --density --log-density --presence -o --output
+                        --rasterize --no-cache --heatmap --heatmap-style --heatmap-mode
                         --heatmap-sigma --heatmap-sigma-y --heatmap-alpha
                         --no-month-lines -t --title -v --verbose"
             COMPREPLY=( $(compgen -W "$opts" -- "$cur") )
@@ -211,7 +228,7 @@ tsd-table() {
 tsd-last() { tsd $1 $(tsd $1 | tail -1 | awk '{print $2}'); }
 
 # Print some statistics about a tsd series.
-tsd-stats() { cat "$(tsd-series-path "$1")" | awk '{sum += $2; sumsq += $2^2;} END {printf("µ = %.1f   σ = %.1f   n = %d\n", sum/NR, sqrt(sumsq/NR-(sum/NR)^2), NR);}'; }
+tsd-stats() { tsd "$1" stats; }
 
 # Retrieve the most recent value in a series.
 tsd-value() {
@@ -243,20 +260,9 @@ tsd-y-sum() {
 }
 
 # Sum the latest readings for series whose names match a pattern.
+# With a second argument, print only the total.
 tsd-group() {
-    local filter option value f the_date the_mass
-    filter="$1"
-    option="$2"
-    value=0
-    for f in $(tsd -L | grep -E "^$filter"); do
-	the_date=$(tsd "$f" | tail -1 | awk '{print $1}')
-	the_mass=$(tsd "$f" | tail -1 | awk '{print $2}')
-	value=$(( value + $(tsd-value "$f") ))
-	if [ "X$option" = X ]; then
-	    printf "%-25s   %-4.0f g   %s\n" "$f" "$the_mass" "$the_date"
-	fi
-    done
-    printf "  Σ=%d\n" "$value"
+    tsd group "$1" ${2:+total}
 }
 
 # Filter tsd-style output down to non-zero values or selected dates.
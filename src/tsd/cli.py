@@ -3,21 +3,27 @@
 """Maintain daily time series data."""
 
 
+# Only light stdlib modules are imported here: most invocations append
+# or print a value and should start quickly.  Heavier modules are
+# imported where they are used.
 from math import sqrt
 import datetime
 import getopt
 import os
 from pathlib import Path
-import subprocess
+import re
 import sys
-import tempfile
-
-import dateutil.parser
 
 
 G_VERSION = 0.1
 G_CONFIG = {}
 CONFIG_SUBPATH = Path("tsd") / "config"
+COMPLETION_CACHE_SUBPATH = Path("tsd") / "series-names"
+# How far past the series directory's mtime to stamp a fresh cache.
+COMPLETION_CACHE_STAMP_NS = 1000
+# Files in the series directory that accompany a series rather than
+# being one.
+SIDECAR_SUFFIXES = (".cfg", ".stats")
 
 
 # ############################################################
@@ -63,20 +69,226 @@ def create_series(series, diff, verbose):
             # hopefully reasonable value
             series_fp.write("convolve_width=20\n")
             series_fp.close()
+    write_completion_cache()
 
 
 def add_point(series, when, value, verbose=False):
-    """Add (when, value) to series."""
+    """Add (when, value) to series.
+
+    Also fold the point into the series' running statistics.
+    """
 
     sname = series_name(series, verbose, create=False)
-    with open(sname, "a") as series_fp:
-        new_line = "{0}\t{1}\n".format(when, value)
-        series_fp.write(new_line)
-        if verbose:
-            print(new_line)
+    append_values(sname, when, [value], verbose)
     return
 
 
+def add_points(assignments, when, verbose=False):
+    """Add (when, value) to each series in a list of (series, value).
+
+    The series directory is checked once, and all series and values
+    are validated before anything is written: on any error, report
+    them all and exit without changing a series.  Each series is then
+    appended with a single write.
+    """
+
+    series_dir = series_dir_name()
+    values_by_sname = {}
+    errors = []
+    for series, value_text in assignments:
+        if not series:
+            errors.append('Missing series name before "=%s".' % value_text)
+            continue
+        sname = series_dir + series
+        if not is_series_filename(series) or not os.path.isfile(sname):
+            errors.append(
+                'Series "%s" does not exist, use init to create.' % series
+            )
+        try:
+            value = float(value_text)
+        except ValueError:
+            errors.append(
+                'Value "%s" for series "%s" is not a number.'
+                % (value_text, series)
+            )
+            continue
+        values_by_sname.setdefault(sname, []).append(value)
+    if errors:
+        for error in errors:
+            print(error)
+        sys.exit(1)
+    for sname, values in values_by_sname.items():
+        append_values(sname, when, values, verbose)
+
+
+def parse_assignments(tokens):
+    """Split series=value tokens into (series, value) pairs.
+
+    Exit with a message if a token has no "=".
+    """
+
+    assignments = []
+    for token in tokens:
+        series, separator, value = token.partition("=")
+        if not separator:
+            print('Expected series=value, got "%s".' % token)
+            sys.exit(1)
+        assignments.append((series, value))
+    return assignments
+
+
+def append_values(sname, when, values, verbose=False):
+    """Append (when, value) for each value to the series file sname.
+
+    Also fold the values into the series' running statistics.
+    """
+
+    stats = read_series_stats(sname)
+    new_lines = "".join("{0}\t{1}\n".format(when, value) for value in values)
+    with open(sname, "a") as series_fp:
+        series_fp.write(new_lines)
+    if verbose:
+        print(new_lines)
+    for value in values:
+        update_stats(stats, str(when), float(value))
+    write_series_stats(sname, stats)
+
+
+def empty_stats():
+    """Return running statistics for a series with no points."""
+
+    return {
+        "n": 0,
+        "mean": 0.0,
+        "m2": 0.0,
+        "min": float("nan"),
+        "max": float("nan"),
+        "first": "",
+        "last": "",
+    }
+
+
+def update_stats(stats, when, value):
+    """Fold (when, value) into running statistics, return them.
+
+    Welford's update, so that mean and m2 (the sum of squared
+    deviations from the mean) stay accurate over long series.
+    """
+
+    stats["n"] += 1
+    delta = value - stats["mean"]
+    stats["mean"] += delta / stats["n"]
+    stats["m2"] += delta * (value - stats["mean"])
+    if 1 == stats["n"]:
+        stats["min"] = stats["max"] = value
+        stats["first"] = stats["last"] = when
+    else:
+        stats["min"] = min(stats["min"], value)
+        stats["max"] = max(stats["max"], value)
+        stats["first"] = min(stats["first"], when)
+        stats["last"] = max(stats["last"], when)
+    return stats
+
+
+def compute_series_stats(sname):
+    """Compute running statistics by reading the whole series."""
+
+    stats = empty_stats()
+    with open(sname, "r", encoding="UTF-8") as series_fp:
+        for line in series_fp:
+            fields = line.split()
+            if len(fields) < 2:
+                continue
+            try:
+                value = float(fields[1])
+            except ValueError:
+                continue
+            update_stats(stats, fields[0], value)
+    return stats
+
+
+def series_fingerprint(sname):
+    """Return (size, mtime in ns) of the series file."""
+
+    stat = os.stat(sname)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_series_stats(sname):
+    """Return the running statistics of a series.
+
+    The stats file records the size and mtime of the series file it
+    describes.  If the series has changed behind our back (edited,
+    compacted), or there is no stats file, recompute from scratch.
+    """
+
+    raw = _get_config(series_stats_name(sname))
+    size, mtime_ns = series_fingerprint(sname)
+    try:
+        if int(raw["size"]) == size and int(raw["mtime_ns"]) == mtime_ns:
+            return {
+                "n": int(raw["n"]),
+                "mean": float(raw["mean"]),
+                "m2": float(raw["m2"]),
+                "min": float(raw["min"]),
+                "max": float(raw["max"]),
+                "first": raw["first"],
+                "last": raw["last"],
+            }
+    except (KeyError, ValueError):
+        pass
+    stats = compute_series_stats(sname)
+    write_series_stats(sname, stats)
+    return stats
+
+
+def write_series_stats(sname, stats):
+    """Write the running statistics of a series.
+
+    Failure to write is not an error: the stats will be recomputed
+    next time.
+    """
+
+    size, mtime_ns = series_fingerprint(sname)
+    keys = ("n", "mean", "m2", "min", "max", "first", "last")
+    text = "".join("{0}={1}\n".format(key, stats[key]) for key in keys)
+    text += "size={0}\nmtime_ns={1}\n".format(size, mtime_ns)
+    stats_name = series_stats_name(sname)
+    created = not os.path.exists(stats_name)
+    try:
+        with open(stats_name, "w") as stats_fp:
+            stats_fp.write(text)
+    except OSError:
+        return
+    if created:
+        # A new sidecar changes the series directory's mtime but not
+        # the list of series.
+        refresh_completion_cache()
+
+
+def show_series_stats(series, verbose=False):
+    """Display mean, standard deviation and count of the series.
+
+    If verbose, also show min, max and the date range.
+    If testing, return array of lines to print without printing.
+    """
+
+    stats = read_series_stats(series_name(series, verbose))
+    count = stats["n"]
+    mean = stats["mean"] if count else float("nan")
+    stdev = sqrt(stats["m2"] / count) if count else float("nan")
+    lines = ["µ = %.1f   σ = %.1f   n = %d" % (mean, stdev, count)]
+    if verbose:
+        lines.append(
+            "min = %s   max = %s   %s .. %s"
+            % (stats["min"], stats["max"], stats["first"], stats["last"])
+        )
+    if G_CONFIG["testing"]:
+        return lines
+    for line in lines:
+        print(line)
+
+
 def show_series_config(sname, verbose=False):
     """Display the series config values.
 
@@ -114,6 +326,8 @@ def edit_series_config(series, verbose):
     if not editor:
         print("EDITOR is not defined in the environment.")
         return
+    import subprocess
+
     # Probably better would be to make a copy and edit the copy
     edit_command = editor.split()
     edit_command.append(config_name)
@@ -130,7 +344,7 @@ def list_series(verbose=False):
     series = dict()
     series_dir = series_dir_name()
     for filename in os.listdir(series_dir):
-        if filename.endswith("~"):
+        if filename.endswith("~") or filename.endswith(".stats"):
             continue
         if filename.endswith(".cfg"):
             if verbose:
@@ -138,6 +352,7 @@ def list_series(verbose=False):
         else:
             if filename not in series:
                 series[filename] = False
+    refresh_completion_cache()
     if G_CONFIG["testing"]:
         return series
     for [time_series_name, val] in series.items():
@@ -152,13 +367,185 @@ def list_series(verbose=False):
     return
 
 
+def series_names():
+    """Return the sorted names of available series.
+
+    Subdirectories of the series directory are not series.
+    """
+
+    names = []
+    series_dir = series_dir_name()
+    for filename in os.listdir(series_dir):
+        if is_series_filename(filename) and os.path.isfile(
+            os.path.join(series_dir, filename)
+        ):
+            names.append(filename)
+    names.sort()
+    return names
+
+
+def completion_cache_name():
+    """Return the XDG cache file name for the list of series names."""
+
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return str(Path(cache_home) / COMPLETION_CACHE_SUBPATH)
+    return str(Path.home() / ".cache" / COMPLETION_CACHE_SUBPATH)
+
+
+def write_completion_cache():
+    """Record the series names for shell completion.
+
+    The first line is the series directory, the rest are the names.
+    The cache is valid while it is newer than the series directory,
+    which changes whenever a series is created or deleted.  Failure to
+    write is not an error.
+    """
+
+    cache_name = completion_cache_name()
+    series_dir = os.path.abspath(series_dir_name())
+    text = series_dir + "\n"
+    text += "".join(name + "\n" for name in series_names())
+    try:
+        os.makedirs(os.path.dirname(cache_name), exist_ok=True)
+        tmp_name = "{0}.{1}".format(cache_name, os.getpid())
+        with open(tmp_name, "w", encoding="UTF-8") as cache_fp:
+            cache_fp.write(text)
+        os.replace(tmp_name, cache_name)
+        # File times are coarser than a nanosecond, so a cache written
+        # just after a change to the directory can share its mtime and
+        # look stale.  Stamp it just past the directory instead.
+        dir_mtime = os.stat(series_dir).st_mtime_ns
+        if os.stat(cache_name).st_mtime_ns <= dir_mtime:
+            stamp = dir_mtime + COMPLETION_CACHE_STAMP_NS
+            os.utime(cache_name, ns=(stamp, stamp))
+    except OSError:
+        pass
+
+
+def refresh_completion_cache():
+    """Rewrite the completion cache if it is stale."""
+
+    series_dir = os.path.abspath(series_dir_name())
+    if read_completion_cache(series_dir) is None:
+        write_completion_cache()
+
+
+def read_completion_cache(series_dir=None):
+    """Return the cached series names, or None if the cache is stale.
+
+    If series_dir is given, a cache of another directory is stale too.
+    """
+
+    cache_name = completion_cache_name()
+    try:
+        with open(cache_name, "r", encoding="UTF-8") as cache_fp:
+            lines = cache_fp.read().splitlines()
+        cache_mtime = os.stat(cache_name).st_mtime_ns
+        if not lines or cache_mtime <= os.stat(lines[0]).st_mtime_ns:
+            return None
+        if series_dir is not None and lines[0] != series_dir:
+            return None
+    except OSError:
+        return None
+    return lines[1:]
+
+
+def completions(prefix):
+    """Return series names that start with prefix.
+
+    Serve from the completion cache when it is valid, so that the
+    common case reads no configuration.
+    """
+
+    names = read_completion_cache()
+    if names is None:
+        get_config()
+        write_completion_cache()
+        names = series_names()
+    return [name for name in names if name.startswith(prefix)]
+
+
+def tail_line(sname, block_size=512):
+    """Return the last non-blank line of a file.
+
+    Reads backwards from the end of the file in blocks, so the cost
+    does not depend on the length of the series.
+    """
+
+    with open(sname, "rb") as series_fp:
+        position = series_fp.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            series_fp.seek(position)
+            data = series_fp.read(step) + data
+            if b"\n" in data.rstrip():
+                break
+    return data.rstrip().rsplit(b"\n", 1)[-1].decode("UTF-8").strip()
+
+
+def match_series(pattern, names):
+    """Return names that match pattern at their start.
+
+    The pattern is a regular expression, as with grep -E "^pattern".
+    A pattern that is not a valid regular expression is taken as a
+    literal prefix.
+    """
+
+    try:
+        regex = re.compile(pattern)
+    except re.error:
+        regex = re.compile(re.escape(pattern))
+    return [name for name in names if regex.match(name)]
+
+
+def group_summary(pattern, total_only=False, jobs=1):
+    """Summarise the latest readings of series matching pattern.
+
+    Print one line per series with its last value and date, followed
+    by the sum of the (truncated) last values.
+    If testing, return array of lines to print without printing.
+    """
+
+    series_dir = series_dir_name()
+    names = match_series(pattern, series_names())
+    paths = [series_dir + name for name in names]
+    if jobs > 1 and len(paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            last_lines = list(executor.map(tail_line, paths))
+    else:
+        last_lines = [tail_line(path) for path in paths]
+
+    lines = []
+    total = 0
+    for name, last_line in zip(names, last_lines):
+        fields = last_line.split()
+        the_date = fields[0] if fields else ""
+        try:
+            the_mass = float(fields[1])
+        except (IndexError, ValueError):
+            the_mass = 0.0
+        total += int(the_mass)
+        if not total_only:
+            lines.append("%-25s   %-4.0f g   %s" % (name, the_mass, the_date))
+    lines.append("  Σ=%d" % total)
+    if G_CONFIG["testing"]:
+        return lines
+    for line in lines:
+        print(line)
+
+
 def list_commands():
     """List available commands on a series.
 
     Useful for bash command completion.
     """
 
-    commands = ["edit", "config", "init", "plot"]
+    commands = ["edit", "config", "init", "plot", "stats"]
     commands.sort()
     return commands
 
@@ -219,6 +606,18 @@ def series_config_name(sname):
     return sname + ".cfg"
 
 
+def series_stats_name(sname):
+    """Provide name of running statistics file."""
+
+    return sname + ".stats"
+
+
+def is_series_filename(filename):
+    """Return True if filename in the series directory is a series."""
+
+    return not filename.endswith(("~",) + SIDECAR_SUFFIXES)
+
+
 def series_config(sname):
     """Return config as a dict.
 
@@ -237,6 +636,8 @@ def series_config(sname):
 def plot_series(series, verbose):
     """Plot the series."""
 
+    import tempfile
+
     sname = series_name(series, verbose)
     config = series_config(sname)
     width = int(config.get("convolve_width", 20))
@@ -259,6 +660,8 @@ def plot_get_points(sname):
     Array format is [date, offset from first date, value].
     """
 
+    import dateutil.parser
+
     unsorted_points = dict()
     with open(sname, "r") as series_fp:
         for line in series_fp:
@@ -462,6 +865,8 @@ set size 1,1
     )
     # pause mouse close
 
+    import subprocess
+
     pipe_fd = subprocess.Popen(["gnuplot", "-persist"], stdin=subprocess.PIPE)
     pipe_fd.communicate(plot_instructions.encode())
     pipe_fd.wait()
@@ -514,9 +919,13 @@ def usage(verbose):
     print()
     print(
         """tsd -VhL
+tsd --complete <prefix>
 tsd series
 tsd series <value>
 tsd series [-v] %s
+tsd series=<value> [series=<value> ...]
+tsd -
+tsd [-j jobs] group <pattern> [total]
 
     -v   verbose output
     -V   print version number and exit
@@ -526,6 +935,10 @@ tsd series [-v] %s
          (i.e., the data is the difference between successive points)
     -L   list available series (with -v, show more info)
     -C   list available commands that act on a series
+    -j   with group, read up to this many series in parallel
+
+    --complete  list series names starting with prefix, for shell
+                completion (served from a cache when possible)
 
     series  is a time series name.  By itself, prints the last few values
             of the series.  If it is followed by a value, that value is
@@ -535,12 +948,25 @@ tsd series [-v] %s
     edit    permit editing of series configuration
     init    initializes a new time series
     plot    plots the named time series
+    stats   prints mean, standard deviation and count (with -v, also
+            min, max and date range) from running statistics kept
+            alongside the series
+
+    series=value  adds value to series (date as above).  Several may
+            be given, or with -, read from stdin.  Nothing is written
+            unless all the series exist and all the values are numbers.
+
+    group   prints the latest value and date of each series whose name
+            matches pattern (a regular expression anchored at the start
+            of the name), then their sum.  With total, print only the sum.
 
     Examples:
             $ tsd temp init          # Create the time series calle temp
             $ tsd temp 22.3          # It is 22.3 degrees today
             $ tsd temp               # will print today's date and temperature
             $ tsd plot               # will plot the temperature history
+            $ tsd temp=22.3 rain=4   # record several series at once
+            $ tsd group chocolat-    # latest values of chocolat-* series
 """
         % "|".join(list_commands())
     )
@@ -557,9 +983,10 @@ def get_opts():
     options["diff"] = False  # only meaningful for init
     options["list"] = False
     options["commands"] = False
+    options["jobs"] = 1
 
     try:
-        opts, args = getopt.gnu_getopt(sys.argv[1:], "hvVd:DLC")
+        opts, args = getopt.gnu_getopt(sys.argv[1:], "hvVd:DLCj:")
     except getopt.GetoptError:
         usage(False)
         sys.exit(1)
@@ -582,9 +1009,17 @@ def get_opts():
                 delta = datetime.timedelta(int(option_arg))
                 options["date"] = datetime.date.today() + delta
             else:
+                import dateutil.parser
+
                 options["date"] = dateutil.parser.parse(option_arg).date()
         if option_flag == "-D":
             options["diff"] = True
+        if option_flag == "-j":
+            try:
+                options["jobs"] = max(1, int(option_arg))
+            except ValueError:
+                usage(False)
+                sys.exit(1)
 
     if args:
         options["args"] = args
@@ -666,6 +1101,13 @@ def _get_config_raw(config_name):
 def main():
     """Look at input from user, decide what to do, do it."""
 
+    if len(sys.argv) > 1 and "--complete" == sys.argv[1]:
+        # Fast path for shell completion: no option or config parsing.
+        prefix = sys.argv[2] if len(sys.argv) > 2 else ""
+        for name in completions(prefix):
+            print(name)
+        return
+
     get_config()
     options = get_opts()
 
@@ -676,6 +1118,30 @@ def main():
         sys.exit(1)
 
     series = options["args"][0]
+    if "-" == series or "=" in series:
+        if "-" == series:
+            tokens = sys.stdin.read().split()
+        else:
+            tokens = options["args"]
+        add_points(
+            parse_assignments(tokens),
+            options["date"],
+            verbose=options["verbose"],
+        )
+        return
+
+    if (
+        "group" == series
+        and len(options["args"]) > 1
+        and not os.path.exists(series_dir_name() + series)
+    ):
+        group_summary(
+            options["args"][1],
+            total_only=len(options["args"]) > 2,
+            jobs=options["jobs"],
+        )
+        return
+
     if 1 == len(options["args"]):
         recent_data(series, options["verbose"])
         return
@@ -697,6 +1163,10 @@ def main():
         plot_series(series, options["verbose"])
         return
 
+    if "stats" == command:
+        show_series_stats(series, options["verbose"])
+        return
+
     # Else add a value
     value = float(command)
     add_point(series, options["date"], value, verbose=options["verbose"])
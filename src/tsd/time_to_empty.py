@@ -3,18 +3,31 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import math
 import os
 import sys
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 from . import cli as tsd_cli
 
 DATE_FMT = "%Y-%m-%d"
+# Quadrature nodes over the initial rate and over the remaining quantity.
+ANALYTIC_RATE_NODES = 32
+ANALYTIC_LEVEL_NODES = 12
+# The rate grid extends this many standard deviations of the rate's
+# walk over the horizon above the highest start, in steps of one
+# rate step's deviation, up to this many points.
+ANALYTIC_GRID_SDS = 5.0
+ANALYTIC_GRID_SIZE = 1000
+# Steps evaluated at a time, and by default how close to one the
+# distribution gets before the rest of the horizon is skipped.
+ANALYTIC_BLOCK_STEPS = 64
+ANALYTIC_TOLERANCE = 1e-9
 
 
 @dataclass
@@ -33,6 +46,7 @@ class Options:
     seed: Optional[int]
     allow_negative_rate: bool
     min_rate: float
+    analytic: bool
     bins: int
     quantiles: Tuple[float, ...]
     drop_same_day_duplicates: bool
@@ -79,7 +93,7 @@ def resolve_name_via_series_dir(
 
     matches = []
     for name in names:
-        if name.endswith("~") or name.endswith(".cfg"):
+        if not tsd_cli.is_series_filename(name):
             continue
         if pattern in name:
             matches.append((name, os.path.join(tsd_dir, name)))
@@ -177,6 +191,16 @@ def parse_args() -> Options:
         default=0.0,
         help="Lower bound for simulated rate (default: 0.0)",
     )
+    mc.add_argument(
+        "--analytic",
+        action="store_true",
+        help=(
+            "Compute the time-to-empty distribution by numerical "
+            "integration instead of simulating. --nsims sets the number of "
+            "evenly spaced quantiles used for the report. Not available "
+            "with --allow-negative-rate"
+        ),
+    )
 
     disp = parser.add_argument_group("display")
     disp.add_argument(
@@ -259,6 +283,10 @@ def parse_args() -> Options:
 
     if not files and not not_found:
         parser.error("Specify at least one file: use FILE arguments or -f.")
+    if args.analytic and args.allow_negative_rate:
+        parser.error(
+            "--analytic cannot be combined with --allow-negative-rate"
+        )
 
     return Options(
         files=files,
@@ -273,6 +301,7 @@ def parse_args() -> Options:
         seed=args.seed,
         allow_negative_rate=args.allow_negative_rate,
         min_rate=args.min_rate,
+        analytic=args.analytic,
         bins=args.bins,
         quantiles=quantiles,
         drop_same_day_duplicates=args.drop_same_day,
@@ -349,16 +378,11 @@ def consumption_only_quantities(q: np.ndarray) -> np.ndarray:
 def initial_rate_guess(t: np.ndarray, q: np.ndarray) -> float:
     """Estimate an initial daily consumption rate from observed decreases."""
 
-    rates = []
-    for idx in range(1, len(t)):
-        dt_value = t[idx] - t[idx - 1]
-        if dt_value <= 0:
-            continue
-        quantity_delta = q[idx - 1] - q[idx]
-        rate = quantity_delta / dt_value
-        if rate > 0:
-            rates.append(rate)
-    if rates:
+    dt_values = np.diff(t)
+    increasing = dt_values > 0
+    rates = (q[:-1] - q[1:])[increasing] / dt_values[increasing]
+    rates = rates[rates > 0]
+    if len(rates):
         return float(np.median(rates))
     return 1e-6
 
@@ -370,7 +394,71 @@ def kalman_filter_random_walk_rate(
     sigma_q: float,
     sigma_z: float,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    """Run a linear Kalman filter for quantity and consumption rate."""
+    """Run a linear Kalman filter for quantity and consumption rate.
+
+    The 2x2 algebra of :func:`kalman_filter_random_walk_rate_matrix` is
+    written out on plain floats: the quantity ``q``, the rate ``r`` and
+    the covariance entries ``p11``, ``p12`` and ``p22``.  The results are
+    the same, including the Joseph-form covariance update, but no array
+    is created per observation.
+    """
+
+    if len(t) < 2:
+        state = np.array([z[-1], initial_rate_guess(t, z)], dtype=float)
+        covariance = np.diag([10.0**2, 1.0**2])
+        return state, covariance
+
+    times = t.tolist()
+    quantities = z.tolist()
+    q = float(quantities[0])
+    r = initial_rate_guess(t, z)
+    p11, p12, p22 = 10.0**2, 0.0, 1.0**2
+    variance_q = sigma_q**2
+    variance_r = sigma_r**2
+    variance_z = sigma_z**2
+
+    previous = times[0]
+    for time, quantity in zip(times[1:], quantities[1:]):
+        dt_value = max(time - previous, 1e-9)
+        previous = time
+
+        # Predict with F = [[1, -dt], [0, 1]], Q = diag(sq^2 dt, sr^2 dt).
+        q -= dt_value * r
+        p11 += dt_value * (dt_value * p22 - 2.0 * p12 + variance_q)
+        p12 -= dt_value * p22
+        p22 += variance_r * dt_value
+
+        # Update with H = [1, 0]: S = p11 + sz^2 and K = (p11, p12) / S.
+        s_scalar = p11 + variance_z
+        gain_q = p11 / s_scalar
+        gain_r = p12 / s_scalar
+        innovation = quantity - q
+        q += gain_q * innovation
+        r += gain_r * innovation
+
+        # Joseph form (I - KH) P (I - KH)^T + K sz^2 K^T, entry by entry.
+        keep = 1.0 - gain_q
+        p22 += gain_r * (gain_r * (p11 + variance_z) - 2.0 * p12)
+        p12 = keep * (p12 - gain_r * p11) + variance_z * gain_q * gain_r
+        p11 = keep * keep * p11 + variance_z * gain_q * gain_q
+
+    state = np.array([q, max(r, 0.0)])
+    covariance = np.array([[p11, p12], [p12, p22]])
+    return state, covariance
+
+
+def kalman_filter_random_walk_rate_matrix(
+    t: np.ndarray,
+    z: np.ndarray,
+    sigma_r: float,
+    sigma_q: float,
+    sigma_z: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run a linear Kalman filter for quantity and consumption rate.
+
+    This is the textbook matrix form of the filter, kept as the
+    reference for :func:`kalman_filter_random_walk_rate`.
+    """
 
     if len(t) < 2:
         state = np.array([z[-1], initial_rate_guess(t, z)], dtype=float)
@@ -408,6 +496,86 @@ def kalman_filter_random_walk_rate(
     return state, covariance
 
 
+def kalman_filter_batch(
+    times: Sequence[np.ndarray],
+    observations: Sequence[np.ndarray],
+    sigma_r: float,
+    sigma_q: float,
+    sigma_z: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run :func:`kalman_filter_random_walk_rate` on many series at once.
+
+    The series are stacked as ``(K, 2)`` states and ``(K, 2, 2)``
+    covariances and stepped together, so each observation step costs a
+    few array operations for all series rather than for each one.  The
+    series are ordered longest first, so the series still observed at a
+    step are a leading slice and finished series are left untouched.
+    Returns the final states and covariances in the order given.
+    """
+
+    count = len(times)
+    lengths = np.array([len(t) for t in times], dtype=np.int64)
+    order = np.argsort(-lengths, kind="stable")
+    width = int(lengths.max()) if count else 0
+    t_stack = np.zeros((count, width))
+    z_stack = np.zeros((count, width))
+    for row, index in enumerate(order):
+        t_stack[row, : lengths[index]] = times[index]
+        z_stack[row, : lengths[index]] = observations[index]
+    # active[idx - 1] series still have an observation at step idx.
+    active = count - np.searchsorted(
+        np.sort(lengths), np.arange(1, width), side="right"
+    )
+
+    state = np.empty((count, 2))
+    state[:, 0] = z_stack[:, 0] if width else 0.0
+    state[:, 1] = [
+        initial_rate_guess(times[index], observations[index])
+        for index in order
+    ]
+    covariance = np.tile(np.diag([10.0**2, 1.0**2]), (count, 1, 1))
+
+    measurement_variance = sigma_z**2
+    identity = np.eye(2)
+
+    for idx in range(1, width):
+        n_active = active[idx - 1]
+        dt_values = np.maximum(
+            t_stack[:n_active, idx] - t_stack[:n_active, idx - 1], 1e-9
+        )
+        transition = np.tile(identity, (n_active, 1, 1))
+        transition[:, 0, 1] = -dt_values
+        process = np.zeros((n_active, 2, 2))
+        process[:, 0, 0] = sigma_q**2 * dt_values
+        process[:, 1, 1] = sigma_r**2 * dt_values
+
+        x = np.einsum("kij,kj->ki", transition, state[:n_active])
+        p = (
+            transition @ covariance[:n_active] @ transition.transpose(0, 2, 1)
+            + process
+        )
+
+        s_values = p[:, 0, 0] + measurement_variance
+        gain = p[:, :, 0] / s_values[:, None]
+        innovation = z_stack[:n_active, idx] - x[:, 0]
+        state[:n_active] = x + gain * innovation[:, None]
+
+        kh_term = np.zeros((n_active, 2, 2))
+        kh_term[:, :, 0] = gain
+        stabilizer = identity - kh_term
+        covariance[:n_active] = (
+            stabilizer @ p @ stabilizer.transpose(0, 2, 1)
+            + measurement_variance * gain[:, :, None] * gain[:, None, :]
+        )
+
+    state[:, 1] = np.maximum(state[:, 1], 0.0)
+    states = np.empty_like(state)
+    states[order] = state
+    covariances = np.empty_like(covariance)
+    covariances[order] = covariance
+    return states, covariances
+
+
 def simulate_hitting_time(
     x_mean: np.ndarray,
     P: np.ndarray,
@@ -460,6 +628,231 @@ def simulate_hitting_time(
     return hits
 
 
+# Chebyshev fit of erfc(z) * exp(z**2) in t = 1 / (1 + z / 2), highest
+# power first (Numerical Recipes, erfcc).
+ERFC_COEFFICIENTS = (
+    0.17087277,
+    -0.82215223,
+    1.48851587,
+    -1.13520398,
+    0.27886807,
+    -0.18628806,
+    0.09678418,
+    0.37409196,
+    1.00002368,
+    -1.26551223,
+)
+
+
+def erfc(x: np.ndarray) -> np.ndarray:
+    """Return the complementary error function of *x*, element-wise.
+
+    The relative error is below 1.2e-7 everywhere, including the far
+    tails, which is ample for the analytic depletion quantiles.
+    """
+
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    tail = t * np.exp(-z * z + np.polyval(ERFC_COEFFICIENTS, t))
+    return np.where(x >= 0.0, tail, 2.0 - tail)
+
+
+def normal_cdf(x: np.ndarray) -> np.ndarray:
+    """Return the standard normal cumulative distribution at *x*."""
+
+    return 0.5 * erfc(-np.asarray(x, dtype=float) / math.sqrt(2.0))
+
+
+def normal_nodes(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return Gauss-Hermite nodes and weights for a standard normal."""
+
+    nodes, weights = np.polynomial.hermite_e.hermegauss(count)
+    return nodes, weights / weights.sum()
+
+
+def gamma_survival(
+    level: np.ndarray, mean: np.ndarray, variance: np.ndarray
+) -> np.ndarray:
+    """Return ``P(X >= level)`` for gamma *X* with *mean* and *variance*.
+
+    Uses the Wilson-Hilferty cube-root normal approximation.  A level
+    that is not positive is always reached, and a variable with no
+    variance is its mean.
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = variance / (9.0 * mean * mean)
+        z = (1.0 - c - np.cbrt(level / mean)) / np.sqrt(c)
+        smooth = normal_cdf(np.where(np.isfinite(z), z, 0.0))
+    exact = (mean >= level).astype(float)
+    spread = np.where((variance > 0.0) & (mean > 0.0), smooth, exact)
+    return np.where(level <= 0.0, 1.0, spread)
+
+
+def excess_consumption_moments(
+    starts: np.ndarray,
+    sigma_r: float,
+    dt_forward: float,
+    n_steps: int,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield moments of the consumption above the rate bound, per step.
+
+    The rate in excess of its lower bound follows the clipped random
+    walk of :func:`simulate_hitting_time`, starting at each of *starts*.
+    For step *k*, yields the mean and second moment of that excess
+    rate summed over the first *k* steps and multiplied by
+    *dt_forward*.  Both are propagated backwards, one step at a time,
+    on a grid of excess rates through the transition matrix of the
+    discretized, clipped Gaussian increment.
+    """
+
+    step_sd = sigma_r * math.sqrt(dt_forward)
+    high = float(starts.max()) + ANALYTIC_GRID_SDS * step_sd * math.sqrt(
+        n_steps
+    )
+    spacing = max(step_sd, high / (ANALYTIC_GRID_SIZE - 1))
+    if spacing <= 0.0:
+        spacing = 1.0
+    grid = spacing * np.arange(int(math.ceil(high / spacing)) + 2)
+
+    # transition[i, j] is the probability of moving from grid[i] into
+    # the cell around grid[j]; the first and last cells extend to
+    # infinity, which clips the rate at its bound.
+    edges = np.concatenate(([-np.inf], grid[:-1] + 0.5 * spacing, [np.inf]))
+    if step_sd > 0.0:
+        cumulative = normal_cdf((edges[None, :] - grid[:, None]) / step_sd)
+    else:
+        cumulative = (edges[None, :] >= grid[:, None]).astype(float)
+    transition = np.diff(cumulative, axis=1)
+
+    position = starts / spacing
+    below = np.minimum(position.astype(np.int64), len(grid) - 2)
+    above = position - below
+    at_starts = np.zeros((len(starts), len(grid)))
+    rows = np.arange(len(starts))
+    at_starts[rows, below] = 1.0 - above
+    at_starts[rows, below + 1] = above
+
+    increment = dt_forward * grid
+    moments = np.zeros((len(grid), 2))
+    terms = np.empty_like(moments)
+    for _ in range(n_steps):
+        terms[:, 0] = increment + moments[:, 0]
+        terms[:, 1] = increment * (terms[:, 0] + moments[:, 0]) + moments[:, 1]
+        moments = transition @ terms
+        values = at_starts @ moments
+        yield values[:, 0], values[:, 1]
+
+
+def analytic_hitting_cdf(
+    x_mean: np.ndarray,
+    P: np.ndarray,
+    sigma_r: float,
+    sigma_q: float,
+    dt_forward: float,
+    max_days: float,
+    min_rate: float,
+    tolerance: float = ANALYTIC_TOLERANCE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Approximate the depletion time distribution without simulation.
+
+    The initial rate is integrated out with Gauss-Hermite nodes, each
+    clipped at *min_rate* as in :func:`simulate_hitting_time`.  From
+    each node, consumption above ``min_rate * t`` is non-negative and
+    non-decreasing, so the quantity is empty by step *k* when that
+    excess consumption reaches the remaining quantity less
+    ``min_rate * t``.  The excess is matched to a gamma distribution
+    through its first two moments from
+    :func:`excess_consumption_moments`.  The remaining quantity, the
+    initial quantity given the node's rate plus the quantity noise, is
+    Gaussian and integrated with a second set of nodes.  Returns the
+    step times and the distribution function at each step, which is
+    held constant once it is within *tolerance* of one.
+    """
+
+    n_steps = math.ceil(max_days / dt_forward)
+    times = np.arange(1, n_steps + 1, dtype=float) * dt_forward
+
+    rate_nodes, rate_weights = normal_nodes(ANALYTIC_RATE_NODES)
+    level_nodes, level_weights = normal_nodes(ANALYTIC_LEVEL_NODES)
+    rate_variance = max(float(P[1, 1]), 0.0)
+    rates = x_mean[1] + math.sqrt(rate_variance) * rate_nodes
+    if rate_variance > 0.0:
+        slope = P[0, 1] / rate_variance
+        q_mean = x_mean[0] + slope * (rates - x_mean[1])
+        q_variance = max(float(P[0, 0] - slope * P[0, 1]), 0.0)
+    else:
+        q_mean = np.full_like(rates, x_mean[0])
+        q_variance = max(float(P[0, 0]), 0.0)
+
+    moments = excess_consumption_moments(
+        np.maximum(rates - min_rate, 0.0), sigma_r, dt_forward, n_steps
+    )
+    cdf = np.empty(n_steps)
+    reached = np.zeros_like(rates)
+    for begin in range(0, n_steps, ANALYTIC_BLOCK_STEPS):
+        block = times[begin : begin + ANALYTIC_BLOCK_STEPS]
+        first, second = (
+            np.array(values)
+            for values in zip(*itertools.islice(moments, len(block)))
+        )
+        variance = np.maximum(second - first * first, 0.0)
+        spread = np.sqrt(q_variance + sigma_q**2 * block)
+        levels = (q_mean - min_rate * block[:, None])[:, :, None] + spread[
+            :, None, None
+        ] * level_nodes
+        empty = (
+            gamma_survival(levels, first[:, :, None], variance[:, :, None])
+            @ level_weights
+        )
+        # The quantity is the first to reach zero, so never un-empties.
+        empty = np.maximum.accumulate(np.vstack([reached, empty]))[1:]
+        reached = empty[-1]
+        cdf[begin : begin + len(block)] = empty @ rate_weights
+        end = begin + len(block)
+        if cdf[end - 1] >= 1.0 - tolerance:
+            cdf[end:] = cdf[end - 1]
+            break
+    return times, cdf
+
+
+def analytic_hitting_time(
+    x_mean: np.ndarray,
+    P: np.ndarray,
+    nsims: int,
+    sigma_r: float,
+    sigma_q: float,
+    dt_forward: float,
+    max_days: float,
+    min_rate: float,
+) -> np.ndarray:
+    """Return *nsims* evenly spaced quantiles of the depletion time.
+
+    The quantiles, at probabilities ``(i + 0.5) / nsims``, are read from
+    :func:`analytic_hitting_cdf` and stand in for simulated depletion
+    times.  Those beyond the horizon are infinite, as for simulation.
+    """
+
+    # Past a quarter of one quantile's share of one, the distribution
+    # no longer moves any of the quantiles.
+    times, cdf = analytic_hitting_cdf(
+        x_mean,
+        P,
+        sigma_r,
+        sigma_q,
+        dt_forward,
+        max_days,
+        min_rate,
+        tolerance=0.25 / nsims,
+    )
+    levels = (np.arange(nsims) + 0.5) / nsims
+    index = np.searchsorted(cdf, levels, side="left")
+    hits = np.full(nsims, np.inf, dtype=float)
+    found = index < len(times)
+    hits[found] = times[index[found]]
+    return hits
+
+
 def make_error_result(label: str, msg: str) -> FileResult:
     """Create an error-valued file result."""
 
@@ -477,30 +870,29 @@ def make_error_result(label: str, msg: str) -> FileResult:
     )
 
 
-def process_file(
+def read_observations(
+    path: str, opt: Options
+) -> Tuple[List[Tuple[date, float]], np.ndarray, np.ndarray]:
+    """Return the rows of *path* with their times and quantities."""
+
+    rows = read_data(
+        path, drop_same_day_duplicates=opt.drop_same_day_duplicates
+    )
+    t_days, q_obs = compute_time_axis(rows)
+    return rows, t_days, q_obs
+
+
+def forecast(
     label: str,
-    path: str,
+    rows: List[Tuple[date, float]],
+    q_obs: np.ndarray,
+    state: np.ndarray,
+    covariance: np.ndarray,
     opt: Options,
     rng: np.random.Generator,
 ) -> FileResult:
-    """Run filtering and simulation for one file."""
+    """Simulate one file from its filtered *state* and *covariance*."""
 
-    try:
-        rows = read_data(
-            path, drop_same_day_duplicates=opt.drop_same_day_duplicates
-        )
-    except OSError as exc:
-        return make_error_result(label, str(exc))
-
-    t_days, q_obs = compute_time_axis(rows)
-    q_consumption = consumption_only_quantities(q_obs)
-    state, covariance = kalman_filter_random_walk_rate(
-        t_days,
-        q_consumption,
-        sigma_r=opt.sigma_r,
-        sigma_q=opt.sigma_q,
-        sigma_z=opt.sigma_z,
-    )
     state[0] = q_obs[-1]
     q_now = float(state[0])
     r_now = float(state[1])
@@ -519,18 +911,30 @@ def process_file(
             already_empty=True,
         )
 
-    hits = simulate_hitting_time(
-        x_mean=state,
-        P=covariance,
-        nsims=opt.nsims,
-        sigma_r=opt.sigma_r,
-        sigma_q=opt.sigma_q,
-        dt_forward=opt.dt_forward,
-        max_days=opt.max_days,
-        rng=rng,
-        allow_negative_rate=opt.allow_negative_rate,
-        min_rate=opt.min_rate,
-    )
+    if opt.analytic:
+        hits = analytic_hitting_time(
+            x_mean=state,
+            P=covariance,
+            nsims=opt.nsims,
+            sigma_r=opt.sigma_r,
+            sigma_q=opt.sigma_q,
+            dt_forward=opt.dt_forward,
+            max_days=opt.max_days,
+            min_rate=opt.min_rate,
+        )
+    else:
+        hits = simulate_hitting_time(
+            x_mean=state,
+            P=covariance,
+            nsims=opt.nsims,
+            sigma_r=opt.sigma_r,
+            sigma_q=opt.sigma_q,
+            dt_forward=opt.dt_forward,
+            max_days=opt.max_days,
+            rng=rng,
+            allow_negative_rate=opt.allow_negative_rate,
+            min_rate=opt.min_rate,
+        )
     finite = hits[np.isfinite(hits)]
     censored = int(np.sum(~np.isfinite(hits)))
     return FileResult(
@@ -545,6 +949,67 @@ def process_file(
     )
 
 
+def process_file(
+    label: str,
+    path: str,
+    opt: Options,
+    rng: np.random.Generator,
+) -> FileResult:
+    """Run filtering and simulation for one file."""
+
+    try:
+        rows, t_days, q_obs = read_observations(path, opt)
+    except OSError as exc:
+        return make_error_result(label, str(exc))
+
+    state, covariance = kalman_filter_random_walk_rate(
+        t_days,
+        consumption_only_quantities(q_obs),
+        sigma_r=opt.sigma_r,
+        sigma_q=opt.sigma_q,
+        sigma_z=opt.sigma_z,
+    )
+    return forecast(label, rows, q_obs, state, covariance, opt, rng)
+
+
+def process_files(
+    files: Sequence[Tuple[str, str]],
+    opt: Options,
+    rng: np.random.Generator,
+) -> List[FileResult]:
+    """Run filtering and simulation for many files.
+
+    All files are filtered together by :func:`kalman_filter_batch` and
+    then simulated in order.
+    """
+
+    results: List[Optional[FileResult]] = []
+    loaded = []
+    for label, path in files:
+        try:
+            observations = read_observations(path, opt)
+        except OSError as exc:
+            results.append(make_error_result(label, str(exc)))
+            continue
+        results.append(None)
+        loaded.append((len(results) - 1, label, observations))
+
+    states, covariances = kalman_filter_batch(
+        [t_days for _, _, (_, t_days, _) in loaded],
+        [consumption_only_quantities(q_obs) for _, _, (_, _, q_obs) in loaded],
+        sigma_r=opt.sigma_r,
+        sigma_q=opt.sigma_q,
+        sigma_z=opt.sigma_z,
+    )
+    for (position, label, (rows, _, q_obs)), state, covariance in zip(
+        loaded, states, covariances
+    ):
+        results[position] = forecast(
+            label, rows, q_obs, state, covariance, opt, rng
+        )
+    return results
+
+
 def fmt_days(value: float, fractional: bool) -> str:
     """Format a day count."""
 
@@ -605,12 +1070,29 @@ def ascii_histogram(
     return "\n".join(lines)
 
 
+def method_text(opt: Options) -> str:
+    """Describe how the depletion times were obtained."""
+
+    if opt.analytic:
+        return f"Analytic approximation: {opt.nsims} quantiles"
+    return f"Simulations: {opt.nsims}"
+
+
+def outcome_noun(opt: Options, short: bool = False) -> str:
+    """Name the depletion times: simulations, or analytic quantiles."""
+
+    if opt.analytic:
+        return "quantiles"
+    return "sims" if short else "simulations"
+
+
 def print_single(result: FileResult, opt: Options) -> None:
     """Print the full single-file report."""
 
     if result.error:
         sys.exit(f"ERROR: {result.error}")
-    print("=== Time-to-Empty Forecast (State-space RW rate + Monte Carlo) ===")
+    method = "analytic" if opt.analytic else "Monte Carlo"
+    print(f"=== Time-to-Empty Forecast (State-space RW rate + {method}) ===")
     print(
         f"Readings: {result.n_rows}"
         f"  |  Current q_now ≈ {result.q_now:.2f}"
@@ -628,13 +1110,13 @@ def print_single(result: FileResult, opt: Options) -> None:
         f" sigma_q={opt.sigma_q:.3f}/√day, sigma_z={opt.sigma_z:.3f}"
     )
     print(
-        f"Simulations: {opt.nsims}"
+        f"{method_text(opt)}"
         f"  |  step={opt.dt_forward} day"
         f"  |  horizon={opt.max_days} days"
     )
     if result.censored > 0:
         print(
-            f"Note: {result.censored} simulations"
+            f"Note: {result.censored} {outcome_noun(opt)}"
             f" ({result.censored_pct:.1f}%) did NOT reach zero within horizon."
         )
 
@@ -678,7 +1160,7 @@ def print_single(result: FileResult, opt: Options) -> None:
     tail_summary = (
         "with long tail"
         if result.censored_pct > 0
-        else "finite for nearly all sims"
+        else f"finite for nearly all {outcome_noun(opt, short=True)}"
     )
     print(
         f"\nSummary: median ≈ {median} days (IQR {low}–{high}), "
@@ -710,7 +1192,7 @@ def print_file_section(result: FileResult, opt: Options) -> None:
         return
     if result.censored > 0:
         print(
-            f"Note: {result.censored} sims"
+            f"Note: {result.censored} {outcome_noun(opt, short=True)}"
             f" ({result.censored_pct:.1f}%) did NOT reach zero within horizon."
         )
     if len(result.finite) == 0:
@@ -792,9 +1274,12 @@ def main() -> None:
     opt = parse_args()
     rng = np.random.default_rng(opt.seed)
 
-    results: List[FileResult] = []
-    for label, path in opt.files:
-        results.append(process_file(label, path, opt, rng))
+    if opt.multi_file_mode:
+        results = process_files(opt.files, opt, rng)
+    else:
+        results = [
+            process_file(label, path, opt, rng) for label, path in opt.files
+        ]
     for name in opt.not_found:
         results.append(
             make_error_result(name, f"no series matching {name!r} found")
@@ -807,7 +1292,7 @@ def main() -> None:
             f"  sigma_z={opt.sigma_z:.3f}"
         )
         print(
-            f"Simulations: {opt.nsims}"
+            f"{method_text(opt)}"
             f"  |  step={opt.dt_forward} d"
             f"  |  horizon={opt.max_days} d"
         )
@@ -194,7 +194,7 @@ def iter_series_files(series_dir: Path) -> Iterable[Path]:
             f"cannot list series directory {str(series_dir)!r}: {exc}"
         ) from exc
     for path in paths:
-        if path.is_file() and not path.name.endswith((".cfg", "~")):
+        if path.is_file() and tsd_cli.is_series_filename(path.name):
             yield path
 
 
@@ -0,0 +1,237 @@
+"""Render many TSD plots to files in parallel worker processes."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shlex
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+)
+
+from . import cli, seasonal
+from .cli import PrefixMatchError, resolve_prefix
+
+if TYPE_CHECKING:  # pragma: no cover - matplotlib is imported on demand
+    import matplotlib.pyplot as plt
+
+Renderer = Callable[
+    [argparse.ArgumentParser, argparse.Namespace, "plt.Figure | None"],
+    "plt.Figure",
+]
+
+# Spec command -> (parser factory, renderer).
+COMMANDS: Dict[str, Tuple[Callable[[], argparse.ArgumentParser], Renderer]] = {
+    "plot": (cli.create_parser, cli.render),
+    "seasonal": (seasonal.create_parser, seasonal.render),
+}
+HELP_OVERVIEW = """\
+Render many TSD plots to image files without opening any windows.
+
+Each non-blank line of a spec file describes one plot:
+
+  OUTPUT COMMAND ARGUMENTS...
+
+OUTPUT is the image to write, relative to --output-dir; its extension picks
+the format (.png, .svg, .pdf).  COMMAND is plot (as tsd-plot) or seasonal
+(as tsd-season-plot), and unambiguous prefixes are accepted.  ARGUMENTS are
+passed to that command and are split with shell quoting rules.  Lines
+starting with # are comments.  For example:
+
+  weight.png  plot weight --format line --bin-width week
+  steps.svg   seasonal steps --heatmap
+
+Plots are rendered in parallel worker processes using matplotlib's Agg
+backend, and the time taken by each plot is reported.  Plots whose files and
+arguments are unchanged since they were last rendered are copied from the
+render cache; add --no-cache to a spec line to always redraw it.
+"""
+
+# Each worker process keeps one figure and redraws it for every plot.
+_FIGURE: plt.Figure | None = None
+
+
+@dataclass(frozen=True)
+class PlotSpec:
+    """One plot to render: output path, command and its arguments."""
+
+    output: Path
+    command: str
+    arguments: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PlotResult:
+    """Outcome of rendering one :class:`PlotSpec`."""
+
+    spec: PlotSpec
+    seconds: float
+    error: str | None = None
+    cached: bool = False
+
+
+def parse_spec_line(line: str, output_dir: Path) -> PlotSpec | None:
+    """Parse one spec line, returning ``None`` for blanks and comments.
+
+    Raises :class:`ValueError` if the line is malformed.
+    """
+
+    words = shlex.split(line, comments=True)
+    if not words:
+        return None
+    if len(words) < 3:
+        raise ValueError(f"Expected OUTPUT COMMAND ARGUMENTS in {line!r}")
+    output, command, *arguments = words
+    try:
+        command = resolve_prefix(command, COMMANDS)
+    except PrefixMatchError as exc:
+        raise ValueError(str(exc)) from exc
+    return PlotSpec(
+        output=output_dir / output,
+        command=command,
+        arguments=tuple(arguments),
+    )
+
+
+def parse_specs(lines: Iterable[str], output_dir: Path) -> List[PlotSpec]:
+    """Parse all spec *lines*, naming the line number of any error."""
+
+    specs: List[PlotSpec] = []
+    for number, line in enumerate(lines, start=1):
+        try:
+            spec = parse_spec_line(line, output_dir)
+        except ValueError as exc:
+            raise ValueError(f"line {number}: {exc}") from exc
+        if spec is not None:
+            specs.append(spec)
+    return specs
+
+
+def init_worker() -> None:
+    """Select the non-interactive backend in a worker process."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def render_spec(spec: PlotSpec) -> PlotResult:
+    """Render *spec* to its output file, reusing this worker's figure."""
+
+    global _FIGURE
+
+    create_parser, renderer = COMMANDS[spec.command]
+    start = time.perf_counter()
+    try:
+        parser = create_parser()
+        args = parser.parse_args(spec.arguments)
+        spec.output.parent.mkdir(parents=True, exist_ok=True)
+        key = cli.plot_cache_key(spec.command, args, spec.output)
+        if key and cli.restore_cached_plot(key, spec.output):
+            return PlotResult(spec, time.perf_counter() - start, cached=True)
+        _FIGURE = renderer(parser, args, _FIGURE)
+        cli.save_figure(_FIGURE, spec.output)
+        if key:
+            cli.store_cached_plot(key, spec.output)
+    except SystemExit:
+        # argparse has already explained the problem on stderr.
+        error = "invalid arguments"
+    except Exception as exc:  # report the failure and keep going
+        error = str(exc) or type(exc).__name__
+    else:
+        error = None
+    return PlotResult(spec, time.perf_counter() - start, error)
+
+
+def render_all(specs: Sequence[PlotSpec], jobs: int) -> List[PlotResult]:
+    """Render *specs* using *jobs* worker processes, in spec order."""
+
+    if jobs <= 1 or len(specs) <= 1:
+        init_worker()
+        return [render_spec(spec) for spec in specs]
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(specs)), initializer=init_worker
+    ) as executor:
+        return list(executor.map(render_spec, specs))
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the batch rendering argument parser."""
+
+    parser = argparse.ArgumentParser(
+        description=HELP_OVERVIEW,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "specs",
+        metavar="SPEC_FILE",
+        help="File listing the plots to render, or - to read stdin.",
+    )
+    parser.add_argument(
+        "-d",
+        "--output-dir",
+        type=Path,
+        default=Path("."),
+        help="Directory that relative OUTPUT paths are written under.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: one per CPU).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the ``tsd-plot-batch`` command."""
+
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        if args.specs == "-":
+            specs = parse_specs(sys.stdin, args.output_dir)
+        else:
+            with open(args.specs, encoding="utf8") as handle:
+                specs = parse_specs(handle, args.output_dir)
+    except (OSError, ValueError) as exc:
+        parser.error(f"{args.specs}: {exc}")
+
+    start = time.perf_counter()
+    results = render_all(specs, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for result in results:
+        if result.cached:
+            print(f"{result.seconds:8.3f}s  {result.spec.output}  (cached)")
+        elif result.error is None:
+            print(f"{result.seconds:8.3f}s  {result.spec.output}")
+        else:
+            failures += 1
+            print(
+                f"{result.seconds:8.3f}s  {result.spec.output}  "
+                f"FAILED: {result.error}"
+            )
+    print(
+        f"Rendered {len(results) - failures} of {len(results)} plots "
+        f"in {elapsed:.3f}s with {min(args.jobs, max(len(specs), 1))} "
+        "worker(s)."
+    )
+    if failures:
+        sys.exit(1)
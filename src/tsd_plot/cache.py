@@ -0,0 +1,174 @@
+"""Content-addressed cache of plot outputs and derived data.
+
+Entries live under ``$XDG_CACHE_HOME/tsd/plots`` and are named by a
+hash of everything that determines them: the fingerprints (size and
+modification time) of the input files, the source of this package and
+the normalized parameters.  An entry is therefore never stale; when an
+input changes the key changes and the old entry ages out.  Reading an
+entry marks it as recently used, and writing one evicts the least
+recently used entries beyond a size budget.
+
+This module only uses the standard library so that a cache hit costs
+no more than hashing a few file names.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+CACHE_SUBPATH = Path("tsd") / "plots"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump to invalidate every entry after a change in the key layout.
+KEY_VERSION = 1
+
+
+def cache_dir() -> Path:
+    """Return the directory holding cache entries."""
+
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return Path(cache_home) / CACHE_SUBPATH
+    return Path.home() / ".cache" / CACHE_SUBPATH
+
+
+def file_fingerprint(path: Path) -> list:
+    """Return the absolute name, size and mtime in ns of *path*."""
+
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def source_fingerprint() -> list:
+    """Return fingerprints of this package's modules.
+
+    Including them in every key means that changing how plots are
+    drawn retires the entries drawn the old way.
+    """
+
+    package_dir = Path(__file__).resolve().parent
+    return [
+        file_fingerprint(path) for path in sorted(package_dir.glob("*.py"))
+    ]
+
+
+def cache_key(
+    kind: str, inputs: Iterable[Path], params: Mapping[str, Any]
+) -> str:
+    """Return the key of a *kind* entry derived from *inputs* and *params*.
+
+    Raises :class:`OSError` if an input cannot be examined.
+    """
+
+    material = {
+        "version": KEY_VERSION,
+        "kind": kind,
+        "inputs": [file_fingerprint(path) for path in inputs],
+        "source": source_fingerprint(),
+        "params": params,
+    }
+    text = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf8")).hexdigest()
+
+
+class Cache:
+    """A directory of cache entries with least-recently-used eviction."""
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = cache_dir() if directory is None else directory
+        self.max_bytes = max_bytes
+
+    def entry(self, key: str, suffix: str = "") -> Path:
+        """Return the file name of the entry *key*."""
+
+        return self.directory / (key + suffix)
+
+    def lookup(self, key: str, suffix: str = "") -> Path | None:
+        """Return the entry *key*, marking it used, or ``None``."""
+
+        path = self.entry(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def read_bytes(self, key: str, suffix: str = "") -> bytes | None:
+        """Return the content of the entry *key*, or ``None``."""
+
+        path = self.lookup(key, suffix)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def restore(self, key: str, suffix: str, destination: Path) -> bool:
+        """Copy the entry *key* to *destination* if there is one."""
+
+        path = self.lookup(key, suffix)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, destination)
+        except OSError:
+            return False
+        return True
+
+    def write_bytes(self, key: str, data: bytes, suffix: str = "") -> None:
+        """Store *data* as the entry *key*.  Failure is not an error."""
+
+        self._store(key, suffix, lambda tmp: tmp.write_bytes(data))
+
+    def store(self, key: str, suffix: str, source: Path) -> None:
+        """Store a copy of *source* as the entry *key*."""
+
+        self._store(key, suffix, lambda tmp: shutil.copyfile(source, tmp))
+
+    def _store(self, key: str, suffix: str, write) -> None:
+        path = self.entry(key, suffix)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write(tmp)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries beyond :attr:`max_bytes`."""
+
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if item.is_file() and not item.name.endswith(".tmp"):
+                        stat = item.stat()
+                        entries.append(
+                            (stat.st_mtime_ns, stat.st_size, item.path)
+                        )
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(name)
+            except OSError:
+                continue
+            total -= size
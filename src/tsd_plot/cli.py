@@ -4,29 +4,179 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import fnmatch
+import heapq
+import itertools
+import json
+import math
+import operator
 import os
+import re
 import statistics
+import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Sequence, Tuple
-
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
-import seaborn as sns
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - matplotlib is imported on demand
+    import matplotlib.pyplot as plt
 
 BIN_KEYWORDS = {
     "week": 7,
     "month": 30,
     "year": 365,
 }
+# Calendar bins follow the calendar rather than a fixed number of days.
+# Month-based bins are given as the number of months they span.
+ISO_WEEK = "iso-week"
+CALENDAR_MONTHS = {
+    "calendar-month": 1,
+    "quarter": 3,
+    "calendar-year": 12,
+}
+CALENDAR_BINS = (ISO_WEEK,) + tuple(CALENDAR_MONTHS)
+# 1970-01-01, day 0, was a Thursday; ISO weeks start on Monday.
+ISO_WEEK_OFFSET = 3
+
+# A bin width is a number of days or one of CALENDAR_BINS.
+BinWidth = Union[int, str]
+
+# A bin reducer receives the values grouped by bin (in input order
+# within each bin), the index where each bin starts and the number of
+# values in each bin.  It returns one value per bin.
+BinReducer = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+def _bin_ids(counts: np.ndarray) -> np.ndarray:
+    """Return the bin index of every grouped value."""
+
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def _sorted_within_bins(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sort grouped values within each bin."""
+
+    return values[np.lexsort((values, _bin_ids(counts)))]
+
+
+def _reduce_sum(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the sum of each bin."""
+
+    return np.add.reduceat(values, starts)
+
+
+def _reduce_mean(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the mean of each bin."""
+
+    return np.add.reduceat(values, starts) / counts
+
+
+def _reduce_median(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the median of each bin."""
+
+    ordered = _sorted_within_bins(values, counts)
+    low = ordered[starts + (counts - 1) // 2]
+    high = ordered[starts + counts // 2]
+    return (low + high) / 2
+
+
+def _reduce_min(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the minimum of each bin."""
+
+    return np.minimum.reduceat(values, starts)
+
+
+def _reduce_max(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the maximum of each bin."""
+
+    return np.maximum.reduceat(values, starts)
+
+
+def _reduce_count(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the number of values in each bin."""
+
+    return counts.astype(float)
 
-BIN_FUNCTIONS: Dict[str, Callable[[Iterable[float]], float]] = {
-    "mean": statistics.fmean,
-    "median": statistics.median,
-    "sum": sum,
+
+def _reduce_std(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Return the sample standard deviation, ``nan`` for single values."""
+
+    means = np.add.reduceat(values, starts) / counts
+    deviations = values - np.repeat(means, counts)
+    squares = np.add.reduceat(deviations * deviations, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            counts > 1, np.sqrt(squares / np.maximum(counts - 1, 1)), np.nan
+        )
+
+
+def percentile_reducer(percent: float) -> BinReducer:
+    """Return a reducer for the *percent* percentile of each bin.
+
+    Percentiles interpolate linearly between order statistics, as
+    :func:`numpy.percentile` does by default.
+    """
+
+    fraction = percent / 100.0
+
+    def reduce_percentile(
+        values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+    ) -> np.ndarray:
+        ordered = _sorted_within_bins(values, counts)
+        position = (counts - 1) * fraction
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, counts - 1)
+        weight = position - below
+        low = ordered[starts + below]
+        high = ordered[starts + above]
+        return low + (high - low) * weight
+
+    return reduce_percentile
+
+
+BIN_FUNCTIONS: Dict[str, BinReducer] = {
+    "count": _reduce_count,
+    "max": _reduce_max,
+    "mean": _reduce_mean,
+    "median": _reduce_median,
+    "min": _reduce_min,
+    "std": _reduce_std,
+    "sum": _reduce_sum,
 }
+PERCENTILE_PATTERN = re.compile(r"p(\d{1,2}(?:\.\d+)?|100)")
 
+DEFAULT_QUANTILES = "0.25,0.5,0.75"
+REGEX_PREFIX = "re:"
+GLOB_CHARS = "*?["
+LOAD_WORKERS = 8
 PLOT_FORMATS = {"bar", "line", "scatter", "stacked"}
+ZOOM_FORMATS = {"line", "scatter"}
 
 EPOCH = _dt.date(1970, 1, 1)
 HELP_OVERVIEW = """\
@@ -40,7 +190,9 @@ when you want repeated-period views that emphasise seasonality.
 Option groups:
   input and grouping   choose files, summation, and binning behaviour
   plot appearance      choose plot format, title, and axis labeling
-  statistics           request derived numeric summaries
+  statistics           request derived numeric summaries, or print them
+                       instead of plotting
+  output               write the plot to a file instead of a window
   diagnostics          print resolved settings and data summaries
 """
 
@@ -75,13 +227,32 @@ def resolve_prefix(value: str, options: Iterable[str]) -> str:
     return matches[0]
 
 
-def parse_bin_width(value: str) -> int:
+def resolve_bin_function(value: str) -> Tuple[str, BinReducer]:
+    """Resolve a ``--bin-function`` name to its reducer.
+
+    Names in :data:`BIN_FUNCTIONS` may be abbreviated; ``pNN`` selects
+    the NN-th percentile.
+    """
+
+    match = PERCENTILE_PATTERN.fullmatch(value.lower())
+    if match:
+        return match.group(0), percentile_reducer(float(match.group(1)))
+    name = resolve_prefix(value, BIN_FUNCTIONS)
+    return name, BIN_FUNCTIONS[name]
+
+
+def parse_bin_width(value: str) -> BinWidth:
     """Parse the ``--bin-width`` argument."""
 
     normalized = value.lower()
     for keyword, days in BIN_KEYWORDS.items():
         if keyword.startswith(normalized):
             return days
+    if any(keyword.startswith(normalized) for keyword in CALENDAR_BINS):
+        try:
+            return resolve_prefix(normalized, CALENDAR_BINS)
+        except PrefixMatchError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from exc
     try:
         width = int(value)
     except ValueError as exc:  # pragma: no cover - defensive branch
@@ -93,6 +264,14 @@ def parse_bin_width(value: str) -> int:
     return width
 
 
+def describe_bin_width(width: BinWidth) -> str:
+    """Return a short human description of *width*."""
+
+    if isinstance(width, str):
+        return width.replace("-", " ") + " bins"
+    return f"width {width} days"
+
+
 def parse_filespec(value: str) -> Tuple[str, str]:
     """Split *value* into filename and legend label."""
 
@@ -104,6 +283,96 @@ def parse_filespec(value: str) -> Tuple[str, str]:
     return value, value
 
 
+def is_pattern(filename: str) -> bool:
+    """Return whether *filename* is a glob or ``re:`` series pattern."""
+
+    return filename.startswith(REGEX_PREFIX) or any(
+        char in filename for char in GLOB_CHARS
+    )
+
+
+def series_names(base_dir: Path) -> List[str]:
+    """Return the sorted names of the series files in *base_dir*."""
+
+    from tsd.cli import is_series_filename
+
+    with os.scandir(base_dir) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.is_file()
+            and not entry.name.startswith(".")
+            and is_series_filename(entry.name)
+        )
+
+
+def expand_filespecs(
+    values: Sequence[str], base_dir: Path
+) -> List[Tuple[str, str]]:
+    """Resolve ``FILE[:LABEL]`` arguments, expanding series patterns.
+
+    ``re:REGEX`` selects the series whose names match REGEX anywhere
+    (use ``^`` to anchor it), and a FILE containing ``*``, ``?`` or
+    ``[`` is a glob.  Each matched series is labelled with its name.
+    Raises :class:`ValueError` for a bad regex or a pattern that
+    matches nothing.
+    """
+
+    names: List[str] | None = None
+    file_specs: List[Tuple[str, str]] = []
+    for value in values:
+        if value.startswith(REGEX_PREFIX):
+            filename = value
+        else:
+            filename, label = parse_filespec(value)
+            if not is_pattern(filename):
+                file_specs.append((filename, label))
+                continue
+        if names is None:
+            try:
+                names = series_names(base_dir)
+            except OSError as exc:
+                raise ValueError(f"Cannot list {base_dir}: {exc}") from exc
+        if filename.startswith(REGEX_PREFIX):
+            try:
+                regex = re.compile(filename[len(REGEX_PREFIX) :])
+            except re.error as exc:
+                raise ValueError(f"Bad pattern {value!r}: {exc}") from exc
+            matched = [name for name in names if regex.search(name)]
+        else:
+            matched = fnmatch.filter(names, filename)
+        if not matched:
+            raise ValueError(f"No series in {base_dir} match {value!r}")
+        file_specs.extend((name, name) for name in matched)
+    return file_specs
+
+
+def load_series(
+    file_specs: Sequence[Tuple[str, str]], base_dir: Path
+) -> List[SeriesData]:
+    """Read the series named by *file_specs* concurrently, in order.
+
+    Reading is mostly waiting on the file system, which may be a
+    network home directory, so threads overlap the waits.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    if len(file_specs) <= 1:
+        return [
+            read_series(filename, label, base_dir)
+            for filename, label in file_specs
+        ]
+    workers = min(len(file_specs), LOAD_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda spec: read_series(spec[0], spec[1], base_dir),
+                file_specs,
+            )
+        )
+
+
 def read_series(filename: str, label: str, base_dir: Path) -> SeriesData:
     """Read a single TSD file into a :class:`SeriesData`."""
 
@@ -135,37 +404,132 @@ def resolve_tsd_dir() -> Path:
     return Path.home() / "tsd"
 
 
+def points_by_date(
+    points: Sequence[Tuple[_dt.date, float]],
+) -> Iterable[Tuple[_dt.date, float]]:
+    """Return *points* in date order, without copying them if they are."""
+
+    pairs = zip(points, itertools.islice(points, 1, None))
+    if all(first[0] <= second[0] for first, second in pairs):
+        return points
+    return sorted(points, key=operator.itemgetter(0))
+
+
 def sum_series(series: Sequence[SeriesData]) -> SeriesData:
-    """Combine series by summing points with matching dates."""
+    """Combine series by summing points with matching dates.
+
+    The date-ordered points of all series are merged lazily with
+    :func:`heapq.merge`, so the only storage built is the summed output.
+    Values on one date are added in input order.
+    """
 
-    aggregated: Dict[_dt.date, float] = {}
-    for entry in series:
-        for date, value in entry.points:
-            aggregated[date] = aggregated.get(date, 0.0) + value
-    points = sorted(aggregated.items(), key=lambda item: item[0])
+    merged = heapq.merge(
+        *(points_by_date(entry.points) for entry in series),
+        key=operator.itemgetter(0),
+    )
+    points: List[Tuple[_dt.date, float]] = []
+    current_date = None
+    total = 0.0
+    for date, value in merged:
+        if date != current_date:
+            if current_date is not None:
+                points.append((current_date, total))
+            current_date = date
+            total = 0.0
+        total += value
+    if current_date is not None:
+        points.append((current_date, total))
     return SeriesData(label="sum", filename="sum", points=points)
 
 
+def series_arrays(series: SeriesData) -> Tuple[np.ndarray, np.ndarray]:
+    """Return days since :data:`EPOCH` and values of *series* as arrays."""
+
+    if not series.points:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=float)
+    dates, values = zip(*series.points)
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    return days, np.array(values, dtype=float)
+
+
+def arrays_to_points(
+    days: np.ndarray, values: np.ndarray
+) -> List[Tuple[_dt.date, float]]:
+    """Return ``(date, value)`` points from day numbers and values."""
+
+    dates = days.astype("datetime64[D]").astype(object)
+    return list(zip(dates.tolist(), values.tolist()))
+
+
+def bin_codes(days: np.ndarray, width: BinWidth) -> np.ndarray:
+    """Return the bin number of each day since :data:`EPOCH`.
+
+    Bin numbers increase with time, so sorting by them groups each bin.
+    """
+
+    if width == ISO_WEEK:
+        return np.floor_divide(days + ISO_WEEK_OFFSET, 7)
+    if isinstance(width, str):
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        return np.floor_divide(months.astype(np.int64), CALENDAR_MONTHS[width])
+    return np.floor_divide(days, width)
+
+
+def bin_start_days(codes: np.ndarray, width: BinWidth) -> np.ndarray:
+    """Return the first day since :data:`EPOCH` of each bin in *codes*."""
+
+    if width == ISO_WEEK:
+        return codes * 7 - ISO_WEEK_OFFSET
+    if isinstance(width, str):
+        months = (codes * CALENDAR_MONTHS[width]).astype("datetime64[M]")
+        return months.astype("datetime64[D]").astype(np.int64)
+    return codes * width
+
+
 def bin_series(
     series: SeriesData,
-    width: int,
-    reducer: Callable[[Iterable[float]], float],
+    width: BinWidth,
+    reducer: BinReducer,
 ) -> SeriesData:
-    """Bin series data using *width* days and *reducer* aggregation."""
-
-    grouped: Dict[_dt.date, List[float]] = {}
-    for date, value in series.points:
-        offset = (date - EPOCH).days % width
-        bucket = date - _dt.timedelta(days=offset)
-        grouped.setdefault(bucket, []).append(value)
-    binned_points = [
-        (bucket, reducer(values)) for bucket, values in sorted(grouped.items())
-    ]
+    """Bin series data by *width* using *reducer* aggregation.
+
+    *width* is either a number of days, with bins aligned on
+    :data:`EPOCH`, or one of :data:`CALENDAR_BINS`.  Bins are labelled
+    with their first day.
+    """
+
+    days, values = bin_arrays(*series_arrays(series), width, reducer)
     return SeriesData(
-        label=series.label, filename=series.filename, points=binned_points
+        label=series.label,
+        filename=series.filename,
+        points=arrays_to_points(days, values),
     )
 
 
+def bin_arrays(
+    days: np.ndarray,
+    values: np.ndarray,
+    width: BinWidth,
+    reducer: BinReducer,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bin *values* observed on *days*, as :func:`bin_series` does.
+
+    Returns the first day of each bin and its reduced value.
+    """
+
+    if not len(days):
+        return days, values
+    codes = bin_codes(days, width)
+    if np.any(codes[1:] < codes[:-1]):
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        values = values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    reduced = reducer(values, starts, counts)
+    return bin_start_days(codes[starts], width), reduced
+
+
 def ensure_sorted(series: Sequence[SeriesData]) -> List[SeriesData]:
     """Return a new list of series with points sorted by date."""
 
@@ -198,19 +562,52 @@ def format_title(args: argparse.Namespace, filenames: Sequence[str]) -> str:
     return " ".join(filenames)
 
 
+def figure_axes(
+    figure: plt.Figure | None, size: Tuple[float, float]
+) -> Tuple[plt.Figure, plt.Axes]:
+    """Return a figure of *size* inches and its single axes.
+
+    A new figure is created unless *figure* is given, in which case it
+    is cleared and resized so that it can be reused between plots.
+    """
+
+    if figure is None:
+        import matplotlib.pyplot as plt
+
+        return plt.subplots(figsize=size)
+    figure.clear()
+    figure.set_size_inches(size)
+    return figure, figure.add_subplot()
+
+
+def save_figure(figure: plt.Figure, path: str | Path) -> None:
+    """Write *figure* to *path* in the format named by its extension."""
+
+    figure.savefig(path)
+
+
 def prepare_plot_data(
     series_list: Sequence[SeriesData],
-) -> Tuple[List[_dt.date], Dict[str, Dict[_dt.date, float]]]:
-    """Create lookup tables for plotting grouped bar charts."""
-
-    all_dates = sorted(
-        {date for series in series_list for date, _ in series.points}
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Align series on their shared dates for grouped bar charts.
+
+    Returns the sorted days since :data:`EPOCH` and a
+    ``(len(days), len(series_list))`` matrix whose column *k* holds
+    series *k*, with 0.0 where a series has no point.  When a series
+    repeats a date its last value is used.
+    """
+
+    arrays = [series_arrays(series) for series in series_list]
+    all_days = np.unique(
+        np.concatenate([days for days, _ in arrays] or [np.empty(0, int)])
     )
-    value_map: Dict[str, Dict[_dt.date, float]] = {}
-    for series in series_list:
-        mapping = dict(series.points)
-        value_map[series.label] = mapping
-    return all_dates, value_map
+    matrix = np.zeros((len(all_days), len(series_list)))
+    for column, (days, values) in enumerate(arrays):
+        _, last = np.unique(days[::-1], return_index=True)
+        keep = len(days) - 1 - last
+        rows = np.searchsorted(all_days, days[keep])
+        matrix[rows, column] = values[keep]
+    return all_days, matrix
 
 
 def plot_series(
@@ -218,11 +615,24 @@ def plot_series(
     plot_format: str,
     y_label: str,
     title: str,
+    figure: plt.Figure | None = None,
+    density: bool = False,
+    log_density: bool = False,
 ) -> plt.Figure:
-    """Plot the prepared series using matplotlib and seaborn."""
+    """Plot the prepared series using matplotlib and seaborn.
+
+    When *figure* is given it is cleared and drawn into instead of
+    creating a new one.  With *density*, scatter plots count the points
+    of all series per pixel and draw the counts as an image, on a log
+    colour scale if *log_density* is set.
+    """
+
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
     sns.set_theme(style="whitegrid")
-    fig, ax = plt.subplots()
+    fig, ax = figure_axes(figure, plt.rcParams["figure.figsize"])
 
     if not series_list:
         ax.set_title(title)
@@ -238,38 +648,32 @@ def plot_series(
     if plot_format == "stacked" or (
         plot_format == "bar" and len(series_list) > 1
     ):
-        all_dates, value_map = prepare_plot_data(series_list)
-        date_nums = mdates.date2num(all_dates)
+        all_days, matrix = prepare_plot_data(series_list)
+        date_nums = all_days + mdates.date2num(EPOCH)
         width = 0.8
         if plot_format == "stacked":
-            bottoms = [0.0] * len(all_dates)
-            for series in series_list:
-                values = [
-                    value_map[series.label].get(date, 0.0)
-                    for date in all_dates
-                ]
+            bottoms = np.zeros_like(matrix)
+            np.cumsum(matrix[:, :-1], axis=1, out=bottoms[:, 1:])
+            for column, series in enumerate(series_list):
                 ax.bar(
                     date_nums,
-                    values,
+                    matrix[:, column],
                     width=width,
-                    bottom=bottoms,
+                    bottom=bottoms[:, column],
                     label=series.label,
                 )
-                bottoms = [b + v for b, v in zip(bottoms, values)]
         else:  # grouped bars
             count = len(series_list)
             offsets = [
                 width * (idx - (count - 1) / 2) / max(count, 1)
                 for idx in range(count)
             ]
-            for offset, series in zip(offsets, series_list):
-                values = [
-                    value_map[series.label].get(date, 0.0)
-                    for date in all_dates
-                ]
+            for column, (offset, series) in enumerate(
+                zip(offsets, series_list)
+            ):
                 ax.bar(
                     date_nums + offset,
-                    values,
+                    matrix[:, column],
                     width=width / max(count, 1.0),
                     label=series.label,
                 )
@@ -284,6 +688,20 @@ def plot_series(
             dates = [date for date, _ in series.points]
             values = [value for _, value in series.points]
             ax.plot(dates, values, marker="o", label=series.label)
+    elif plot_format == "scatter" and density:
+        days, values = (
+            np.concatenate(arrays)
+            for arrays in zip(*(series_arrays(item) for item in series_list))
+        )
+        x_values = days + mdates.date2num(EPOCH)
+        draw_density(
+            ax,
+            x_values,
+            values,
+            bins=axes_pixels(ax),
+            extent=data_extent(x_values, values),
+            log_scale=log_density,
+        )
     elif plot_format == "scatter":
         for series in series_list:
             dates = [mdates.date2num(date) for date, _ in series.points]
@@ -295,12 +713,158 @@ def plot_series(
     ax.set_title(title)
     ax.set_ylabel(y_label)
     ax.set_xlabel("Date")
-    ax.legend()
+    if not density:
+        ax.legend()
     fig.autofmt_xdate()
     fig.tight_layout()
     return fig
 
 
+def axes_pixels(ax: plt.Axes) -> Tuple[int, int]:
+    """Return the width and height of *ax* in display pixels."""
+
+    return max(int(ax.bbox.width), 1), max(int(ax.bbox.height), 1)
+
+
+def data_extent(
+    x_values: np.ndarray, y_values: np.ndarray
+) -> Tuple[float, float, float, float]:
+    """Return ``(left, right, bottom, top)`` enclosing all points.
+
+    Empty or zero-width ranges are widened so they can be drawn.
+    """
+
+    extent = []
+    for values in (x_values, y_values):
+        low, high = (
+            (float(values.min()), float(values.max()))
+            if len(values)
+            else (0.0, 0.0)
+        )
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        extent.extend((low, high))
+    return tuple(extent)
+
+
+def draw_density(
+    ax: plt.Axes,
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    *,
+    bins: Tuple[int, int],
+    extent: Tuple[float, float, float, float],
+    log_scale: bool = False,
+    alpha: float = 1.0,
+) -> None:
+    """Draw the number of points in each of *bins* cells as an image.
+
+    The cost depends on the number of cells rather than the number of
+    points, which keeps very large scatter plots fast to draw and small
+    to save.  Empty cells are left transparent.
+    """
+
+    from matplotlib.colors import LogNorm
+
+    left, right, bottom, top = extent
+    counts, _, _ = np.histogram2d(
+        x_values, y_values, bins=bins, range=((left, right), (bottom, top))
+    )
+    image = ax.imshow(
+        np.ma.masked_equal(counts.T, 0),
+        extent=extent,
+        origin="lower",
+        aspect="auto",
+        interpolation="nearest",
+        cmap="viridis",
+        norm=LogNorm() if log_scale else None,
+        alpha=alpha,
+    )
+    ax.figure.colorbar(image, ax=ax, label="Points")
+
+
+class ZoomRebinner:
+    """Re-aggregate line and scatter plots to match the visible range.
+
+    Each series is kept as day-sorted arrays.  Whenever the x limits of
+    the axes change, the visible slice is found by binary search and, if
+    it holds more points than the axes is wide in pixels, it is binned
+    to about one bin per pixel with *reducer* before being redrawn.
+    Only the visible points are touched, so panning and zooming stay
+    responsive on very long series.
+    """
+
+    def __init__(
+        self,
+        ax: plt.Axes,
+        artists: Sequence[object],
+        series_list: Sequence[SeriesData],
+        reducer: BinReducer,
+    ) -> None:
+        import matplotlib.dates as mdates
+
+        self.ax = ax
+        self.artists = list(artists)
+        self.reducer = reducer
+        self.epoch = float(mdates.date2num(EPOCH))
+        self.arrays = []
+        for series in series_list:
+            days, values = series_arrays(series)
+            order = np.argsort(days, kind="stable")
+            self.arrays.append((days[order], values[order]))
+
+    def visible(
+        self, days: np.ndarray, values: np.ndarray, low: float, high: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the points to draw between day numbers *low*, *high*."""
+
+        first = max(np.searchsorted(days, low, side="left") - 1, 0)
+        last = np.searchsorted(days, high, side="right") + 1
+        days, values = days[first:last], values[first:last]
+        pixels = max(int(self.ax.bbox.width), 1)
+        if len(days) <= pixels:
+            return days, values
+        width = max(int(np.ceil((high - low) / pixels)), 1)
+        return bin_arrays(days, values, width, self.reducer)
+
+    def __call__(self, ax: plt.Axes) -> None:
+        low, high = (limit - self.epoch for limit in ax.get_xlim())
+        for artist, (days, values) in zip(self.artists, self.arrays):
+            days, values = self.visible(days, values, low, high)
+            x_values = days + self.epoch
+            if hasattr(artist, "set_data"):
+                artist.set_data(x_values, values)
+            else:
+                artist.set_offsets(np.column_stack((x_values, values)))
+        ax.figure.canvas.draw_idle()
+
+
+def attach_zoom_rebinner(
+    figure: plt.Figure,
+    series_list: Sequence[SeriesData],
+    plot_format: str,
+    reducer: BinReducer,
+) -> ZoomRebinner:
+    """Re-aggregate the series of a line or scatter *figure* on zoom.
+
+    The figure is redrawn for its current limits straight away.
+    """
+
+    ax = figure.axes[0]
+    if plot_format == "line":
+        artists = ax.get_lines()
+    elif plot_format == "scatter":
+        artists = ax.collections
+    else:
+        raise ValueError(f"Cannot re-aggregate {plot_format!r} plots")
+    rebinner = ZoomRebinner(ax, artists, series_list, reducer)
+    # The registry holds callable objects strongly, so the rebinner
+    # lives as long as the axes.
+    ax.callbacks.connect("xlim_changed", rebinner)
+    rebinner(ax)
+    return rebinner
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the :mod:`argparse` parser for the CLI."""
 
@@ -317,6 +881,7 @@ def create_parser() -> argparse.ArgumentParser:
     input_group = parser.add_argument_group("input and grouping")
     appearance_group = parser.add_argument_group("plot appearance")
     stats_group = parser.add_argument_group("statistics")
+    output_group = parser.add_argument_group("output")
     diagnostics_group = parser.add_argument_group("diagnostics")
 
     input_group.add_argument(
@@ -325,7 +890,9 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="FILE[:LABEL]",
         help=(
             "Input file names located in $TSD, $TSD_DIR, or $HOME/tsd. "
-            "Append :LABEL to customise the legend entry."
+            "Append :LABEL to customise the legend entry. A FILE with "
+            "shell wildcards (chocolat-*) or of the form re:REGEX "
+            "(re:^tea) selects every matching series."
         ),
     )
     input_group.add_argument(
@@ -343,8 +910,10 @@ def create_parser() -> argparse.ArgumentParser:
         type=parse_bin_width,
         help=(
             "Number of days per bin. Integers are accepted directly; "
-            "unambiguous abbreviations of week, month, and year are "
-            "also accepted."
+            "abbreviations of week, month, and year select 7, 30 and 365 "
+            "days. Calendar bins are iso-week (Monday to Sunday), "
+            "calendar-month, quarter and calendar-year; unambiguous "
+            "abbreviations are accepted."
         ),
     )
     input_group.add_argument(
@@ -352,7 +921,9 @@ def create_parser() -> argparse.ArgumentParser:
         default="mean",
         help=(
             "Aggregation used within each bin. Allowed values: mean, "
-            "median, sum. Unambiguous abbreviations are accepted."
+            "median, sum, min, max, count, std, and pNN for the NN-th "
+            "percentile (for example p90). Unambiguous abbreviations are "
+            "accepted."
         ),
     )
     appearance_group.add_argument(
@@ -368,6 +939,52 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print the sample standard deviation of each plotted series.",
     )
+    stats_group.add_argument(
+        "--no-plot",
+        action="store_true",
+        help=(
+            "Print summary statistics of each series (after --sum and "
+            "binning) instead of plotting: count, mean, sample standard "
+            "deviation, minimum, maximum and --quantiles."
+        ),
+    )
+    stats_group.add_argument(
+        "--stats-format",
+        choices=("tsv", "json"),
+        default="tsv",
+        help="Output format for --no-plot.",
+    )
+    stats_group.add_argument(
+        "--quantiles",
+        type=parse_quantiles,
+        default=DEFAULT_QUANTILES,
+        metavar="Q[,Q...]",
+        help="Quantiles, between 0 and 1, printed by --no-plot.",
+    )
+    appearance_group.add_argument(
+        "--density",
+        action="store_true",
+        help=(
+            "For scatter plots, draw the number of points per pixel as an "
+            "image instead of one marker per point. Much faster for very "
+            "large series."
+        ),
+    )
+    appearance_group.add_argument(
+        "--log-density",
+        action="store_true",
+        help="Use a logarithmic colour scale with --density.",
+    )
+    appearance_group.add_argument(
+        "--zoom",
+        action="store_true",
+        help=(
+            "For line and scatter plots, re-aggregate the visible date "
+            "range with --bin-function whenever the view is zoomed or "
+            "panned, at about one bin per pixel. Replaces --bin and "
+            "--bin-width."
+        ),
+    )
     appearance_group.add_argument(
         "-t",
         "--title",
@@ -379,6 +996,22 @@ def create_parser() -> argparse.ArgumentParser:
         default="Value",
         help="Label for the Y axis.",
     )
+    output_group.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help=(
+            "Write the plot to PATH instead of opening a window. The "
+            "format follows the extension, for example .png or .svg. "
+            "Unless --no-cache is given, an identical earlier plot of "
+            "unchanged files is copied from the cache instead of redrawn."
+        ),
+    )
+    output_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always redraw the plot, and do not cache it.",
+    )
     diagnostics_group.add_argument(
         "-v",
         "--verbose",
@@ -393,33 +1026,199 @@ def main(argv: Sequence[str] | None = None) -> None:
 
     parser = create_parser()
     args = parser.parse_args(argv)
+    if args.no_plot:
+        series, _ = prepare_series(parser, args)
+        summaries = [summarize_series(item, args.quantiles) for item in series]
+        print(format_summaries(summaries, args.stats_format), end="")
+        return
+    # --std prints results that the cache does not record.
+    key = None if args.std else plot_cache_key("plot", args, args.output)
+    if key and restore_cached_plot(key, args.output, args.verbose):
+        return
+    figure = render(parser, args)
+    show_or_save(figure, args)
+    if key:
+        store_cached_plot(key, args.output)
+
+
+def summary_main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the ``tsd-summary`` command.
+
+    This is ``tsd-plot --no-plot``: it prints summary statistics of the
+    loaded, summed and binned series and never loads a plotting library.
+    """
+
+    main(["--no-plot", *(sys.argv[1:] if argv is None else argv)])
+
+
+def parse_quantiles(value: str) -> List[float]:
+    """Parse the ``--quantiles`` argument."""
+
+    try:
+        quantiles = [float(item) for item in value.split(",") if item]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "Quantiles must be comma-separated numbers"
+        ) from exc
+    if not all(0.0 <= quantile <= 1.0 for quantile in quantiles):
+        raise argparse.ArgumentTypeError("Quantiles must be between 0 and 1")
+    return quantiles
+
+
+def summarize_series(
+    series: SeriesData, quantiles: Sequence[float]
+) -> Dict[str, object]:
+    """Return count, mean, spread, range and *quantiles* of *series*.
+
+    The standard deviation is the sample one, as printed by ``--std``.
+    Statistics that a series is too short for are NaN.
+    """
+
+    _, values = series_arrays(series)
+    count = len(values)
+    summary: Dict[str, object] = {"label": series.label, "n": count}
+    if count:
+        summary["mean"] = float(values.mean())
+        summary["std"] = float(values.std(ddof=1)) if count > 1 else math.nan
+        summary["min"] = float(values.min())
+        summary["max"] = float(values.max())
+        results = np.quantile(values, quantiles) if quantiles else []
+    else:
+        summary.update(mean=math.nan, std=math.nan, min=math.nan, max=math.nan)
+        results = [math.nan] * len(quantiles)
+    for quantile, result in zip(quantiles, results):
+        summary[f"p{quantile * 100:g}"] = float(result)
+    return summary
+
+
+def format_summaries(
+    summaries: Sequence[Dict[str, object]], style: str
+) -> str:
+    """Format *summaries* as tab-separated lines or a JSON array."""
+
+    if style == "json":
+        cleaned = [
+            {
+                name: (
+                    None
+                    if isinstance(value, float) and math.isnan(value)
+                    else value
+                )
+                for name, value in summary.items()
+            }
+            for summary in summaries
+        ]
+        return json.dumps(cleaned, indent=2) + "\n"
+    if not summaries:
+        return ""
+    lines = ["\t".join(summaries[0])]
+    for summary in summaries:
+        lines.append("\t".join(str(value) for value in summary.values()))
+    return "\n".join(lines) + "\n"
+
+
+# Arguments that do not change the rendered plot.
+UNCACHED_ARGS = {"no_cache", "output", "verbose"}
+
+
+def plot_cache_key(
+    kind: str, args: argparse.Namespace, output: str | Path | None
+) -> str | None:
+    """Return the render cache key for writing *args*' plot to *output*.
+
+    Returns ``None`` when the plot should not be cached: it is shown
+    rather than saved, caching is disabled, or an input is missing.
+    """
+
+    from .cache import cache_key
+
+    if not output or args.no_cache:
+        return None
+    base_dir = resolve_tsd_dir()
+    try:
+        file_specs = expand_filespecs(args.files, base_dir)
+    except ValueError:
+        return None
+    inputs = [base_dir / filename for filename, _ in file_specs]
+    params = {
+        name: value
+        for name, value in vars(args).items()
+        if name not in UNCACHED_ARGS
+    }
+    params["output_suffix"] = Path(output).suffix.lower()
+    try:
+        return cache_key(kind, inputs, params)
+    except OSError:
+        return None
+
+
+def restore_cached_plot(
+    key: str, output: str | Path, verbose: bool = False
+) -> bool:
+    """Copy a cached rendering of *key* to *output* if there is one."""
+
+    from .cache import Cache
+
+    if not Cache().restore(key, Path(output).suffix.lower(), Path(output)):
+        return False
+    if verbose:
+        print(f"Reused cached plot for {output}")
+    return True
+
+
+def store_cached_plot(key: str, output: str | Path) -> None:
+    """Record the plot just written to *output* under *key*."""
+
+    from .cache import Cache
+
+    Cache().store(key, Path(output).suffix.lower(), Path(output))
+
+
+def show_or_save(figure: plt.Figure, args: argparse.Namespace) -> None:
+    """Save *figure* to ``args.output`` or show it interactively."""
+
+    if args.output:
+        save_figure(figure, args.output)
+        if args.verbose:
+            print(f"Saved figure to {args.output}")
+        return
+
+    import matplotlib.pyplot as plt
+
+    plt.show()
+
+
+def prepare_series(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Tuple[List[SeriesData], List[str]]:
+    """Load, sum and bin the series requested by *args*.
+
+    Returns the series sorted by date and the names of the files read.
+    Invalid arguments are reported through ``parser.error``.  Nothing
+    here imports a plotting library.
+    """
 
     def log(message: str) -> None:
         if args.verbose:
             print(message)
 
     try:
-        plot_format = resolve_prefix(args.format, PLOT_FORMATS)
-    except PrefixMatchError as exc:
-        parser.error(str(exc))
-
-    try:
-        reducer_name = resolve_prefix(args.bin_function, BIN_FUNCTIONS)
+        reducer_name, reducer = resolve_bin_function(args.bin_function)
     except PrefixMatchError as exc:
         parser.error(str(exc))
-    reducer = BIN_FUNCTIONS[reducer_name]
-    log(f"Plot format resolved to: {plot_format}")
     log(f"Bin function resolved to: {reducer_name}")
 
-    file_specs = [parse_filespec(value) for value in args.files]
-    filenames = [name for name, _ in file_specs]
     base_dir = resolve_tsd_dir()
     log(f"Reading data from base directory: {base_dir}")
+    try:
+        file_specs = expand_filespecs(args.files, base_dir)
+    except ValueError as exc:
+        parser.error(str(exc))
+    filenames = [name for name, _ in file_specs]
 
-    series = [
-        read_series(filename, label, base_dir)
-        for filename, label in file_specs
-    ]
+    start = time.perf_counter()
+    series = load_series(file_specs, base_dir)
+    elapsed = time.perf_counter() - start
 
     total_points = sum(len(item.points) for item in series)
     log(
@@ -427,6 +1226,7 @@ def main(argv: Sequence[str] | None = None) -> None:
             len(series), total_points
         )
     )
+    log(f"Loading took {elapsed:.3f}s.")
     for item in series:
         log(f"  {item.label} ({item.filename}): {len(item.points)} points")
     all_dates = [date for item in series for date, _ in item.points]
@@ -443,8 +1243,8 @@ def main(argv: Sequence[str] | None = None) -> None:
     if args.bin or args.bin_width is not None:
         width = args.bin_width or 7
         log(
-            "Binning data with width {} days using {} aggregation.".format(
-                width, reducer_name
+            "Binning data with {} using {} aggregation.".format(
+                describe_bin_width(width), reducer_name
             )
         )
         series = [bin_series(item, width, reducer) for item in series]
@@ -463,7 +1263,41 @@ def main(argv: Sequence[str] | None = None) -> None:
             else:
                 log(f"  {item.label}: 0 bins")
 
-    series = ensure_sorted(series)
+    return ensure_sorted(series), filenames
+
+
+def render(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    figure: plt.Figure | None = None,
+) -> plt.Figure:
+    """Load, transform and plot the data requested by *args*.
+
+    Invalid arguments are reported through ``parser.error``.  When
+    *figure* is given it is reused for the plot.
+    """
+
+    def log(message: str) -> None:
+        if args.verbose:
+            print(message)
+
+    try:
+        plot_format = resolve_prefix(args.format, PLOT_FORMATS)
+    except PrefixMatchError as exc:
+        parser.error(str(exc))
+
+    if args.zoom and plot_format not in ZOOM_FORMATS:
+        parser.error("--zoom needs the line or scatter format")
+    density = args.density or args.log_density
+    if density and plot_format != "scatter":
+        parser.error("--density needs the scatter format")
+    if args.zoom and density:
+        parser.error("--zoom and --density cannot be combined")
+    if args.zoom and (args.bin or args.bin_width is not None):
+        parser.error("--zoom replaces --bin and --bin-width")
+    log(f"Plot format resolved to: {plot_format}")
+
+    series, filenames = prepare_series(parser, args)
     total_points = sum(len(item.points) for item in series)
     log(
         "Preparing to plot {} points across {} series.".format(
@@ -477,12 +1311,23 @@ def main(argv: Sequence[str] | None = None) -> None:
     title = format_title(args, filenames)
     log(f"Plot title: {title}")
     log(f"Y-axis label: {args.y_label}")
-    figure = plot_series(series, plot_format, args.y_label, title)
+    figure = plot_series(
+        series,
+        plot_format,
+        args.y_label,
+        title,
+        figure=figure,
+        density=density,
+        log_density=args.log_density,
+    )
     log(f"Generated figure with {len(figure.axes)} axes.")
+    if args.zoom:
+        _, reducer = resolve_bin_function(args.bin_function)
+        attach_zoom_rebinner(figure, series, plot_format, reducer)
+        log("Re-aggregating the visible range on zoom.")
 
     if args.std:
         for item in series:
             std_value = compute_std([value for _, value in item.points])
             print(f"{item.label}: {std_value}")
-
-    plt.show()
+    return figure
@@ -5,24 +5,49 @@ from __future__ import annotations
 import argparse
 import calendar
 import datetime as dt
+import io
 import math
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+)
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 
 from .cli import (
+    EPOCH,
+    ISO_WEEK_OFFSET,
     PrefixMatchError,
     SeriesData,
+    axes_pixels,
+    draw_density,
+    expand_filespecs,
+    figure_axes,
     format_title,
-    parse_filespec,
+    load_series,
+    plot_cache_key,
     read_series,
     resolve_prefix,
     resolve_tsd_dir,
+    restore_cached_plot,
+    series_arrays,
+    show_or_save,
+    store_cached_plot,
     sum_series,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - matplotlib is imported on demand
+    import matplotlib.pyplot as plt
+
 PERIODS = {"year", "month", "week"}
 HEATMAP_MODES = {"sum", "mean", "count"}
 HEATMAP_STYLES = {"seasonal", "evolving"}
@@ -36,6 +61,13 @@ DEFAULT_HEATMAP_SIGMA = {
     "week": 0.75,
 }
 DEFAULT_HEATMAP_SIGMA_Y = 0.75
+# Row smoothing ignores weights beyond this many standard deviations.
+ROW_KERNEL_TRUNCATE = 4.0
+DEFAULT_PRESENCE_COLOR = "green"
+PRESENCE_DAYS = 366
+FIGURE_SIZE = (11.0, 7.0)
+GRID_PANEL_SIZE = (3.6, 2.6)
+GRID_WORKERS = 8
 HELP_OVERVIEW = """\
 Plot repeated-season views of TSD time series to spot seasonal structure.
 
@@ -44,82 +76,111 @@ week. The y-axis stacks rows by year-like buckets, so repeated vertical bands
 indicate stable seasonality while diagonal trends can reveal drift over time.
 
 Option groups:
-  input and grouping   choose files, period, and summation behaviour
+  input and grouping   choose files, period, summation and grid layout
   point appearance     control title, color, dot size, and dot opacity
   heatmap overlay      add a smoothed background to emphasise seasonal zones
   reference guides     control month-boundary guide lines in year view
+  output               write the plot to a file instead of a window
   diagnostics          print resolved settings and data summaries
 """
 
 
-@dataclass(frozen=True)
-class PeriodPoint:
-    """A plotted point located within a repeated time period."""
-
-    row_key: str
-    x_value: float
-
-
 def is_leap_year(year: int) -> bool:
     """Return whether *year* is a leap year."""
     return calendar.isleap(year)
 
 
-def period_point(date: dt.date, period: str) -> PeriodPoint:
-    """Map a date to its seasonal row and x-axis position."""
+def project_days(
+    days: np.ndarray, period: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Map days since the epoch to period rows and x-axis positions.
+
+    Rows are integer codes that increase with time: the year for year
+    periods, months since 1970-01 for month periods and ISO weeks since
+    the week of 1970-01-01 for week periods.  Positions count days from
+    the start of the row's period.  Use :func:`row_label` to name a row.
+    """
+    if period == "week":
+        shifted = days + ISO_WEEK_OFFSET
+        return np.floor_divide(shifted, 7), np.mod(shifted, 7).astype(float)
+    dates = days.astype("datetime64[D]")
     if period == "year":
-        return PeriodPoint(
-            row_key=str(date.year),
-            x_value=float(date.timetuple().tm_yday - 1),
-        )
+        starts = dates.astype("datetime64[Y]")
+        codes = starts.astype(np.int64) + 1970
+    elif period == "month":
+        starts = dates.astype("datetime64[M]")
+        codes = starts.astype(np.int64)
+    else:
+        raise ValueError(f"Unsupported period {period!r}")
+    offsets = dates - starts.astype("datetime64[D]")
+    return codes, offsets.astype(np.int64).astype(float)
+
+
+def row_label(code: int, period: str) -> str:
+    """Return the label of the row *code* from :func:`project_days`."""
+    if period == "year":
+        return str(code)
     if period == "month":
-        return PeriodPoint(
-            row_key=f"{date.year:04d}-{date.month:02d}",
-            x_value=float(date.day - 1),
-        )
+        year, month = divmod(int(code), 12)
+        return f"{1970 + year:04d}-{month + 1:02d}"
     if period == "week":
-        iso_year, iso_week, iso_day = date.isocalendar()
-        return PeriodPoint(
-            row_key=f"{iso_year:04d}-W{iso_week:02d}",
-            x_value=float(iso_day - 1),
-        )
+        monday = EPOCH + dt.timedelta(days=int(code) * 7 - ISO_WEEK_OFFSET)
+        iso_year, iso_week, _ = monday.isocalendar()
+        return f"{iso_year:04d}-W{iso_week:02d}"
     raise ValueError(f"Unsupported period {period!r}")
 
 
+def row_layout(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return each point's row position and the codes of all rows.
+
+    Rows are numbered from the latest period down, so that after the
+    y-axis is inverted the earliest period is at the bottom.
+    """
+    row_codes, inverse = np.unique(codes, return_inverse=True)
+    return len(row_codes) - 1 - inverse, row_codes[::-1]
+
+
 def project_series_to_period(
     series: SeriesData, period: str
 ) -> List[Tuple[str, float, float]]:
     """Project a series into repeated-period plotting coordinates."""
-    projected: List[Tuple[str, float, float]] = []
-    for date, value in series.sorted_points():
-        point = period_point(date, period)
-        projected.append((point.row_key, point.x_value, value))
-    return projected
+    days, values = series_arrays(series)
+    order = np.argsort(days, kind="stable")
+    codes, x_values = project_days(days[order], period)
+    labels = {
+        code: row_label(code, period) for code in np.unique(codes).tolist()
+    }
+    return [
+        (labels[code], x_value, value)
+        for code, x_value, value in zip(
+            codes.tolist(), x_values.tolist(), values[order].tolist()
+        )
+    ]
 
 
 def size_map(
-    values: Sequence[float], min_diameter: float, max_diameter: float
-) -> List[float]:
+    values: Sequence[float] | np.ndarray,
+    min_diameter: float,
+    max_diameter: float,
+) -> np.ndarray:
     """Map values to matplotlib scatter areas using diameter bounds."""
-    if not values:
-        return []
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return values
     if min_diameter <= 0 or max_diameter <= 0:
         raise ValueError("Point sizes must be positive")
     if min_diameter > max_diameter:
         raise ValueError("Minimum point size cannot exceed maximum")
 
-    low = min(values)
-    high = max(values)
+    low = values.min()
+    high = values.max()
     if high == low:
         diameter = (min_diameter + max_diameter) / 2.0
-        return [diameter**2 for _ in values]
+        return np.full(len(values), diameter**2)
 
-    areas: List[float] = []
-    for value in values:
-        ratio = (value - low) / (high - low)
-        diameter = min_diameter + ratio * (max_diameter - min_diameter)
-        areas.append(diameter**2)
-    return areas
+    ratio = (values - low) / (high - low)
+    diameters = min_diameter + ratio * (max_diameter - min_diameter)
+    return diameters**2
 
 
 def resolve_size_bounds(
@@ -163,92 +224,223 @@ def resolve_heatmap_sigma(period: str, sigma: float | None) -> float:
     return DEFAULT_HEATMAP_SIGMA[period]
 
 
-def gaussian_weight(distance: float, sigma: float) -> float:
-    """Return a Gaussian kernel weight for *distance* and *sigma*."""
-    return math.exp(-((distance**2) / (2.0 * sigma**2)))
-
-
-def normalize_signal(values: Sequence[float]) -> List[float]:
-    """Scale a signal to the range 0..1."""
-    if not values:
-        return []
-    high = max(values)
+def normalize_array(values: np.ndarray) -> np.ndarray:
+    """Scale an array to the range 0..1."""
+    if not values.size:
+        return values
+    high = values.max()
     if high <= 0:
-        return [0.0 for _ in values]
-    return [value / high for value in values]
+        return np.zeros_like(values)
+    return values / high
+
+
+def gaussian_kernel(
+    positions: np.ndarray, centres: np.ndarray, sigma: float
+) -> np.ndarray:
+    """Return Gaussian weights for every position and centre.
+
+    The result has one row per position and one column per centre.
+    """
+    distance = positions[:, np.newaxis] - centres[np.newaxis, :]
+    return np.exp(-(distance**2) / (2.0 * sigma**2))
+
+
+def smooth_rows(grid: np.ndarray, sigma: float) -> np.ndarray:
+    """Convolve each column of *grid* with a truncated Gaussian.
+
+    The kernel has one tap per row offset up to
+    :data:`ROW_KERNEL_TRUNCATE` standard deviations, so the cost grows
+    with the grid size times the kernel length rather than with the
+    square of the row count.
+    """
+    row_count = grid.shape[0]
+    radius = min(math.ceil(ROW_KERNEL_TRUNCATE * sigma), row_count - 1)
+    offsets = np.arange(-radius, radius + 1, dtype=float)
+    taps = np.exp(-(offsets**2) / (2.0 * sigma**2))
+    padded = np.pad(grid, ((radius, radius), (0, 0)))
+    windows = np.lib.stride_tricks.sliding_window_view(
+        padded, len(taps), axis=0
+    )
+    return windows @ taps
 
 
-def heatmap_numerator_term(mode: str, weight: float, value: float) -> float:
-    """Return the numerator contribution for one point."""
+def accumulate_grid(
+    rows: np.ndarray,
+    x_values: np.ndarray,
+    values: np.ndarray,
+    *,
+    row_count: int,
+    mode: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total the points per row and distinct x position before smoothing.
+
+    Every point in one cell receives the same Gaussian weights, so the
+    heatmap only needs, per cell, the sum of the points' numerator
+    terms (the values, or 1 in count mode) and the number of points.
+    Returns the distinct positions and the ``(row_count, positions)``
+    numerator and count grids.
+    """
+    if mode not in HEATMAP_MODES:
+        raise ValueError(f"Unsupported heatmap mode {mode!r}")
+    positions, inverse = np.unique(x_values, return_inverse=True)
+    cells = rows * len(positions) + inverse
+    shape = (row_count, len(positions))
+    counts = np.bincount(cells, minlength=shape[0] * shape[1])
+    counts = counts.astype(float).reshape(shape)
     if mode == "count":
-        return weight
-    if mode in {"sum", "mean"}:
-        return weight * value
-    raise ValueError(f"Unsupported heatmap mode {mode!r}")
+        return positions, counts, counts
+    totals = np.bincount(cells, weights=values, minlength=counts.size)
+    return positions, totals.reshape(shape), counts
+
+
+def smoothed_ratio(
+    numerator: np.ndarray, denominator: np.ndarray, mode: str
+) -> np.ndarray:
+    """Return the smoothed grid to display for *mode*."""
+    if mode != "mean":
+        return numerator
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator),
+        where=denominator != 0,
+    )
 
 
-def compute_heatmap_signal(  # noqa: CCR001
-    projected: Sequence[Tuple[str, float, float]],
+def smooth_signal(
+    positions: np.ndarray,
+    numerator: np.ndarray,
+    counts: np.ndarray,
     *,
     span: int,
     mode: str,
     sigma: float,
-) -> List[float]:
-    """Compute a smoothed seasonal heatmap signal across the x-axis."""
-    if not projected:
-        return [0.0 for _ in range(span)]
-
+) -> np.ndarray:
+    """Smooth per-position totals into a normalized signal of *span*.
+
+    *numerator* and *counts* hold, for each of the distinct *positions*,
+    the total of the numerator terms and the number of points.
+    """
+    if not len(positions):
+        return np.zeros(span)
     if sigma <= 0:
         raise ValueError("Heatmap sigma must be positive")
+    kernel = gaussian_kernel(np.arange(span, dtype=float), positions, sigma)
+    return normalize_array(
+        smoothed_ratio(kernel @ numerator, kernel @ counts, mode)
+    )
 
-    numerator = [0.0 for _ in range(span)]
-    denominator = [0.0 for _ in range(span)]
-
-    for _, x_value, value in projected:
-        for index in range(span):
-            weight = gaussian_weight(index - x_value, sigma)
-            denominator[index] += weight
-            numerator[index] += heatmap_numerator_term(mode, weight, value)
 
-    if mode == "mean":
-        raw_values = [
-            0.0 if count == 0 else total / count
-            for total, count in zip(numerator, denominator)
-        ]
-    else:
-        raw_values = numerator
-
-    return normalize_signal(raw_values)
+def smooth_evolving(
+    positions: np.ndarray,
+    numerator: np.ndarray,
+    counts: np.ndarray,
+    *,
+    span: int,
+    mode: str,
+    sigma_x: float,
+    sigma_y: float,
+) -> np.ndarray:
+    """Smooth ``(rows, positions)`` grids into a normalized 2D heatmap.
+
+    The 2D Gaussian is the product of a row and a column Gaussian, so
+    the grid is smoothed along each axis in turn: rows with a truncated
+    convolution (:func:`smooth_rows`) and columns with a matrix product
+    over the distinct positions.
+    """
+    row_count = numerator.shape[0]
+    if not len(positions):
+        return np.zeros((row_count, span))
+    if sigma_x <= 0 or sigma_y <= 0:
+        raise ValueError("Heatmap sigmas must be positive")
+    column_kernel = gaussian_kernel(
+        np.arange(span, dtype=float), positions, sigma_x
+    ).T
+    smoothed = smooth_rows(numerator, sigma_y) @ column_kernel
+    denominator = (
+        smooth_rows(counts, sigma_y) @ column_kernel
+        if mode == "mean"
+        else None
+    )
+    return normalize_array(smoothed_ratio(smoothed, denominator, mode))
 
 
-def normalize_matrix(matrix: Sequence[Sequence[float]]) -> List[List[float]]:
-    """Scale a matrix to the range 0..1."""
-    flattened = [value for row in matrix for value in row]
-    if not flattened:
-        return []
-    high = max(flattened)
-    if high <= 0:
-        return [[0.0 for value in row] for row in matrix]
-    return [[value / high for value in row] for row in matrix]
+def heatmap_signal(
+    x_values: np.ndarray,
+    values: np.ndarray,
+    *,
+    span: int,
+    mode: str,
+    sigma: float,
+) -> np.ndarray:
+    """Array version of :func:`compute_heatmap_signal`."""
+    if not len(x_values):
+        return np.zeros(span)
+    positions, totals, counts = accumulate_grid(
+        np.zeros(len(x_values), dtype=np.int64),
+        x_values,
+        values,
+        row_count=1,
+        mode=mode,
+    )
+    return smooth_signal(
+        positions, totals[0], counts[0], span=span, mode=mode, sigma=sigma
+    )
 
 
-def build_mean_heatmap(
-    numerator: Sequence[Sequence[float]],
-    denominator: Sequence[Sequence[float]],
-) -> List[List[float]]:
-    """Return cell-wise averages from numerator and denominator grids."""
-    raw_values = []
-    for row_num, row_den in zip(numerator, denominator):
-        raw_values.append(
-            [
-                0.0 if count == 0 else total / count
-                for total, count in zip(row_num, row_den)
-            ]
-        )
-    return raw_values
+def compute_heatmap_signal(
+    projected: Sequence[Tuple[str, float, float]],
+    *,
+    span: int,
+    mode: str,
+    sigma: float,
+) -> List[float]:
+    """Compute a smoothed seasonal heatmap signal across the x-axis.
+
+    Each point spreads a Gaussian of width *sigma* over the x positions
+    ``0 .. span - 1``.  Points are first totalled per distinct position,
+    so the cost grows with the number of positions rather than points.
+    """
+    x_values = np.array([x_value for _, x_value, _ in projected], dtype=float)
+    values = np.array([value for _, _, value in projected], dtype=float)
+    return heatmap_signal(
+        x_values, values, span=span, mode=mode, sigma=sigma
+    ).tolist()
+
+
+def evolving_heatmap(
+    rows: np.ndarray,
+    x_values: np.ndarray,
+    values: np.ndarray,
+    *,
+    row_count: int,
+    span: int,
+    mode: str,
+    sigma_x: float,
+    sigma_y: float,
+) -> np.ndarray:
+    """Array version of :func:`compute_evolving_heatmap`.
+
+    *rows* holds the row position of each point.  The points are
+    totalled on the (rows x positions) grid once before smoothing.
+    """
+    if not len(x_values):
+        return np.zeros((row_count, span))
+    positions, totals, counts = accumulate_grid(
+        rows, x_values, values, row_count=row_count, mode=mode
+    )
+    return smooth_evolving(
+        positions,
+        totals,
+        counts,
+        span=span,
+        mode=mode,
+        sigma_x=sigma_x,
+        sigma_y=sigma_y,
+    )
 
 
-def compute_evolving_heatmap(  # noqa: CCR001
+def compute_evolving_heatmap(
     projected: Sequence[Tuple[str, float, float]],
     *,
     row_positions: Dict[str, int],
@@ -259,72 +451,109 @@ def compute_evolving_heatmap(  # noqa: CCR001
     sigma_y: float,
 ) -> List[List[float]]:
     """Compute a smoothed 2D heatmap that preserves change across rows."""
-    if not projected:
-        return [[0.0 for _ in range(span)] for _ in range(row_count)]
-    if sigma_x <= 0 or sigma_y <= 0:
-        raise ValueError("Heatmap sigmas must be positive")
-
-    numerator = [[0.0 for _ in range(span)] for _ in range(row_count)]
-    denominator = [[0.0 for _ in range(span)] for _ in range(row_count)]
-
-    for row_key, x_value, value in projected:
-        point_row = row_positions[row_key]
-        for row_index in range(row_count):
-            row_weight = gaussian_weight(row_index - point_row, sigma_y)
-            for column_index in range(span):
-                column_weight = gaussian_weight(
-                    column_index - x_value, sigma_x
-                )
-                weight = row_weight * column_weight
-                denominator[row_index][column_index] += weight
-                numerator[row_index][column_index] += heatmap_numerator_term(
-                    mode, weight, value
-                )
-
-    raw_values = (
-        build_mean_heatmap(numerator, denominator)
-        if mode == "mean"
-        else numerator
+    rows = np.array(
+        [row_positions[row_key] for row_key, _, _ in projected],
+        dtype=np.int64,
     )
-
-    return normalize_matrix(raw_values)
+    x_values = np.array([x_value for _, x_value, _ in projected], dtype=float)
+    values = np.array([value for _, _, value in projected], dtype=float)
+    return evolving_heatmap(
+        rows,
+        x_values,
+        values,
+        row_count=row_count,
+        span=span,
+        mode=mode,
+        sigma_x=sigma_x,
+        sigma_y=sigma_y,
+    ).tolist()
+
+
+def heatmap_grid(
+    codes: np.ndarray, x_values: np.ndarray, values: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Return the unsmoothed heatmap grid of points from :func:`project_days`.
+
+    The grid holds the codes of its rows (latest first), the distinct x
+    positions, and the ``(rows, positions)`` sums of the values and
+    counts of the points.  It depends neither on the heatmap style and
+    mode nor on the smoothing, so it can be cached and then smoothed
+    cheaply by :func:`smooth_heatmap` for any of them.
+    """
+    rows, row_codes = row_layout(codes)
+    positions, totals, counts = accumulate_grid(
+        rows, x_values, values, row_count=len(row_codes), mode="sum"
+    )
+    return {
+        "row_codes": row_codes,
+        "positions": positions,
+        "totals": totals,
+        "counts": counts,
+    }
 
 
-def render_heatmap(
-    ax: plt.Axes,
+def smooth_heatmap(
+    grid: Mapping[str, np.ndarray],
     *,
-    projected: Sequence[Tuple[str, float, float]],
-    row_positions: Dict[str, int],
-    row_count: int,
+    row_codes: np.ndarray,
     span: int,
     style: str,
     mode: str,
     sigma_x: float,
     sigma_y: float,
-    alpha: float,
-) -> None:
-    """Render either the collapsed or evolving seasonal heatmap."""
+) -> np.ndarray:
+    """Return the heatmap image of a :func:`heatmap_grid`.
+
+    *row_codes* lists the rows of the plot, latest first, and includes
+    the rows of *grid*.  The image has two identical rows for the
+    seasonal style and one row per plot row for the evolving style.
+    """
+    if mode not in HEATMAP_MODES:
+        raise ValueError(f"Unsupported heatmap mode {mode!r}")
+    counts = grid["counts"]
+    numerator = counts if mode == "count" else grid["totals"]
     if style == "seasonal":
-        heat_values = compute_heatmap_signal(
-            projected,
+        signal = smooth_signal(
+            grid["positions"],
+            numerator.sum(axis=0),
+            counts.sum(axis=0),
             span=span,
             mode=mode,
             sigma=sigma_x,
         )
-        image = [heat_values, heat_values]
-    elif style == "evolving":
-        image = compute_evolving_heatmap(
-            projected,
-            row_positions=row_positions,
-            row_count=row_count,
-            span=span,
-            mode=mode,
-            sigma_x=sigma_x,
-            sigma_y=sigma_y,
-        )
-    else:  # pragma: no cover - defensive branch
+        return np.vstack([signal, signal])
+    if style != "evolving":
         raise ValueError(f"Unsupported heatmap style {style!r}")
+    rows = (
+        len(row_codes)
+        - 1
+        - np.searchsorted(row_codes[::-1], grid["row_codes"])
+    )
+    shape = (len(row_codes), len(grid["positions"]))
+    placed_numerator = np.zeros(shape)
+    placed_numerator[rows] = numerator
+    placed_counts = np.zeros(shape)
+    placed_counts[rows] = counts
+    return smooth_evolving(
+        grid["positions"],
+        placed_numerator,
+        placed_counts,
+        span=span,
+        mode=mode,
+        sigma_x=sigma_x,
+        sigma_y=sigma_y,
+    )
 
+
+def draw_heatmap(
+    ax: plt.Axes,
+    image: np.ndarray,
+    *,
+    row_count: int,
+    span: int,
+    alpha: float,
+) -> None:
+    """Draw a heatmap from :func:`smooth_heatmap` behind the points."""
     ax.imshow(
         image,
         cmap="YlOrRd",
@@ -337,6 +566,302 @@ def render_heatmap(
     )
 
 
+def draw_points(
+    ax: plt.Axes,
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    *,
+    sizes: np.ndarray,
+    series_ids: np.ndarray,
+    labels: Sequence[str],
+    color: str | None,
+    alpha: float,
+    rasterize: bool = False,
+) -> None:
+    """Draw the points of every series as a single scatter collection.
+
+    Point *k* belongs to series ``series_ids[k]``.  Series take the
+    colours of the axes' colour cycle unless *color* is given.  With
+    more than one series, the legend is built from proxy markers.  With
+    *rasterize*, vector output embeds the points as one bitmap.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgba_array
+    from matplotlib.lines import Line2D
+
+    if color is not None:
+        palette = to_rgba_array([color] * len(labels))
+    else:
+        cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        palette = to_rgba_array(
+            [cycle[index % len(cycle)] for index in range(len(labels))]
+        )
+    ax.scatter(
+        x_values,
+        y_values,
+        s=sizes,
+        c=palette[series_ids],
+        alpha=alpha,
+        edgecolors="none",
+        rasterized=rasterize,
+    )
+    if len(labels) > 1:
+        handles = [
+            Line2D(
+                [],
+                [],
+                linestyle="none",
+                marker="o",
+                markeredgecolor="none",
+                markerfacecolor=rgba,
+                alpha=alpha,
+                label=label,
+            )
+            for rgba, label in zip(palette, labels)
+        ]
+        ax.legend(handles=handles)
+
+
+def cached_arrays(
+    kind: str,
+    inputs: Sequence[Path],
+    params: Mapping[str, Any],
+    compute: Callable[[], Dict[str, np.ndarray]],
+    *,
+    use_cache: bool = True,
+) -> Dict[str, np.ndarray]:
+    """Return the arrays that *compute* derives from the files *inputs*.
+
+    The arrays are kept in the render cache under a key made of *kind*,
+    the fingerprints of *inputs* and *params*, so they are only computed
+    again once a file changes.
+    """
+    from .cache import Cache, cache_key
+
+    if not use_cache:
+        return compute()
+    try:
+        key = cache_key(kind, inputs, params)
+    except OSError:
+        return compute()
+    cache = Cache()
+    data = cache.read_bytes(key, ".npz")
+    if data is not None:
+        try:
+            with np.load(io.BytesIO(data)) as archive:
+                return {name: archive[name] for name in archive.files}
+        except (OSError, ValueError):
+            pass
+    arrays = compute()
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    cache.write_bytes(key, buffer.getvalue(), ".npz")
+    return arrays
+
+
+def presence_matrix(
+    days: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count the points with value 1 per year and day of year.
+
+    As in the old ``tsd_year_scatter.py``, only a value of exactly 1
+    marks a day, so series mixing 0/1 flags with other codes show
+    just the flags.  Returns every year from the first to the last point and a
+    ``(years, 366)`` matrix of counts, indexed by day of year from 0.
+    """
+    codes, x_values = project_days(days, "year")
+    if not len(codes):
+        return np.zeros(0, dtype=np.int64), np.zeros((0, PRESENCE_DAYS))
+    first = codes.min()
+    years = np.arange(first, codes.max() + 1)
+    matrix = np.zeros((len(years), PRESENCE_DAYS))
+    np.add.at(
+        matrix,
+        (codes - first, x_values.astype(np.int64)),
+        (values == 1).astype(float),
+    )
+    return years, matrix
+
+
+def merge_presence(
+    parts: Sequence[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Add presence matrices that may cover different years."""
+    parts = [(years, matrix) for years, matrix in parts if len(years)]
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, PRESENCE_DAYS))
+    first = min(int(years[0]) for years, _ in parts)
+    last = max(int(years[-1]) for years, _ in parts)
+    merged = np.zeros((last - first + 1, PRESENCE_DAYS))
+    for years, matrix in parts:
+        offset = int(years[0]) - first
+        merged[offset : offset + len(years)] += matrix
+    return np.arange(first, last + 1), merged
+
+
+def load_presence(
+    file_specs: Sequence[Tuple[str, str]],
+    base_dir: Path,
+    *,
+    use_cache: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the presence matrix of all *file_specs* together.
+
+    Each file's matrix is cached, so an unchanged file is not read.
+    """
+    parts = []
+    for filename, label in file_specs:
+
+        def compute(filename: str = filename, label: str = label):
+            days, values = series_arrays(
+                read_series(filename, label, base_dir)
+            )
+            years, matrix = presence_matrix(days, values)
+            return {"years": years, "matrix": matrix}
+
+        arrays = cached_arrays(
+            "presence", [base_dir / filename], {}, compute, use_cache=use_cache
+        )
+        parts.append((arrays["years"], arrays["matrix"]))
+    return merge_presence(parts)
+
+
+def load_heatmap_grids(
+    series_list: Sequence[SeriesData],
+    file_specs: Sequence[Tuple[str, str]],
+    base_dir: Path,
+    *,
+    period: str,
+    summed: bool,
+    per_series: bool,
+    use_cache: bool = True,
+) -> List[Dict[str, np.ndarray]]:
+    """Return the cached :func:`heatmap_grid` of the plotted points.
+
+    *series_list* holds the series read from *file_specs*, summed into
+    one if *summed*.  With *per_series* there is one grid per series,
+    keyed on its own file; otherwise one grid of all points, keyed on
+    all the files.  Only missing grids are computed, in a thread pool.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def compute(items: Sequence[SeriesData]) -> Dict[str, np.ndarray]:
+        arrays = [series_arrays(item) for item in items]
+        codes, x_values = project_days(
+            np.concatenate([days for days, _ in arrays]), period
+        )
+        values = np.concatenate([values for _, values in arrays])
+        return heatmap_grid(codes, x_values, values)
+
+    paths = [base_dir / filename for filename, _ in file_specs]
+    if not per_series:
+        return [
+            cached_arrays(
+                "heatmap-grid",
+                paths,
+                {"period": period, "sum": summed},
+                lambda: compute(series_list),
+                use_cache=use_cache,
+            )
+        ]
+    with ThreadPoolExecutor(
+        max_workers=max(min(len(paths), GRID_WORKERS), 1)
+    ) as executor:
+        return list(
+            executor.map(
+                lambda index: cached_arrays(
+                    "heatmap-grid",
+                    [paths[index]],
+                    {"period": period, "sum": False},
+                    lambda: compute([series_list[index]]),
+                    use_cache=use_cache,
+                ),
+                range(len(paths)),
+            )
+        )
+
+
+def plot_presence(
+    years: np.ndarray,
+    matrix: np.ndarray,
+    *,
+    title: str,
+    color: str | None,
+    show_month_lines: bool,
+    figure: plt.Figure | None = None,
+) -> plt.Figure:
+    """Draw a presence matrix as one image row per year.
+
+    Days without points are left blank; the others are shaded by their
+    number of points, with a colour bar when some day has several.
+    """
+    import seaborn as sns
+    from matplotlib.colors import LinearSegmentedColormap
+    from matplotlib.ticker import MaxNLocator
+
+    sns.set_theme(style="whitegrid")
+    fig, ax = figure_axes(figure, FIGURE_SIZE)
+    ax.set_title(title)
+    ax.set_ylabel("Year")
+
+    year_list = years.tolist()
+    if year_list:
+        highest = max(float(matrix.max()), 1.0)
+        colormap = LinearSegmentedColormap.from_list(
+            "presence", ["white", color or DEFAULT_PRESENCE_COLOR]
+        )
+        image = ax.imshow(
+            np.ma.masked_equal(matrix, 0),
+            cmap=colormap,
+            vmin=0,
+            vmax=highest,
+            aspect="auto",
+            interpolation="nearest",
+            origin="lower",
+            extent=(
+                -0.5,
+                PRESENCE_DAYS - 0.5,
+                year_list[0] - 0.5,
+                year_list[-1] + 0.5,
+            ),
+            zorder=1,
+        )
+        if highest > 1:
+            fig.colorbar(image, ax=ax, label="Points")
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.grid(False, axis="y")
+
+    configure_x_axis(
+        ax,
+        "year",
+        x_limit=year_x_limit(year_list),
+        draw_month_lines=show_month_lines,
+        use_leap_calendar=bool(year_list)
+        and all(is_leap_year(year) for year in year_list),
+    )
+    fig.tight_layout()
+    return fig
+
+
+def period_layout(days: np.ndarray, period: str) -> Tuple[int, bool]:
+    """Return the x span for *days* and whether to use a leap calendar.
+
+    The leap calendar places year-view month lines for leap years and is
+    only used when every year with points is a leap year.
+    """
+    years = np.unique(
+        days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)
+        + 1970
+    ).tolist()
+    use_leap_calendar = False
+    if period == "year":
+        use_leap_calendar = bool(years) and all(
+            is_leap_year(year) for year in years
+        )
+    x_span = period_span(period, year_length=year_x_limit(years))
+    return x_span, use_leap_calendar
+
+
 def month_line_positions(use_leap_calendar: bool) -> List[int]:
     """Return day offsets for month-start guide lines."""
     reference_year = 2024 if use_leap_calendar else 2023
@@ -347,24 +872,13 @@ def month_line_positions(use_leap_calendar: bool) -> List[int]:
     return positions
 
 
-def year_x_limit(dates: Iterable[dt.date]) -> int:
-    """Return the x-axis extent for year plots."""
-    years = sorted({date.year for date in dates})
-    if not years:
-        return 365
+def year_x_limit(years: Iterable[int]) -> int:
+    """Return the x-axis extent for year plots covering *years*."""
     if any(is_leap_year(year) for year in years):
         return 366
     return 365
 
 
-def make_row_positions(
-    projected: Sequence[Tuple[str, float, float]],
-) -> Tuple[Dict[str, int], List[str]]:
-    """Create top-down y positions for each plotted row."""
-    row_labels = sorted({row_key for row_key, _, _ in projected}, reverse=True)
-    return {label: idx for idx, label in enumerate(row_labels)}, row_labels
-
-
 def configure_x_axis(
     ax: plt.Axes,
     period: str,
@@ -419,10 +933,26 @@ def plot_seasonal_series(  # noqa: CCR001
     heatmap_sigma_y: float,
     heatmap_alpha: float,
     show_month_lines: bool,
+    figure: plt.Figure | None = None,
+    density: bool = False,
+    log_density: bool = False,
+    rasterize: bool = False,
+    heatmap_grids: Sequence[Mapping[str, np.ndarray]] | None = None,
 ) -> plt.Figure:
-    """Plot repeated-period scatter points for one or more series."""
+    """Plot repeated-period scatter points for one or more series.
+
+    When *figure* is given it is cleared and drawn into instead of
+    creating a new one.  With *density*, the points of all series are
+    counted per cell, at most one cell per pixel and one row per period,
+    and drawn as an image (on a log colour scale with *log_density*).
+    With *rasterize*, the points are embedded in vector output as one
+    bitmap.  *heatmap_grids* may hold the :func:`heatmap_grid` of all
+    points, such as one read from the cache, to smooth for the heatmap.
+    """
+    import seaborn as sns
+
     sns.set_theme(style="whitegrid")
-    fig, ax = plt.subplots(figsize=(11, 7))
+    fig, ax = figure_axes(figure, FIGURE_SIZE)
     ax.set_title(title)
     ax.set_ylabel("Year" if period == "year" else period.capitalize())
 
@@ -437,68 +967,62 @@ def plot_seasonal_series(  # noqa: CCR001
         fig.tight_layout()
         return fig
 
-    projected_by_series = [
-        (series.label, project_series_to_period(series, period))
-        for series in series_list
-    ]
-    all_projected = [
-        point for _, projected in projected_by_series for point in projected
-    ]
-    row_positions, row_labels = make_row_positions(all_projected)
-
-    all_values = [value for _, _, value in all_projected]
-    size_lookup = size_map(all_values, min_size, max_size)
-    size_by_index = dict(enumerate(size_lookup))
-
-    all_dates = [date for series in series_list for date, _ in series.points]
-    use_leap_calendar = False
-    if period == "year":
-        years = sorted({date.year for date in all_dates})
-        use_leap_calendar = bool(years) and all(
-            is_leap_year(year) for year in years
-        )
-    x_span = period_span(
-        period,
-        year_length=year_x_limit(all_dates),
+    arrays = [series_arrays(series) for series in series_list]
+    days = np.concatenate([series_days for series_days, _ in arrays])
+    values = np.concatenate([series_values for _, series_values in arrays])
+    series_ids = np.repeat(
+        np.arange(len(arrays)), [len(series_days) for series_days, _ in arrays]
     )
+    codes, x_values = project_days(days, period)
+    rows, row_codes = row_layout(codes)
+    row_labels = [row_label(code, period) for code in row_codes.tolist()]
+
+    x_span, use_leap_calendar = period_layout(days, period)
 
     if heatmap and row_labels:
-        render_heatmap(
-            ax,
-            projected=all_projected,
-            row_positions=row_positions,
-            row_count=len(row_labels),
+        if heatmap_grids:
+            (grid,) = heatmap_grids
+        else:
+            grid = heatmap_grid(codes, x_values, values)
+        image = smooth_heatmap(
+            grid,
+            row_codes=row_codes,
             span=x_span,
             style=heatmap_style,
             mode=heatmap_mode,
             sigma_x=heatmap_sigma_x,
             sigma_y=heatmap_sigma_y,
+        )
+        draw_heatmap(
+            ax,
+            image,
+            row_count=len(row_labels),
+            span=x_span,
             alpha=heatmap_alpha,
         )
 
-    offset = 0
-    for series_index, (label, projected) in enumerate(projected_by_series):
-        x_values = [x_value for _, x_value, _ in projected]
-        y_values = [row_positions[row_key] for row_key, _, _ in projected]
-        sizes = [
-            size_by_index[offset + point_index]
-            for point_index in range(len(projected))
-        ]
-        offset += len(projected)
-        default_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
-        scatter_color = (
-            color
-            if color is not None
-            else default_colors[series_index % len(default_colors)]
+    if density:
+        pixels, _ = axes_pixels(ax)
+        draw_density(
+            ax,
+            x_values,
+            rows,
+            bins=(min(pixels, x_span), max(len(row_labels), 1)),
+            extent=(-0.5, x_span - 0.5, -0.5, len(row_labels) - 0.5),
+            log_scale=log_density,
+            alpha=alpha,
         )
-        ax.scatter(
+    else:
+        draw_points(
+            ax,
             x_values,
-            y_values,
-            s=sizes,
-            color=scatter_color,
+            rows,
+            sizes=size_map(values, min_size, max_size),
+            series_ids=series_ids,
+            labels=[series.label for series in series_list],
+            color=color,
             alpha=alpha,
-            edgecolors="none",
-            label=label,
+            rasterize=rasterize,
         )
 
     ax.set_yticks(range(len(row_labels)))
@@ -513,8 +1037,179 @@ def plot_seasonal_series(  # noqa: CCR001
         use_leap_calendar=use_leap_calendar,
     )
 
-    if len(series_list) > 1:
-        ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def grid_shape(count: int) -> Tuple[int, int]:
+    """Return the rows and columns of a near-square grid of panels."""
+    columns = max(math.ceil(math.sqrt(count)), 1)
+    return max(math.ceil(count / columns), 1), columns
+
+
+def grid_axes(
+    figure: plt.Figure | None, count: int
+) -> Tuple[plt.Figure, List[plt.Axes]]:
+    """Return a figure with *count* panels sharing both axes.
+
+    Spare panels completing the last row are hidden.  As with
+    :func:`figure_axes`, a given *figure* is cleared and reused.
+    """
+    rows, columns = grid_shape(count)
+    size = (GRID_PANEL_SIZE[0] * columns, GRID_PANEL_SIZE[1] * rows)
+    if figure is None:
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure(figsize=size)
+    else:
+        figure.clear()
+        figure.set_size_inches(size)
+    axes = figure.subplots(
+        rows, columns, sharex=True, sharey=True, squeeze=False
+    ).ravel()
+    for spare in axes[max(count, 1) :]:
+        spare.set_visible(False)
+    return figure, list(axes[: max(count, 1)])
+
+
+def plot_seasonal_grid(  # noqa: CCR001
+    series_list: Sequence[SeriesData],
+    *,
+    period: str,
+    title: str,
+    color: str | None,
+    min_size: float,
+    max_size: float,
+    alpha: float,
+    heatmap: bool,
+    heatmap_style: str,
+    heatmap_mode: str,
+    heatmap_sigma_x: float,
+    heatmap_sigma_y: float,
+    heatmap_alpha: float,
+    show_month_lines: bool,
+    figure: plt.Figure | None = None,
+    rasterize: bool = False,
+    heatmap_grids: Sequence[Mapping[str, np.ndarray]] | None = None,
+) -> plt.Figure:
+    """Plot each series in its own panel of a grid with shared axes.
+
+    All panels have the rows of all series together, so a season can
+    be compared across series at a glance.  The series are projected,
+    and their heatmaps computed, in a thread pool; the figure is then
+    drawn and laid out once.  *heatmap_grids* may hold each series'
+    :func:`heatmap_grid`.  Other arguments are as for
+    :func:`plot_seasonal_series`.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    fig, axes = grid_axes(figure, len(series_list))
+    fig.suptitle(title)
+    if not series_list:
+        configure_x_axis(
+            axes[0],
+            period,
+            x_limit=365,
+            draw_month_lines=False,
+            use_leap_calendar=False,
+        )
+        fig.tight_layout()
+        return fig
+
+    arrays = [series_arrays(series) for series in series_list]
+    days = np.concatenate([series_days for series_days, _ in arrays])
+    x_span, use_leap_calendar = period_layout(days, period)
+    with ThreadPoolExecutor(
+        max_workers=min(len(arrays), GRID_WORKERS)
+    ) as executor:
+        projections = list(
+            executor.map(
+                lambda item: project_days(item[0], period),
+                arrays,
+            )
+        )
+        rows, row_codes = row_layout(
+            np.concatenate([codes for codes, _ in projections])
+        )
+        panel_rows = np.split(
+            rows, np.cumsum([len(codes) for codes, _ in projections])[:-1]
+        )
+        images: List[np.ndarray | None] = [None] * len(arrays)
+        if heatmap and len(row_codes):
+            grids = heatmap_grids or list(
+                executor.map(
+                    lambda index: heatmap_grid(
+                        projections[index][0],
+                        projections[index][1],
+                        arrays[index][1],
+                    ),
+                    range(len(arrays)),
+                )
+            )
+            images = list(
+                executor.map(
+                    lambda grid: smooth_heatmap(
+                        grid,
+                        row_codes=row_codes,
+                        span=x_span,
+                        style=heatmap_style,
+                        mode=heatmap_mode,
+                        sigma_x=heatmap_sigma_x,
+                        sigma_y=heatmap_sigma_y,
+                    ),
+                    grids,
+                )
+            )
+
+    cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    _, columns = grid_shape(len(series_list))
+    for index, ax in enumerate(axes):
+        (_, x_values), (_, values) = projections[index], arrays[index]
+        ax.set_title(series_list[index].label, fontsize="medium")
+        if images[index] is not None:
+            draw_heatmap(
+                ax,
+                images[index],
+                row_count=len(row_codes),
+                span=x_span,
+                alpha=heatmap_alpha,
+            )
+        draw_points(
+            ax,
+            x_values,
+            panel_rows[index],
+            sizes=size_map(values, min_size, max_size),
+            series_ids=np.zeros(len(values), dtype=np.int64),
+            labels=[series_list[index].label],
+            color=color or cycle[index % len(cycle)],
+            alpha=alpha,
+            rasterize=rasterize,
+        )
+        configure_x_axis(
+            ax,
+            period,
+            x_limit=x_span,
+            draw_month_lines=show_month_lines and period == "year",
+            use_leap_calendar=use_leap_calendar,
+        )
+        # Label only the outer edges of the grid.
+        bottom = index + columns >= len(series_list)
+        ax.tick_params(labelbottom=bottom, labelleft=index % columns == 0)
+        ax.tick_params(axis="x", labelsize="x-small")
+        if not bottom:
+            ax.set_xlabel("")
+        if index % columns == 0:
+            ax.set_ylabel("Year" if period == "year" else period.capitalize())
+
+    axes[0].set_yticks(range(len(row_codes)))
+    axes[0].set_yticklabels(
+        [row_label(code, period) for code in row_codes.tolist()]
+    )
+    axes[0].invert_yaxis()
 
     fig.tight_layout()
     return fig
@@ -537,6 +1232,7 @@ def create_parser() -> argparse.ArgumentParser:
     point_group = parser.add_argument_group("point appearance")
     heatmap_group = parser.add_argument_group("heatmap overlay")
     guide_group = parser.add_argument_group("reference guides")
+    output_group = parser.add_argument_group("output")
     diagnostics_group = parser.add_argument_group("diagnostics")
 
     input_group.add_argument(
@@ -545,7 +1241,9 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="FILE[:LABEL]",
         help=(
             "Input file names located in $TSD, $TSD_DIR, or $HOME/tsd. "
-            "Append :LABEL to customise the legend entry."
+            "Append :LABEL to customise the legend entry. A FILE with "
+            "shell wildcards (chocolat-*) or of the form re:REGEX "
+            "(re:^tea) selects every matching series."
         ),
     )
     input_group.add_argument(
@@ -553,6 +1251,14 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Sum values from all files sharing the same date.",
     )
+    input_group.add_argument(
+        "--grid",
+        action="store_true",
+        help=(
+            "Plot each series in its own panel of a grid sharing both axes, "
+            "to compare the seasons of many series in one figure."
+        ),
+    )
     input_group.add_argument(
         "--period",
         default="year",
@@ -591,6 +1297,29 @@ def create_parser() -> argparse.ArgumentParser:
         default=0.75,
         help="Point opacity between 0 and 1.",
     )
+    point_group.add_argument(
+        "--density",
+        action="store_true",
+        help=(
+            "Draw the number of points per cell as an image instead of "
+            "one dot per point. Much faster for very large series."
+        ),
+    )
+    point_group.add_argument(
+        "--log-density",
+        action="store_true",
+        help="Use a logarithmic colour scale with --density.",
+    )
+    point_group.add_argument(
+        "--presence",
+        action="store_true",
+        help=(
+            "Draw one cell per year and day of year, shaded by the number "
+            "of points with value 1 that day in all files, instead "
+            "of one dot per point. Suits long event series. Only for year "
+            "periods; each file's counts are cached until it changes."
+        ),
+    )
     heatmap_group.add_argument(
         "--heatmap",
         action="store_true",
@@ -649,6 +1378,30 @@ def create_parser() -> argparse.ArgumentParser:
         "--title",
         help="Title for the plot. Defaults to the space-separated filenames.",
     )
+    output_group.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help=(
+            "Write the plot to PATH instead of opening a window. The "
+            "format follows the extension, for example .png or .svg. "
+            "Unless --no-cache is given, an identical earlier plot of "
+            "unchanged files is copied from the cache instead of redrawn."
+        ),
+    )
+    output_group.add_argument(
+        "--rasterize",
+        action="store_true",
+        help=(
+            "Embed the points as a bitmap, which keeps vector output such "
+            "as .svg or .pdf small when there are many points."
+        ),
+    )
+    output_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always redraw the plot, and do not cache it.",
+    )
     diagnostics_group.add_argument(
         "-v",
         "--verbose",
@@ -658,10 +1411,29 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv: Sequence[str] | None = None) -> None:  # noqa: CCR001
+def main(argv: Sequence[str] | None = None) -> None:
     """Entry point for the ``tsd-season-plot`` command."""
     parser = create_parser()
     args = parser.parse_args(argv)
+    key = plot_cache_key("seasonal", args, args.output)
+    if key and restore_cached_plot(key, args.output, args.verbose):
+        return
+    figure = render(parser, args)
+    show_or_save(figure, args)
+    if key:
+        store_cached_plot(key, args.output)
+
+
+def render(  # noqa: CCR001
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    figure: plt.Figure | None = None,
+) -> plt.Figure:
+    """Load and plot the seasonal view requested by *args*.
+
+    Invalid arguments are reported through ``parser.error``.  When
+    *figure* is given it is reused for the plot.
+    """
 
     def log(message: str) -> None:
         if args.verbose:
@@ -694,10 +1466,23 @@ def main(argv: Sequence[str] | None = None) -> None:  # noqa: CCR001
         parser.error("--heatmap-sigma-y must be positive")
     if not 0 < args.heatmap_alpha <= 1:
         parser.error("--heatmap-alpha must be between 0 and 1")
+    if args.presence and period != "year":
+        parser.error("--presence requires --period year")
+    if args.presence and (args.heatmap or args.density or args.log_density):
+        parser.error(
+            "--presence cannot be combined with --heatmap or --density"
+        )
+    if args.grid and (args.sum or args.density or args.log_density):
+        parser.error("--grid cannot be combined with --sum or --density")
+    if args.grid and args.presence:
+        parser.error("--grid cannot be combined with --presence")
 
-    file_specs = [parse_filespec(value) for value in args.files]
-    filenames = [name for name, _ in file_specs]
     base_dir = resolve_tsd_dir()
+    try:
+        file_specs = expand_filespecs(args.files, base_dir)
+    except ValueError as exc:
+        parser.error(str(exc))
+    filenames = [name for name, _ in file_specs]
     log(f"Reading data from base directory: {base_dir}")
     log(f"Period resolved to: {period}")
     if args.heatmap:
@@ -711,16 +1496,39 @@ def main(argv: Sequence[str] | None = None) -> None:  # noqa: CCR001
             )
         )
 
-    series = [
-        read_series(filename, label, base_dir)
-        for filename, label in file_specs
-    ]
+    title = format_title(args, filenames)
+    if args.presence:
+        start = time.perf_counter()
+        years, matrix = load_presence(
+            file_specs, base_dir, use_cache=not args.no_cache
+        )
+        log(
+            "Presence matrix covers {} years with {} days present.".format(
+                len(years), int(np.count_nonzero(matrix))
+            )
+        )
+        log(f"Loading took {time.perf_counter() - start:.3f}s.")
+        figure = plot_presence(
+            years,
+            matrix,
+            title=title,
+            color=args.color,
+            show_month_lines=not args.no_month_lines,
+            figure=figure,
+        )
+        log(f"Generated figure with {len(figure.axes)} axes.")
+        return figure
+
+    start = time.perf_counter()
+    series = load_series(file_specs, base_dir)
+    elapsed = time.perf_counter() - start
     total_points = sum(len(item.points) for item in series)
     log(
         "Loaded {} series containing {} points in total.".format(
             len(series), total_points
         )
     )
+    log(f"Loading took {elapsed:.3f}s.")
 
     if args.sum:
         log("Summing series across files by date.")
@@ -735,9 +1543,45 @@ def main(argv: Sequence[str] | None = None) -> None:  # noqa: CCR001
     else:
         log("No data points found in the provided files.")
 
-    title = format_title(args, filenames)
     log(f"Plot title: {title}")
 
+    heatmap_grids = None
+    if args.heatmap and total_points:
+        start = time.perf_counter()
+        heatmap_grids = load_heatmap_grids(
+            series,
+            file_specs,
+            base_dir,
+            period=period,
+            summed=args.sum,
+            per_series=args.grid,
+            use_cache=not args.no_cache,
+        )
+        log(f"Heatmap grids took {time.perf_counter() - start:.3f}s.")
+
+    if args.grid:
+        figure = plot_seasonal_grid(
+            series,
+            period=period,
+            title=title,
+            color=args.color,
+            min_size=min_size,
+            max_size=max_size,
+            alpha=args.alpha,
+            heatmap=args.heatmap,
+            heatmap_style=heatmap_style,
+            heatmap_mode=heatmap_mode,
+            heatmap_sigma_x=heatmap_sigma_x,
+            heatmap_sigma_y=args.heatmap_sigma_y,
+            heatmap_alpha=args.heatmap_alpha,
+            show_month_lines=not args.no_month_lines,
+            figure=figure,
+            rasterize=args.rasterize,
+            heatmap_grids=heatmap_grids,
+        )
+        log(f"Generated figure with {len(series)} panels.")
+        return figure
+
     figure = plot_seasonal_series(
         series,
         period=period,
@@ -753,6 +1597,11 @@ def main(argv: Sequence[str] | None = None) -> None:  # noqa: CCR001
         heatmap_sigma_y=args.heatmap_sigma_y,
         heatmap_alpha=args.heatmap_alpha,
         show_month_lines=not args.no_month_lines,
+        figure=figure,
+        density=args.density or args.log_density,
+        log_density=args.log_density,
+        rasterize=args.rasterize,
+        heatmap_grids=heatmap_grids,
     )
     log(f"Generated figure with {len(figure.axes)} axes.")
-    plt.show()
+    return figure
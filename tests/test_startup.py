@@ -0,0 +1,101 @@
+"""Tests that common commands start without heavy imports."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+PLOTTING_MODULES = {"matplotlib", "seaborn"}
+HEAVY_MODULES = PLOTTING_MODULES | {"dateutil", "numpy", "pandas"}
+
+COMMANDS = {
+    "tsd series value": (
+        "sys.argv = ['tsd', 'series', '1.5']\n"
+        "from tsd.cli import main\n"
+        "main()\n"
+    ),
+    "tsd series": (
+        "sys.argv = ['tsd', 'series']\n"
+        "from tsd.cli import main\n"
+        "main()\n"
+    ),
+    "tsd --complete": (
+        "sys.argv = ['tsd', '--complete', 'se']\n"
+        "from tsd.cli import main\n"
+        "main()\n"
+    ),
+    "tsd-today": "from tsd.today import main\nmain([])\n",
+    "tsd-plot --help": (
+        "from tsd_plot.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    "tsd-plot --no-plot": (
+        "from tsd_plot.cli import main\n"
+        "main(['series', '--no-plot', '--stats-format', 'json'])\n"
+    ),
+    "tsd-summary": (
+        "from tsd_plot.cli import summary_main\n"
+        "summary_main(['series', '--bin-width', 'quarter'])\n"
+    ),
+    "tsd-season-plot --help": (
+        "from tsd_plot.seasonal import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+}
+
+
+# The plotting commands compute with numpy but should only load a
+# plotting library when they draw.
+NUMPY_COMMANDS = ("tsd-plot", "tsd-season-plot", "tsd-summary")
+FORBIDDEN = {
+    command: (
+        PLOTTING_MODULES
+        if command.startswith(NUMPY_COMMANDS)
+        else HEAVY_MODULES
+    )
+    for command in COMMANDS
+}
+
+
+@pytest.mark.parametrize("command", sorted(COMMANDS))
+def test_command_imports_no_heavy_modules(command, tmp_path):
+    series_dir = tmp_path / "series"
+    series_dir.mkdir(mode=0o700)
+    (series_dir / "series").write_text("2026-08-08\t1\n", encoding="utf-8")
+    config_dir = tmp_path / "config" / "tsd"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config").write_text(
+        f"series_dir={series_dir}\n", encoding="utf-8"
+    )
+    env = dict(os.environ)
+    env.pop("TSD_DIR", None)
+    env["TSD"] = str(series_dir)
+    env["XDG_CONFIG_HOME"] = str(tmp_path / "config")
+    env["XDG_CACHE_HOME"] = str(tmp_path / "cache")
+    env["PYTHONPATH"] = str(SRC_DIR)
+    script = (
+        "import sys\n"
+        + COMMANDS[command]
+        + "loaded = {name.split('.')[0] for name in sys.modules}\n"
+        + f"print(sorted(loaded & set({sorted(FORBIDDEN[command])!r})), "
+        + "file=sys.stderr)\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    assert result.stderr.splitlines()[-1] == "[]"
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import importlib.util
+import math
 import subprocess
 import sys
 import tempfile
@@ -28,7 +29,14 @@ compute_time_axis = mod.compute_time_axis
 consumption_only_quantities = mod.consumption_only_quantities
 initial_rate_guess = mod.initial_rate_guess
 kalman_filter_random_walk_rate = mod.kalman_filter_random_walk_rate
+kalman_filter_random_walk_rate_matrix = (
+    mod.kalman_filter_random_walk_rate_matrix
+)
+kalman_filter_batch = mod.kalman_filter_batch
 simulate_hitting_time = mod.simulate_hitting_time
+analytic_hitting_cdf = mod.analytic_hitting_cdf
+normal_cdf = mod.normal_cdf
+analytic_hitting_time = mod.analytic_hitting_time
 ascii_histogram = mod.ascii_histogram
 
 SAMPLE_DATA = """\
@@ -244,6 +252,65 @@ class TestKalmanFilter(unittest.TestCase):
         eigenvalues = np.linalg.eigvalsh(covariance)
         self.assertTrue(np.all(eigenvalues >= -1e-10))
 
+    def test_matches_matrix_reference(self):
+        rng = np.random.default_rng(11)
+        for length in [1, 2, 3, 30, 400]:
+            days = np.cumsum(rng.integers(0, 5, size=length)).astype(float)
+            values = np.round(
+                500.0 - np.cumsum(rng.uniform(-1, 4, size=length))
+            )
+            for sigmas in [(0.5, 0.25, 0.5), (0.01, 2.0, 0.1)]:
+                state, covariance = kalman_filter_random_walk_rate(
+                    days, values, *sigmas
+                )
+                expected_state, expected_covariance = (
+                    kalman_filter_random_walk_rate_matrix(
+                        days, values, *sigmas
+                    )
+                )
+                np.testing.assert_allclose(
+                    state, expected_state, rtol=1e-12, atol=1e-12
+                )
+                np.testing.assert_allclose(
+                    covariance, expected_covariance, rtol=1e-10, atol=1e-12
+                )
+
+
+class TestKalmanFilterBatch(unittest.TestCase):
+    """Tests for ``kalman_filter_batch``."""
+
+    def test_matches_per_series_filter(self):
+        rng = np.random.default_rng(7)
+        times, observations = [], []
+        for length in [1, 2, 40, 5, 40, 17, 3, 1]:
+            steps = rng.integers(0, 4, size=length)
+            times.append(np.cumsum(steps).astype(float))
+            observations.append(
+                np.round(200.0 - np.cumsum(rng.uniform(0, 3, size=length)))
+            )
+
+        states, covariances = kalman_filter_batch(
+            times, observations, sigma_r=0.3, sigma_q=0.2, sigma_z=0.5
+        )
+
+        self.assertEqual(states.shape, (8, 2))
+        self.assertEqual(covariances.shape, (8, 2, 2))
+        for index, (t, z) in enumerate(zip(times, observations)):
+            state, covariance = kalman_filter_random_walk_rate(
+                t, z, sigma_r=0.3, sigma_q=0.2, sigma_z=0.5
+            )
+            np.testing.assert_allclose(states[index], state, rtol=1e-10)
+            np.testing.assert_allclose(
+                covariances[index], covariance, rtol=1e-10, atol=1e-12
+            )
+
+    def test_empty_batch(self):
+        states, covariances = kalman_filter_batch(
+            [], [], sigma_r=0.5, sigma_q=0.25, sigma_z=0.5
+        )
+        self.assertEqual(states.shape, (0, 2))
+        self.assertEqual(covariances.shape, (0, 2, 2))
+
 
 class TestSimulateHittingTime(unittest.TestCase):
     """Tests for ``simulate_hitting_time``."""
@@ -328,6 +395,116 @@ class TestSimulateHittingTime(unittest.TestCase):
         self.assertEqual(hits.shape, (50,))
 
 
+class TestAnalyticHittingTime(unittest.TestCase):
+    """Tests for the analytic depletion time approximation."""
+
+    X_MEAN = np.array([100.0, 2.0])
+    COVARIANCE = np.array([[4.0, 0.05], [0.05, 0.04]])
+
+    def test_normal_cdf_matches_math(self):
+        x = np.linspace(-30.0, 8.0, 2001)
+        expected = [0.5 * math.erfc(-value / math.sqrt(2.0)) for value in x]
+        result = normal_cdf(x)
+        self.assertEqual(np.float64, result.dtype)
+        np.testing.assert_allclose(result, expected, rtol=2e-7, atol=0.0)
+
+    def assert_matches_monte_carlo(self, rtol, **settings):
+        simulated = simulate_hitting_time(
+            rng=np.random.default_rng(3),
+            allow_negative_rate=False,
+            **settings,
+        )
+
+        approximated = analytic_hitting_time(**settings)
+
+        self.assertAlmostEqual(
+            np.isinf(approximated).mean(), np.isinf(simulated).mean(), 2
+        )
+        levels = [0.1, 0.25, 0.5, 0.75, 0.9]
+        np.testing.assert_allclose(
+            np.quantile(approximated[np.isfinite(approximated)], levels),
+            np.quantile(simulated[np.isfinite(simulated)], levels),
+            rtol=rtol,
+        )
+
+    def test_quantiles_match_monte_carlo(self):
+        self.assert_matches_monte_carlo(
+            0.03,
+            x_mean=self.X_MEAN,
+            P=self.COVARIANCE,
+            nsims=20000,
+            sigma_r=0.05,
+            sigma_q=0.25,
+            dt_forward=1.0,
+            max_days=3650.0,
+            min_rate=0.0,
+        )
+
+    def test_default_sigmas_match_monte_carlo(self):
+        """At the default sigmas the rate's walk dominates the forecast."""
+        series = [
+            ([10.0, 8.0, 5.0], [0.0, 5.0, 10.0]),
+            ([100.0, 90.0, 80.0, 72.0, 60.0, 51.0, 40.0], np.arange(7) * 10),
+        ]
+        for quantities, days in series:
+            with self.subTest(quantities=quantities):
+                q_obs = np.array(quantities)
+                state, covariance = kalman_filter_random_walk_rate(
+                    np.array(days, dtype=float),
+                    consumption_only_quantities(q_obs),
+                    sigma_r=0.5,
+                    sigma_q=0.25,
+                    sigma_z=0.5,
+                )
+                state[0] = q_obs[-1]
+                self.assert_matches_monte_carlo(
+                    0.1,
+                    x_mean=state,
+                    P=covariance,
+                    nsims=20000,
+                    sigma_r=0.5,
+                    sigma_q=0.25,
+                    dt_forward=1.0,
+                    max_days=3650.0,
+                    min_rate=0.0,
+                )
+
+    def test_rate_bound_matches_monte_carlo(self):
+        self.assert_matches_monte_carlo(
+            0.1,
+            x_mean=self.X_MEAN,
+            P=self.COVARIANCE,
+            nsims=20000,
+            sigma_r=0.5,
+            sigma_q=0.25,
+            dt_forward=1.0,
+            max_days=3650.0,
+            min_rate=1.0,
+        )
+
+    def test_cdf_is_monotone_on_the_step_grid(self):
+        times, cdf = analytic_hitting_cdf(
+            self.X_MEAN, self.COVARIANCE, 0.5, 0.25, 0.5, 100.0, 0.0
+        )
+        self.assertEqual(len(times), 200)
+        self.assertAlmostEqual(times[0], 0.5)
+        self.assertTrue(np.all(np.diff(cdf) >= 0.0))
+        self.assertGreater(cdf[-1], 0.9)
+
+    def test_no_consumption_is_censored(self):
+        hits = analytic_hitting_time(
+            np.array([50.0, 0.0]),
+            np.zeros((2, 2)),
+            nsims=100,
+            sigma_r=0.0,
+            sigma_q=0.0,
+            dt_forward=1.0,
+            max_days=365.0,
+            min_rate=0.0,
+        )
+        self.assertTrue(np.all(np.isinf(hits)))
+
+
 class TestAsciiHistogram(unittest.TestCase):
     """Tests for ``ascii_histogram``."""
 
@@ -422,6 +599,23 @@ class TestIntegration(unittest.TestCase):
         self.assertIn("Histogram", result.stdout)
         self.assertIn("Summary:", result.stdout)
 
+    def test_analytic_mode_reports_quantiles(self):
+        result = run_script("--analytic", "--nsims", "500")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("Analytic approximation: 500 quantiles", result.stdout)
+        self.assertIn("Quantiles:", result.stdout)
+        self.assertIn("Histogram", result.stdout)
+
+    def test_analytic_mode_counts_censored_quantiles(self):
+        result = run_script("--analytic", "--nsims", "500", "--max-days", "1")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("Note: 500 quantiles (100.0%)", result.stdout)
+
+    def test_analytic_mode_rejects_negative_rates(self):
+        result = run_script("--analytic", "--allow-negative-rate")
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("--allow-negative-rate", result.stderr)
+
     def test_seed_makes_output_reproducible(self):
         result1 = run_script("--seed", "99", "--nsims", "500")
         result2 = run_script("--seed", "99", "--nsims", "500")
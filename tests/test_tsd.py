@@ -2,8 +2,11 @@
 
 """Unit test functions in tsd.py."""
 
+import contextlib
+import io
 import os
 import shutil
+import statistics
 import sys
 import unittest
 from pathlib import Path
@@ -27,8 +30,10 @@ class TestTSD(unittest.TestCase):
         self.cwd = os.getcwd()
         self.home = os.environ.get("HOME")
         self.xdg_config_home = os.environ.pop("XDG_CONFIG_HOME", None)
+        self.xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
         os.chdir(PROJECT_ROOT)
         os.environ["HOME"] = str(FIXTURES_HOME)
+        os.environ["XDG_CACHE_HOME"] = str(TMP_DIR / "cache")
         tsd.get_config()
         TMP_DIR.mkdir(exist_ok=True)
 
@@ -44,6 +49,10 @@ class TestTSD(unittest.TestCase):
             os.environ.pop("XDG_CONFIG_HOME", None)
         else:
             os.environ["XDG_CONFIG_HOME"] = self.xdg_config_home
+        if self.xdg_cache_home is None:
+            os.environ.pop("XDG_CACHE_HOME", None)
+        else:
+            os.environ["XDG_CACHE_HOME"] = self.xdg_cache_home
 
     def test_local_config(self):
         """Test that the fixture config is correct."""
@@ -80,6 +89,121 @@ class TestTSD(unittest.TestCase):
         lines = tsd.recent_data(sname, True)
         self.assertEqual(["2013-04-01\t3.1415"], lines)
 
+    def test_add_points(self):
+        """Test add_points()."""
+        tsd.create_series("tmp/a", False, False)
+        tsd.create_series("tmp/b", False, False)
+        tsd.add_points(
+            [("tmp/a", "1"), ("tmp/b", "2.5"), ("tmp/a", "3")], "2013-04-01"
+        )
+        self.assertEqual(
+            ["2013-04-01\t1.0", "2013-04-01\t3.0"],
+            tsd.recent_data("tmp/a", True),
+        )
+        self.assertEqual(["2013-04-01\t2.5"], tsd.recent_data("tmp/b", True))
+        stats = tsd.read_series_stats(tsd.series_name("tmp/a", False))
+        self.assertEqual((2, 2.0), (stats["n"], stats["mean"]))
+
+        # Nothing is written if any series or value is bad.
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            with self.assertRaises(SystemExit):
+                tsd.add_points(
+                    [("tmp/a", "4"), ("tmp/missing", "1"), ("tmp/b", "x")],
+                    "2013-04-02",
+                )
+        self.assertEqual(
+            'Series "tmp/missing" does not exist, use init to create.\n'
+            'Value "x" for series "tmp/b" is not a number.\n',
+            output.getvalue(),
+        )
+        self.assertEqual(2, len(tsd.recent_data("tmp/a", True)))
+        self.assertEqual(1, len(tsd.recent_data("tmp/b", True)))
+
+    def test_parse_assignments(self):
+        """Test parse_assignments()."""
+        self.assertEqual(
+            [("a", "1.2"), ("b", "3"), ("c", "")],
+            tsd.parse_assignments(["a=1.2", "b=3", "c="]),
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                tsd.parse_assignments(["a=1", "b"])
+
+    def test_main_appends_from_argv_and_stdin(self):
+        """Test main() with several series=value pairs."""
+        tsd.create_series("tmp/a", False, False)
+        tsd.create_series("tmp/b", False, False)
+        argv = sys.argv
+        stdin = sys.stdin
+        try:
+            sys.argv = ["tsd", "-d", "2013-04-01", "tmp/a=1", "tmp/b=2"]
+            tsd.main()
+            sys.argv = ["tsd", "-d", "2013-04-02", "-"]
+            sys.stdin = io.StringIO("tmp/a=3\ntmp/b=4 tmp/a=5\n")
+            tsd.main()
+        finally:
+            sys.argv = argv
+            sys.stdin = stdin
+        self.assertEqual(
+            ["2013-04-01\t1.0", "2013-04-02\t3.0", "2013-04-02\t5.0"],
+            tsd.recent_data("tmp/a", True),
+        )
+        self.assertEqual(
+            ["2013-04-01\t2.0", "2013-04-02\t4.0"],
+            tsd.recent_data("tmp/b", True),
+        )
+
+    def test_series_stats(self):
+        """Test running statistics maintained by add_point()."""
+        sname = "tmp/stats"
+        tsd.create_series(sname, False, False)
+        self.assertEqual(
+            ["µ = nan   σ = nan   n = 0"], tsd.show_series_stats(sname)
+        )
+        values = [3.0, 1.5, 4.0, 1.0, 5.5]
+        for day, value in enumerate(values, start=1):
+            tsd.add_point(sname, "2013-04-%02d" % day, value)
+        path = tsd.series_name(sname, False)
+        stats = tsd.read_series_stats(path)
+        self.assertEqual(stats, tsd.compute_series_stats(path))
+        self.assertEqual(5, stats["n"])
+        self.assertAlmostEqual(statistics.fmean(values), stats["mean"])
+        self.assertAlmostEqual(
+            statistics.pvariance(values), stats["m2"] / stats["n"]
+        )
+        self.assertEqual((1.0, 5.5), (stats["min"], stats["max"]))
+        self.assertEqual(
+            ("2013-04-01", "2013-04-05"), (stats["first"], stats["last"])
+        )
+        self.assertEqual(
+            [
+                "µ = 3.0   σ = 1.6   n = 5",
+                "min = 1.0   max = 5.5   2013-04-01 .. 2013-04-05",
+            ],
+            tsd.show_series_stats(sname, verbose=True),
+        )
+
+        # Editing the series outside of tsd invalidates the stats.
+        with open(path, "w") as series_fp:
+            series_fp.write("2012-01-01\t10\n2013-05-01\t20\n")
+        stats = tsd.read_series_stats(path)
+        self.assertEqual(2, stats["n"])
+        self.assertAlmostEqual(15.0, stats["mean"])
+        self.assertEqual(
+            ("2012-01-01", "2013-05-01"), (stats["first"], stats["last"])
+        )
+
+    def test_stats_file_is_not_a_series(self):
+        """Test that the stats sidecar is not listed as a series."""
+        sname = "tmp/listed"
+        tsd.create_series(sname, False, False)
+        tsd.add_point(sname, "2013-04-01", 1)
+        self.assertTrue(
+            os.path.exists(tsd.series_stats_name(tsd.series_name(sname, 0)))
+        )
+        self.assertFalse(tsd.is_series_filename("listed.stats"))
+        self.assertTrue(tsd.is_series_filename("listed"))
+
     def test_show_series_config(self):
         """Test show_series_config()."""
         sname = "tmp/for_its_config"
@@ -113,11 +237,120 @@ class TestTSD(unittest.TestCase):
         self.assertEqual([False, False, False, False, True], values)
         self.assertEqual(series["test-square"], True)
 
+    def test_series_names(self):
+        """Test series_names()."""
+        names = tsd.series_names()
+        # tmp is a subdirectory of the series directory, not a series.
+        self.assertTrue(os.path.isdir(TMP_DIR))
+        self.assertEqual(
+            ["test-bulge", "test-flat", "test-short", "test-square"], names
+        )
+
+    def test_completions(self):
+        """Test completions() and the completion cache."""
+        cache_name = tsd.completion_cache_name()
+        self.assertEqual(
+            str(TMP_DIR / "cache" / "tsd" / "series-names"), cache_name
+        )
+        self.assertIsNone(tsd.read_completion_cache())
+        self.assertEqual(
+            ["test-short", "test-square"], tsd.completions("test-s")
+        )
+        with open(cache_name) as cache_fp:
+            lines = cache_fp.read().splitlines()
+        series_dir = os.path.abspath(tsd.series_dir_name())
+        self.assertEqual(series_dir, lines[0])
+        self.assertEqual(tsd.series_names(), lines[1:])
+
+        # A cache newer than the series directory is used as is.
+        with open(cache_name, "w") as cache_fp:
+            cache_fp.write(series_dir + "\ncached-a\ncached-b\n")
+        dir_mtime = os.stat(series_dir).st_mtime_ns
+        os.utime(cache_name, ns=(dir_mtime + 10**9, dir_mtime + 10**9))
+        self.assertEqual(["cached-a", "cached-b"], tsd.completions("cached"))
+
+        # Creating or deleting a series makes the cache stale.
+        os.utime(cache_name, ns=(dir_mtime, dir_mtime))
+        self.assertIsNone(tsd.read_completion_cache())
+        self.assertEqual([], tsd.completions("cached"))
+
+    def test_completion_cache_stays_fresh(self):
+        """Test that tsd's own writes leave the completion cache valid."""
+        series_dir = tsd.series_dir_name()
+        sname = os.path.join(series_dir, "test-fresh")
+        try:
+            tsd.create_series("test-fresh", True, False)
+            self.assertIn("test-fresh", tsd.read_completion_cache())
+
+            # The first point creates the stats sidecar.
+            tsd.add_point("test-fresh", "2013-04-01", "2")
+            self.assertTrue(os.path.exists(tsd.series_stats_name(sname)))
+            self.assertIn("test-fresh", tsd.read_completion_cache())
+
+            # Listing leaves a fresh cache alone.
+            cache_name = tsd.completion_cache_name()
+            os.utime(cache_name, ns=(2 * 10**18, 2 * 10**18))
+            tsd.list_series()
+            self.assertEqual(2 * 10**18, os.stat(cache_name).st_mtime_ns)
+        finally:
+            for name in (sname, sname + ".cfg", sname + ".stats"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def test_tail_line(self):
+        """Test tail_line()."""
+        self.assertEqual(
+            "2011-01-05\t8", tsd.tail_line("./tests/data/test-short")
+        )
+        # Force several backwards reads.
+        self.assertEqual(
+            "2011-02-22\t4",
+            tsd.tail_line("./tests/data/test-square", block_size=3),
+        )
+        sname = "tmp/tail"
+        tsd.create_series(sname, False, False)
+        self.assertEqual("", tsd.tail_line(tsd.series_name(sname, False)))
+        with open(tsd.series_name(sname, False), "a") as series_fp:
+            series_fp.write("2013-04-01\t3\n\n\n")
+        self.assertEqual(
+            "2013-04-01\t3", tsd.tail_line(tsd.series_name(sname, False))
+        )
+
+    def test_match_series(self):
+        """Test match_series()."""
+        names = tsd.series_names()
+        self.assertEqual(
+            ["test-short", "test-square"], tsd.match_series("test-s", names)
+        )
+        self.assertEqual(
+            ["test-bulge", "test-flat"],
+            tsd.match_series("test-(b|f)", names),
+        )
+        self.assertEqual([], tsd.match_series("short", names))
+        self.assertEqual([], tsd.match_series("test-(", names))
+
+    def test_group_summary(self):
+        """Test group_summary()."""
+        lines = tsd.group_summary("test-s")
+        expected = [
+            "test-short                  8    g   2011-01-05",
+            "test-square                 4    g   2011-02-22",
+            "  Σ=12",
+        ]
+        self.assertEqual(expected, lines)
+        self.assertEqual(expected, tsd.group_summary("test-s", jobs=4))
+        self.assertEqual(["  Σ=18"], tsd.group_summary("test-", True))
+
+        # A pattern matching the tmp subdirectory matches no series.
+        self.assertEqual(
+            tsd.group_summary("t[em]", jobs=2), tsd.group_summary("te")
+        )
+
     def test_list_commands(self):
         """Test list_commands()."""
 
         commands = tsd.list_commands()
-        self.assertEqual(["config", "edit", "init", "plot"], commands)
+        self.assertEqual(["config", "edit", "init", "plot", "stats"], commands)
 
     def test_series_dir_name(self):
         """Test series_dir_name()."""
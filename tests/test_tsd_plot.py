@@ -1,14 +1,22 @@
 """Tests for the :mod:`tsd_plot` package."""
 
+import argparse
 import datetime as dt
+import json
+import os
+import statistics
+import subprocess
+import sys
 
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 
 matplotlib.use("Agg")
 
 from tsd_plot import cli, main
+from tsd_plot.cache import Cache
 
 
 @pytest.fixture(autouse=True)
@@ -16,6 +24,15 @@ def _no_show(monkeypatch):
     """Prevent matplotlib from opening GUI windows during tests."""
 
     monkeypatch.setattr(plt, "show", lambda: None)
+    yield
+    plt.close("all")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """Keep the render cache out of the user's cache directory."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
 
 
 def test_parse_bin_width_keywords():
@@ -24,6 +41,45 @@ def test_parse_bin_width_keywords():
     assert cli.parse_bin_width("year") == 365
 
 
+def test_parse_bin_width_calendar_keywords():
+    assert cli.parse_bin_width("iso") == "iso-week"
+    assert cli.parse_bin_width("calendar-m") == "calendar-month"
+    assert cli.parse_bin_width("q") == "quarter"
+    assert cli.parse_bin_width("calendar-year") == "calendar-year"
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_bin_width("cal")
+
+
+@pytest.mark.parametrize(
+    "width,key",
+    [
+        ("iso-week", lambda d: d.isocalendar()[:2]),
+        ("calendar-month", lambda d: (d.year, d.month)),
+        ("quarter", lambda d: (d.year, (d.month - 1) // 3)),
+        ("calendar-year", lambda d: d.year),
+    ],
+)
+def test_bin_series_calendar_bins(width, key):
+    series = random_series(2000, seed=7)
+    series.points.append((dt.date(1969, 12, 29), 1.5))
+    groups = {}
+    for date, value in series.points:
+        groups.setdefault(key(date), []).append((date, value))
+
+    binned = cli.bin_series(series, width, cli.BIN_FUNCTIONS["sum"])
+
+    assert len(binned.points) == len(groups)
+    for label, total in binned.points:
+        members = groups[key(label)]
+        assert total == pytest.approx(sum(value for _, value in members))
+        assert label <= min(date for date, _ in members)
+        if width == "iso-week":
+            assert label.isoweekday() == 1
+        else:
+            assert label.day == 1
+            assert (label.month - 1) % cli.CALENDAR_MONTHS[width] == 0
+
+
 def test_resolve_prefix_errors():
     with pytest.raises(cli.PrefixMatchError):
         cli.resolve_prefix("x", {"bar", "line"})
@@ -110,6 +166,290 @@ def test_plot_series_formats(tmp_path, monkeypatch):
     assert scatter_fig.axes[0].has_data()
 
 
+def test_prepare_plot_data_aligns_series():
+    first = cli.SeriesData(
+        label="a",
+        filename="a",
+        points=[
+            (dt.date(2024, 1, 3), 1.0),
+            (dt.date(2024, 1, 1), 2.0),
+            (dt.date(2024, 1, 3), 4.0),
+        ],
+    )
+    second = cli.SeriesData(
+        label="b", filename="b", points=[(dt.date(2024, 1, 2), 5.0)]
+    )
+    empty = cli.SeriesData(label="c", filename="c", points=[])
+
+    days, matrix = cli.prepare_plot_data([first, second, empty])
+
+    assert days.dtype == np.int64
+    assert [cli.EPOCH + dt.timedelta(days=int(day)) for day in days] == [
+        dt.date(2024, 1, d) for d in (1, 2, 3)
+    ]
+    assert matrix.tolist() == [
+        [2.0, 0.0, 0.0],
+        [0.0, 5.0, 0.0],
+        [4.0, 0.0, 0.0],
+    ]
+
+
+def test_plot_series_stacked_bottoms():
+    series = [
+        cli.SeriesData(
+            label=label,
+            filename=label,
+            points=[(dt.date(2024, 1, 1), value), (dt.date(2024, 1, 2), 1.0)],
+        )
+        for label, value in (("a", 2.0), ("b", 3.0), ("c", 4.0))
+    ]
+    fig = cli.plot_series(series, "stacked", "Value", "Stacked")
+    patches = fig.axes[0].patches
+    assert [patch.get_y() for patch in patches] == [
+        0.0,
+        0.0,
+        2.0,
+        1.0,
+        5.0,
+        2.0,
+    ]
+
+
+@pytest.mark.parametrize("plot_format", ["line", "scatter"])
+def test_zoom_rebinner_follows_visible_range(plot_format):
+    start = dt.date(2000, 1, 1)
+    series = cli.SeriesData(
+        label="long",
+        filename="long",
+        points=[
+            (start + dt.timedelta(days=day), float(day % 10))
+            for day in range(20000)
+        ],
+    )
+    fig = cli.plot_series([series], plot_format, "Value", "Zoom")
+    rebinner = cli.attach_zoom_rebinner(
+        fig, [series], plot_format, cli.BIN_FUNCTIONS["mean"]
+    )
+    ax = fig.axes[0]
+    pixels = int(ax.bbox.width)
+
+    def drawn():
+        artist = rebinner.artists[0]
+        if plot_format == "line":
+            return np.asarray(artist.get_xdata()), artist.get_ydata()
+        offsets = artist.get_offsets()
+        return offsets[:, 0], offsets[:, 1]
+
+    x_values, y_values = drawn()
+    assert 0 < len(x_values) <= pixels
+    assert np.allclose(y_values[1:-1], 4.5, atol=0.5)
+
+    low = rebinner.epoch + cli.series_arrays(series)[0][100]
+    ax.set_xlim(low, low + 30)
+    x_values, y_values = drawn()
+    assert len(x_values) == 33
+    assert list(y_values[1:-1]) == [float(day % 10) for day in range(100, 131)]
+
+
+def test_plot_series_density():
+    series = [random_series(5000, seed) for seed in (1, 2)]
+
+    fig = cli.plot_series(
+        series, "scatter", "Value", "Density", density=True, log_density=True
+    )
+
+    ax = fig.axes[0]
+    assert not ax.collections
+    counts = ax.images[0].get_array()
+    height, width = counts.shape
+    assert width >= cli.axes_pixels(ax)[0]
+    assert counts.sum() == 10000
+
+
+def test_density_needs_scatter(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["missing", "--density", "--format", "line"])
+    assert "--density needs" in capsys.readouterr().err
+
+
+def test_zoom_needs_line_or_scatter(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["missing", "--zoom", "--format", "bar"])
+    assert "--zoom needs" in capsys.readouterr().err
+
+
+def test_cached_plot_skips_matplotlib(tmp_path, monkeypatch):
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    data_file = data_dir / "data"
+    data_file.write_text("2024-05-01\t5\n2024-05-02\t7\n", encoding="utf8")
+    monkeypatch.setenv("TSD", str(data_dir))
+    output = tmp_path / "plot.png"
+    main(["data", "--output", str(output)])
+    output.unlink()
+
+    code = (
+        "import sys\n"
+        "from tsd_plot import cli\n"
+        f"cli.main(['data', '--output', {str(output)!r}])\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert output.exists()
+
+    output.unlink()
+    data_file.write_text("2024-05-01\t5\n", encoding="utf8")
+    os.utime(data_file, ns=(0, 0))
+    code = code.replace("not in", "in")
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert output.exists()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = Cache(tmp_path / "cache", max_bytes=350)
+    for index, key in enumerate("abc"):
+        cache.write_bytes(key, bytes(100))
+        os.utime(cache.entry(key), ns=(index, index))
+    assert cache.lookup("a") is not None  # now the most recently used
+
+    cache.write_bytes("d", bytes(100))
+
+    assert sorted(path.name for path in cache.directory.iterdir()) == [
+        "a",
+        "c",
+        "d",
+    ]
+    assert cache.read_bytes("d") == bytes(100)
+    assert cache.read_bytes("b") is None
+
+
+def test_expand_filespecs(tmp_path):
+    for name in (
+        "chocolat-noir",
+        "chocolat-lait",
+        "chocolat-lait.cfg",
+        "chocolat-lait.stats",
+        "tea",
+        "green-tea",
+        "tea~",
+    ):
+        (tmp_path / name).write_text("", encoding="utf8")
+    (tmp_path / "chocolat-dir").mkdir()
+
+    specs = cli.expand_filespecs(
+        ["chocolat-*", "re:^tea", "re:tea$", "tea:Tea"], tmp_path
+    )
+
+    assert specs == [
+        ("chocolat-lait", "chocolat-lait"),
+        ("chocolat-noir", "chocolat-noir"),
+        ("tea", "tea"),
+        ("green-tea", "green-tea"),
+        ("tea", "tea"),
+        ("tea", "Tea"),
+    ]
+    with pytest.raises(ValueError, match="match"):
+        cli.expand_filespecs(["coffee-*"], tmp_path)
+    with pytest.raises(ValueError, match="Bad pattern"):
+        cli.expand_filespecs(["re:("], tmp_path)
+
+
+def test_main_loads_patterns(tmp_path, monkeypatch, capsys):
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    for index in range(5):
+        (data_dir / f"s{index}").write_text(
+            f"2024-05-0{index + 1}\t{index}\n", encoding="utf8"
+        )
+    monkeypatch.setenv("TSD", str(data_dir))
+
+    main(["s*", "--sum", "--std", "-v"])
+
+    out = capsys.readouterr().out
+    assert "Loaded 5 series containing 5 points in total." in out
+    assert "Loading took " in out
+    assert "Plot title: s0 s1 s2 s3 s4" in out
+    with pytest.raises(SystemExit):
+        main(["x*"])
+    assert "No series in" in capsys.readouterr().err
+
+
+def test_load_series_keeps_order(tmp_path):
+    specs = [(f"s{index}", f"label{index}") for index in range(20)]
+    for filename, _ in specs:
+        (tmp_path / filename).write_text("2024-01-01\t1\n", encoding="utf8")
+
+    series = cli.load_series(specs, tmp_path)
+
+    assert [item.label for item in series] == [label for _, label in specs]
+
+
+def test_summarize_series():
+    series = random_series(500, seed=4)
+    values = [value for _, value in series.points]
+
+    summary = cli.summarize_series(series, [0.1, 0.5, 0.975])
+
+    assert list(summary) == [
+        "label",
+        "n",
+        "mean",
+        "std",
+        "min",
+        "max",
+        "p10",
+        "p50",
+        "p97.5",
+    ]
+    assert summary["n"] == 500
+    assert summary["mean"] == pytest.approx(statistics.fmean(values))
+    assert summary["std"] == pytest.approx(statistics.stdev(values))
+    assert summary["min"] == min(values)
+    assert summary["max"] == max(values)
+    assert summary["p50"] == pytest.approx(statistics.median(values))
+
+    empty = cli.summarize_series(
+        cli.SeriesData(label="e", filename="e", points=[]), [0.5]
+    )
+    assert empty["n"] == 0 and np.isnan(empty["p50"])
+
+
+def test_no_plot_prints_summaries(tmp_path, monkeypatch, capsys):
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    (data_dir / "a").write_text(
+        "2024-01-01\t1\n2024-01-02\t3\n2024-02-01\t5\n", encoding="utf8"
+    )
+    (data_dir / "b").write_text("2024-01-01\t2\n", encoding="utf8")
+    monkeypatch.setenv("TSD", str(data_dir))
+
+    main(["a", "b", "--no-plot", "--quantiles", "0.5"])
+    assert capsys.readouterr().out.splitlines() == [
+        "label\tn\tmean\tstd\tmin\tmax\tp50",
+        "a\t3\t3.0\t2.0\t1.0\t5.0\t3.0",
+        "b\t1\t2.0\tnan\t2.0\t2.0\t2.0",
+    ]
+
+    cli.summary_main(
+        ["a", "--bin-width", "calendar-month", "--stats-format", "json"]
+    )
+    summaries = json.loads(capsys.readouterr().out)
+    assert summaries == [
+        {
+            "label": "a",
+            "n": 2,
+            "mean": 3.5,
+            "std": pytest.approx(2.1213203),
+            "min": 2.0,
+            "max": 5.0,
+            "p25": 2.75,
+            "p50": 3.5,
+            "p75": 4.25,
+        }
+    ]
+    assert not list((tmp_path / "cache").glob("**/*.png"))
+
+
 def test_compute_std_nan():
     assert str(cli.compute_std([1.0])) == "nan"
     assert cli.compute_std([1.0, 2.0, 3.0]) == pytest.approx(1.0)
@@ -131,6 +471,114 @@ def test_bin_series_reducer():
     assert binned.points[1][1] == pytest.approx(4.0)
 
 
+def reference_bin_series(series, width, reducer):
+    """Bin with the original dict-of-lists implementation."""
+
+    grouped = {}
+    for date, value in series.points:
+        offset = (date - cli.EPOCH).days % width
+        bucket = date - dt.timedelta(days=offset)
+        grouped.setdefault(bucket, []).append(value)
+    return [
+        (bucket, reducer(values)) for bucket, values in sorted(grouped.items())
+    ]
+
+
+def random_series(count, seed=1):
+    rng = np.random.default_rng(seed)
+    start = dt.date(1965, 3, 1)
+    points = [
+        (start + dt.timedelta(days=int(day)), float(value))
+        for day, value in zip(
+            rng.integers(0, 365 * 12, count),
+            rng.normal(10.0, 5.0, count).round(2),
+        )
+    ]
+    return cli.SeriesData(label="demo", filename="demo", points=points)
+
+
+@pytest.mark.parametrize(
+    "name,reference",
+    [
+        ("mean", statistics.fmean),
+        ("median", statistics.median),
+        ("sum", sum),
+    ],
+)
+@pytest.mark.parametrize("width", [1, 7, 30, 365])
+def test_bin_series_matches_reference(name, reference, width):
+    series = random_series(2000)
+
+    binned = cli.bin_series(series, width, cli.BIN_FUNCTIONS[name])
+    expected = reference_bin_series(series, width, reference)
+
+    assert [date for date, _ in binned.points] == [
+        date for date, _ in expected
+    ]
+    assert [value for _, value in binned.points] == pytest.approx(
+        [value for _, value in expected]
+    )
+
+
+@pytest.mark.parametrize(
+    "name,reference",
+    [
+        ("min", min),
+        ("max", max),
+        ("count", len),
+        ("std", cli.compute_std),
+        ("p90", lambda values: float(np.percentile(values, 90))),
+        ("p5", lambda values: float(np.percentile(values, 5))),
+    ],
+)
+def test_bin_series_extra_reducers(name, reference):
+    series = random_series(500)
+
+    _, reducer = cli.resolve_bin_function(name)
+    binned = cli.bin_series(series, 30, reducer)
+    expected = reference_bin_series(series, 30, reference)
+
+    assert [value for _, value in binned.points] == pytest.approx(
+        [value for _, value in expected], nan_ok=True
+    )
+
+
+def test_sum_series_matches_dict_summation():
+    series = [random_series(count, seed) for count, seed in ((300, 1), (5, 2))]
+    series.append(cli.SeriesData(label="empty", filename="empty", points=[]))
+    series.append(
+        cli.SeriesData(
+            label="sorted",
+            filename="sorted",
+            points=sorted(random_series(200, 3).points),
+        )
+    )
+    aggregated = {}
+    for entry in series:
+        for date, value in entry.points:
+            aggregated[date] = aggregated.get(date, 0.0) + value
+
+    summed = cli.sum_series(series)
+
+    assert summed.points == sorted(aggregated.items())
+    assert cli.sum_series([]).points == []
+
+
+def test_resolve_bin_function():
+    assert cli.resolve_bin_function("med")[0] == "median"
+    assert cli.resolve_bin_function("P99.5")[0] == "p99.5"
+    assert cli.resolve_bin_function("p100")[0] == "p100"
+    with pytest.raises(cli.PrefixMatchError):
+        cli.resolve_bin_function("me")
+    with pytest.raises(cli.PrefixMatchError):
+        cli.resolve_bin_function("p101")
+
+
+def test_bin_series_empty():
+    series = cli.SeriesData(label="demo", filename="demo", points=[])
+    assert cli.bin_series(series, 7, cli.BIN_FUNCTIONS["sum"]).points == []
+
+
 def test_help_mentions_overview_groups_and_defaults(capsys):
     """Help output should summarize intent, groups, and defaults."""
 
@@ -0,0 +1,153 @@
+"""Tests for the :mod:`tsd_plot.batch` module."""
+
+from pathlib import Path
+
+import matplotlib
+import pytest
+
+matplotlib.use("Agg")
+
+from tsd_plot import batch, cli, seasonal
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """Keep the render cache out of the user's cache directory."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    base_dir = tmp_path / "tsd"
+    base_dir.mkdir()
+    (base_dir / "weight").write_text(
+        "2024-05-01\t5\n2024-05-02\t7\n2024-06-01\t6\n", encoding="utf8"
+    )
+    monkeypatch.setenv("TSD", str(base_dir))
+    return base_dir
+
+
+def test_parse_specs(tmp_path):
+    specs = batch.parse_specs(
+        [
+            "# output command arguments\n",
+            "\n",
+            "a.png plot weight --title 'Body weight'\n",
+            "b/c.svg seas weight --heatmap  # trailing comment\n",
+        ],
+        tmp_path,
+    )
+
+    assert specs == [
+        batch.PlotSpec(
+            tmp_path / "a.png", "plot", ("weight", "--title", "Body weight")
+        ),
+        batch.PlotSpec(
+            tmp_path / "b" / "c.svg", "seasonal", ("weight", "--heatmap")
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line", ["a.png plot\n", "a.png sideways weight\n", "a.png 'plot\n"]
+)
+def test_parse_specs_errors(tmp_path, line):
+    with pytest.raises(ValueError, match="line 2"):
+        batch.parse_specs(["\n", line], tmp_path)
+
+
+def test_main_renders_files(data_dir, tmp_path, capsys):
+    spec_file = tmp_path / "plots"
+    spec_file.write_text(
+        "line.png plot weight --format line\n"
+        "nested/season.svg seasonal weight --heatmap\n"
+        "bar.png plot weight\n",
+        encoding="utf8",
+    )
+    out_dir = tmp_path / "out"
+
+    batch.main([str(spec_file), "-d", str(out_dir), "-j", "1"])
+
+    for name in ("line.png", "nested/season.svg", "bar.png"):
+        assert (out_dir / name).stat().st_size > 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].endswith("line.png")
+    assert lines[-1].startswith("Rendered 3 of 3 plots")
+
+
+def test_main_reports_failures(data_dir, tmp_path, capsys):
+    spec_file = tmp_path / "plots"
+    spec_file.write_text(
+        "ok.png plot weight\n"
+        "missing.png plot no-such-series\n"
+        "bad.png plot weight --format sideways\n",
+        encoding="utf8",
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        batch.main([str(spec_file), "-d", str(tmp_path), "-j", "1"])
+
+    assert excinfo.value.code == 1
+    out = capsys.readouterr().out
+    assert "missing.png  FAILED" in out
+    assert "bad.png  FAILED: invalid arguments" in out
+    assert "Rendered 1 of 3 plots" in out
+    assert (tmp_path / "ok.png").exists()
+    assert not (tmp_path / "missing.png").exists()
+
+
+def test_figure_is_reused(data_dir, tmp_path):
+    first = batch.PlotSpec(tmp_path / "a.png", "plot", ("weight",))
+    second = batch.PlotSpec(tmp_path / "b.png", "seasonal", ("weight",))
+
+    batch.init_worker()
+    assert batch.render_spec(first).error is None
+    figure = batch._FIGURE
+    assert batch.render_spec(second).error is None
+
+    assert batch._FIGURE is figure
+    assert len(figure.axes) == 1
+    assert tuple(figure.get_size_inches()) == seasonal.FIGURE_SIZE
+
+
+def test_render_all_uses_processes(data_dir, tmp_path):
+    specs = [
+        batch.PlotSpec(tmp_path / f"{index}.png", "plot", ("weight",))
+        for index in range(3)
+    ]
+
+    results = batch.render_all(specs, jobs=2)
+
+    assert [result.spec for result in results] == specs
+    assert all(result.error is None for result in results)
+    assert all(Path(spec.output).exists() for spec in specs)
+
+
+def test_unchanged_plots_come_from_cache(data_dir, tmp_path, capsys):
+    spec_file = tmp_path / "plots"
+    spec_file.write_text(
+        "a.png plot weight\nb.png plot weight --no-cache\n", encoding="utf8"
+    )
+    arguments = [str(spec_file), "-d", str(tmp_path / "out"), "-j", "1"]
+
+    batch.main(arguments)
+    first = (tmp_path / "out" / "a.png").read_bytes()
+    (tmp_path / "out" / "a.png").unlink()
+    capsys.readouterr()
+    batch.main(arguments)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].endswith("a.png  (cached)")
+    assert lines[1].endswith("b.png")
+    assert (tmp_path / "out" / "a.png").read_bytes() == first
+
+
+def test_output_option_writes_file(data_dir, tmp_path):
+    output = tmp_path / "plot.svg"
+
+    cli.main(["weight", "--output", str(output)])
+    seasonal.main(["weight", "-o", str(tmp_path / "season.png")])
+
+    assert output.read_text(encoding="utf8").lstrip().startswith("<?xml")
+    assert (tmp_path / "season.png").exists()
@@ -1,9 +1,11 @@
 """Tests for the :mod:`tsd_plot.seasonal` module."""
 
 import datetime as dt
+import math
 
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 
 matplotlib.use("Agg")
@@ -15,6 +17,14 @@ from tsd_plot import seasonal
 def _no_show(monkeypatch):
     """Prevent matplotlib from opening GUI windows during tests."""
     monkeypatch.setattr(plt, "show", lambda: None)
+    yield
+    plt.close("all")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """Keep cached arrays out of the user's cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
 
 
 def test_project_series_to_year_period():
@@ -33,6 +43,43 @@ def test_project_series_to_year_period():
     assert projected == [("2024", 0.0, 1.0), ("2024", 365.0, 2.0)]
 
 
+@pytest.mark.parametrize("period", ["year", "month", "week"])
+def test_project_series_matches_calendar(period):
+    """Array projection should agree with the calendar for every day."""
+    start = dt.date(1965, 12, 20)
+    dates = [start + dt.timedelta(days=day) for day in range(365 * 65)]
+    series = seasonal.SeriesData(
+        label="demo",
+        filename="demo",
+        points=[(date, float(index)) for index, date in enumerate(dates)],
+    )
+
+    projected = seasonal.project_series_to_period(series, period)
+
+    expected = []
+    for index, date in enumerate(dates):
+        if period == "year":
+            row = str(date.year)
+            x_value = date.timetuple().tm_yday - 1
+        elif period == "month":
+            row = f"{date.year:04d}-{date.month:02d}"
+            x_value = date.day - 1
+        else:
+            iso_year, iso_week, iso_day = date.isocalendar()
+            row = f"{iso_year:04d}-W{iso_week:02d}"
+            x_value = iso_day - 1
+        expected.append((row, float(x_value), float(index)))
+    assert projected == expected
+
+
+def test_row_layout_orders_rows_latest_first():
+    """Rows should be numbered from the latest period down."""
+    rows, row_codes = seasonal.row_layout(np.array([2024, 2022, 2024, 2023]))
+
+    assert rows.tolist() == [0, 2, 0, 1]
+    assert row_codes.tolist() == [2024, 2023, 2022]
+
+
 def test_size_map_uses_diameter_bounds():
     """Point sizes should respect the requested diameter bounds."""
     sizes = seasonal.size_map([1.0, 3.0, 5.0], 4.0, 10.0)
@@ -41,6 +88,57 @@ def test_size_map_uses_diameter_bounds():
     assert sizes[-1] == pytest.approx(100.0)
 
 
+def test_size_map_handles_flat_and_empty_values():
+    """Flat inputs share the mid-size and empty inputs give no sizes."""
+    assert seasonal.size_map([2.0, 2.0], 4.0, 10.0).tolist() == [49.0, 49.0]
+    assert len(seasonal.size_map([], 4.0, 10.0)) == 0
+    with pytest.raises(ValueError):
+        seasonal.size_map([1.0], 10.0, 4.0)
+
+
+def test_plot_seasonal_series_draws_one_collection():
+    """All series should share one collection, with a proxy legend."""
+    series = [
+        seasonal.SeriesData(
+            label=f"series {index}",
+            filename=f"s{index}",
+            points=[
+                (dt.date(2024, 1, 1) + dt.timedelta(days=day), float(day))
+                for day in range(index, 40, 3)
+            ],
+        )
+        for index in range(3)
+    ]
+
+    figure = seasonal.plot_seasonal_series(
+        series,
+        period="month",
+        title="Overlay",
+        color=None,
+        min_size=4.0,
+        max_size=8.0,
+        alpha=0.5,
+        heatmap=False,
+        heatmap_style="seasonal",
+        heatmap_mode="sum",
+        heatmap_sigma_x=2.0,
+        heatmap_sigma_y=0.75,
+        heatmap_alpha=0.35,
+        show_month_lines=False,
+    )
+
+    axis = figure.axes[0]
+    assert len(axis.collections) == 1
+    collection = axis.collections[0]
+    total = sum(len(item.points) for item in series)
+    assert len(collection.get_offsets()) == total
+    colors = collection.get_facecolors()
+    assert len(colors) == total
+    assert len({tuple(rgba) for rgba in colors}) == 3
+    legend_labels = [text.get_text() for text in axis.get_legend().texts]
+    assert legend_labels == ["series 0", "series 1", "series 2"]
+
+
 def test_resolve_size_bounds_promotes_single_override():
     """Single-sided size overrides should expand the opposite bound."""
     assert seasonal.resolve_size_bounds(20.0, None) == (20.0, 20.0)
@@ -86,6 +184,148 @@ def test_compute_heatmap_signal_mean_mode_uses_average_value():
     assert signal[5] > signal[3]
 
 
+def reference_heatmap_signal(projected, *, span, mode, sigma):
+    """The original point-by-point heatmap signal, for comparison."""
+    numerator = [0.0] * span
+    denominator = [0.0] * span
+    for _, x_value, value in projected:
+        for index in range(span):
+            weight = math.exp(-((index - x_value) ** 2) / (2.0 * sigma**2))
+            denominator[index] += weight
+            numerator[index] += weight if mode == "count" else weight * value
+    if mode == "mean":
+        raw = [n / d if d else 0.0 for n, d in zip(numerator, denominator)]
+    else:
+        raw = numerator
+    high = max(raw)
+    return [value / high if high > 0 else 0.0 for value in raw]
+
+
+def random_projection(count, span, seed):
+    """Return random projected points on whole and fractional positions."""
+    rng = np.random.default_rng(seed)
+    positions = np.r_[
+        rng.integers(0, span, count - 5), rng.uniform(0, span - 1, 5)
+    ]
+    return [
+        (str(2000 + int(row)), float(x_value), float(value))
+        for row, x_value, value in zip(
+            rng.integers(0, 12, count), positions, rng.normal(5, 3, count)
+        )
+    ]
+
+
+@pytest.mark.parametrize("mode", ["sum", "mean", "count"])
+@pytest.mark.parametrize("span,sigma", [(366, 10.0), (31, 2.0), (7, 0.75)])
+def test_compute_heatmap_signal_matches_reference(mode, span, sigma):
+    """The vectorized signal should equal the point-by-point one."""
+    projected = random_projection(400, span, seed=span)
+
+    signal = seasonal.compute_heatmap_signal(
+        projected, span=span, mode=mode, sigma=sigma
+    )
+
+    expected = reference_heatmap_signal(
+        projected, span=span, mode=mode, sigma=sigma
+    )
+    assert signal == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_compute_heatmap_signal_edge_cases():
+    """Empty input and bad settings should behave as before."""
+    assert seasonal.compute_heatmap_signal(
+        [], span=3, mode="sum", sigma=1.0
+    ) == [0.0, 0.0, 0.0]
+    assert seasonal.compute_heatmap_signal(
+        [("2024", 1.0, -2.0)], span=3, mode="sum", sigma=1.0
+    ) == [0.0, 0.0, 0.0]
+    with pytest.raises(ValueError):
+        seasonal.compute_heatmap_signal(
+            [("2024", 1.0, 1.0)], span=3, mode="sum", sigma=0.0
+        )
+    with pytest.raises(ValueError):
+        seasonal.compute_heatmap_signal(
+            [("2024", 1.0, 1.0)], span=3, mode="median", sigma=1.0
+        )
+
+
+def reference_evolving_heatmap(
+    projected, *, row_positions, row_count, span, mode, sigma_x, sigma_y
+):
+    """The original point-by-point evolving heatmap, for comparison.
+
+    Row weights beyond the truncation radius are zero, as in
+    :func:`seasonal.smooth_rows`.
+    """
+    radius = math.ceil(seasonal.ROW_KERNEL_TRUNCATE * sigma_y)
+
+    def weight(distance, sigma):
+        return math.exp(-(distance**2) / (2.0 * sigma**2))
+
+    def row_weight(distance):
+        return weight(distance, sigma_y) if abs(distance) <= radius else 0.0
+
+    numerator = [[0.0] * span for _ in range(row_count)]
+    denominator = [[0.0] * span for _ in range(row_count)]
+    for row_key, x_value, value in projected:
+        point_row = row_positions[row_key]
+        for row in range(row_count):
+            for column in range(span):
+                cell = row_weight(row - point_row) * weight(
+                    column - x_value, sigma_x
+                )
+                denominator[row][column] += cell
+                numerator[row][column] += (
+                    cell if mode == "count" else cell * value
+                )
+    if mode == "mean":
+        raw = [
+            [n / d if d else 0.0 for n, d in zip(num_row, den_row)]
+            for num_row, den_row in zip(numerator, denominator)
+        ]
+    else:
+        raw = numerator
+    high = max(value for row in raw for value in row)
+    return [
+        [value / high if high > 0 else 0.0 for value in row] for row in raw
+    ]
+
+
+@pytest.mark.parametrize("mode", ["sum", "mean", "count"])
+def test_compute_evolving_heatmap_matches_reference(mode):
+    """The separable heatmap should equal the point-by-point one."""
+    projected = random_projection(150, 31, seed=3)
+    row_positions = {str(2000 + row): 11 - row for row in range(12)}
+    settings = dict(
+        row_positions=row_positions,
+        row_count=12,
+        span=31,
+        mode=mode,
+        sigma_x=2.0,
+        sigma_y=0.75,
+    )
+
+    image = seasonal.compute_evolving_heatmap(projected, **settings)
+
+    expected = reference_evolving_heatmap(projected, **settings)
+    assert np.allclose(image, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_smooth_rows_truncates_kernel():
+    """Rows beyond the truncation radius receive no weight."""
+    grid = np.zeros((30, 2))
+    grid[0, 0] = 1.0
+    grid[29, 1] = 2.0
+
+    smoothed = seasonal.smooth_rows(grid, 1.0)
+
+    radius = math.ceil(seasonal.ROW_KERNEL_TRUNCATE)
+    offsets = np.arange(30)
+    expected = np.where(offsets <= radius, np.exp(-(offsets**2) / 2.0), 0.0)
+    assert np.allclose(smoothed[:, 0], expected)
+    assert np.allclose(smoothed[:, 1], 2.0 * expected[::-1])
+
+
 def test_compute_evolving_heatmap_preserves_row_shift():
     """Evolving heatmaps should retain a gradual seasonal shift."""
     projected = [
@@ -109,6 +349,67 @@ def test_compute_evolving_heatmap_preserves_row_shift():
     assert peaks == [8, 10, 12]
 
 
+@pytest.mark.parametrize("mode", ["sum", "mean", "count"])
+@pytest.mark.parametrize("sigma_x", [0.5, 3.0])
+def test_smooth_heatmap_matches_direct_computation(mode, sigma_x):
+    """Smoothing a cached grid equals smoothing the points directly."""
+    rng = np.random.default_rng(5)
+    codes = rng.integers(2001, 2010, size=300)
+    x_values = rng.integers(0, 31, size=300).astype(float)
+    values = rng.uniform(0.5, 4.0, size=300)
+    # Plot rows may include years without points in this grid.
+    row_codes = np.arange(2012, 1999, -1)
+    rows = len(row_codes) - 1 - (codes - 2000)
+    settings = dict(span=31, mode=mode, sigma_x=sigma_x, sigma_y=0.75)
+
+    grid = seasonal.heatmap_grid(codes, x_values, values)
+
+    evolving = seasonal.smooth_heatmap(
+        grid, row_codes=row_codes, style="evolving", **settings
+    )
+    expected = seasonal.evolving_heatmap(
+        rows, x_values, values, row_count=len(row_codes), **settings
+    )
+    assert np.allclose(evolving, expected, rtol=1e-9, atol=1e-12)
+    collapsed = seasonal.smooth_heatmap(
+        grid, row_codes=row_codes, style="seasonal", **settings
+    )
+    signal = seasonal.heatmap_signal(
+        x_values, values, span=31, mode=mode, sigma=sigma_x
+    )
+    assert np.allclose(collapsed, [signal, signal], rtol=1e-9, atol=1e-12)
+
+
+def test_main_reuses_cached_heatmap_grid(tmp_path, monkeypatch):
+    """Changing only the smoothing reuses the cached heatmap grid."""
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    (data_dir / "rain").write_text(
+        "2023-05-01\t1\n2024-05-03\t2\n2024-06-01\t4\n", encoding="utf8"
+    )
+    monkeypatch.setenv("TSD", str(data_dir))
+    monkeypatch.delenv("TSD_DIR", raising=False)
+    parser = seasonal.create_parser()
+
+    def render(*arguments):
+        args = parser.parse_args(["rain", "--heatmap", *arguments])
+        return seasonal.render(parser, args).axes[0].images[0].get_array()
+
+    first = render("--heatmap-style", "evolving")
+    fresh = render("--heatmap-sigma", "4", "--heatmap-mode", "mean")
+
+    def fail(*args):
+        raise AssertionError("heatmap grid recomputed despite cache")
+
+    monkeypatch.setattr(seasonal, "heatmap_grid", fail)
+    np.testing.assert_allclose(render("--heatmap-style", "evolving"), first)
+    np.testing.assert_allclose(
+        render("--heatmap-sigma", "4", "--heatmap-mode", "mean"), fresh
+    )
+    with pytest.raises(AssertionError):
+        render("--no-cache")
+
+
 def test_plot_seasonal_series_adds_month_lines_for_year_view():
     """Year plots should include the default month-boundary guides."""
     series = [
@@ -300,3 +601,189 @@ def test_month_and_week_axes_skip_month_lines():
 
     assert len(month_figure.axes[0].lines) == 0
     assert len(week_figure.axes[0].lines) == 0
+
+
+def test_plot_seasonal_series_density_counts_points():
+    """Density mode should draw one image cell per row and day."""
+    start = dt.date(2023, 1, 1)
+    series = [
+        seasonal.SeriesData(
+            label=label,
+            filename=label,
+            points=[
+                (start + dt.timedelta(days=day), 1.0) for day in range(730)
+            ],
+        )
+        for label in ("a", "b")
+    ]
+
+    figure = seasonal.plot_seasonal_series(
+        series,
+        period="year",
+        title="Density",
+        color=None,
+        min_size=5.0,
+        max_size=10.0,
+        alpha=0.75,
+        heatmap=False,
+        heatmap_style="seasonal",
+        heatmap_mode="sum",
+        heatmap_sigma_x=10.0,
+        heatmap_sigma_y=0.75,
+        heatmap_alpha=0.35,
+        show_month_lines=False,
+        density=True,
+        log_density=True,
+    )
+
+    axis = figure.axes[0]
+    assert len(axis.collections) == 0
+    counts = axis.images[0].get_array()
+    assert counts.shape == (2, 366)
+    assert counts.min() == 2 and counts.max() == 2
+    assert axis.get_legend() is None
+
+
+def test_presence_matrix_counts_days_with_values():
+    """Presence counts points equal to 1 per year and day of year."""
+    dates = [
+        dt.date(2021, 3, 1),
+        dt.date(2021, 3, 1),
+        dt.date(2021, 3, 2),
+        dt.date(2023, 12, 31),
+        dt.date(2024, 12, 31),
+        dt.date(2024, 7, 4),
+    ]
+    series = seasonal.SeriesData(
+        label="demo",
+        filename="demo",
+        points=list(zip(dates, [1.0, 1.0, 2.0, 1.0, 1.0, 0.0])),
+    )
+
+    years, matrix = seasonal.presence_matrix(*seasonal.series_arrays(series))
+
+    expected = np.zeros((4, 366))
+    expected[0, 59] = 2
+    expected[2, 364] = 1
+    expected[3, 365] = 1
+    assert years.tolist() == [2021, 2022, 2023, 2024]
+    np.testing.assert_array_equal(matrix, expected)
+
+
+def test_merge_presence_aligns_years():
+    """Merged presence spans all years and adds overlapping counts."""
+    first = (np.array([2020, 2021]), np.ones((2, 366)))
+    second = (np.array([2021, 2022, 2023]), np.full((3, 366), 2.0))
+
+    years, matrix = seasonal.merge_presence(
+        [first, (np.zeros(0), np.zeros((0, 366))), second]
+    )
+
+    assert years.tolist() == [2020, 2021, 2022, 2023]
+    assert matrix[:, 0].tolist() == [1.0, 3.0, 2.0, 2.0]
+
+
+def test_load_presence_caches_each_file(tmp_path, monkeypatch):
+    """An unchanged file's presence matrix is read from the cache."""
+    (tmp_path / "walk").write_text(
+        "2022-01-02\t1\n2023-01-02\t1\n", encoding="utf8"
+    )
+    specs = [("walk", "walk")]
+
+    years, matrix = seasonal.load_presence(specs, tmp_path)
+
+    def fail(*args):
+        raise AssertionError("series read despite cached presence")
+
+    monkeypatch.setattr(seasonal, "read_series", fail)
+    cached_years, cached_matrix = seasonal.load_presence(specs, tmp_path)
+    np.testing.assert_array_equal(cached_years, years)
+    np.testing.assert_array_equal(cached_matrix, matrix)
+    with pytest.raises(AssertionError):
+        seasonal.load_presence(specs, tmp_path, use_cache=False)
+
+
+def test_main_presence_draws_one_image(tmp_path, monkeypatch):
+    """Presence mode draws a single image and no scatter points."""
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    (data_dir / "walk").write_text(
+        "2022-01-02\t1\n2024-02-29\t1\n", encoding="utf8"
+    )
+    monkeypatch.setenv("TSD", str(data_dir))
+    monkeypatch.delenv("TSD_DIR", raising=False)
+    parser = seasonal.create_parser()
+
+    figure = seasonal.render(parser, parser.parse_args(["walk", "--pres"]))
+
+    axis = figure.axes[0]
+    assert len(axis.collections) == 0
+    assert len(axis.images) == 1
+    assert axis.images[0].get_array().shape == (3, 366)
+    with pytest.raises(SystemExit):
+        seasonal.main(["walk", "--presence", "--period", "month"])
+    with pytest.raises(SystemExit):
+        seasonal.main(["walk", "--presence", "--heatmap"])
+
+
+def test_plot_seasonal_grid_shares_rows_across_panels():
+    """Grid mode draws one panel per series on the rows of all series."""
+    series = [
+        seasonal.SeriesData(
+            label=f"s{index}",
+            filename=f"s{index}",
+            points=[
+                (dt.date(2020 + index, 1, 1) + dt.timedelta(days=day), 1.0)
+                for day in range(0, 400, 20)
+            ],
+        )
+        for index in range(5)
+    ]
+
+    figure = seasonal.plot_seasonal_grid(
+        series,
+        period="year",
+        title="Grid",
+        color=None,
+        min_size=2.0,
+        max_size=4.0,
+        alpha=0.75,
+        heatmap=True,
+        heatmap_style="evolving",
+        heatmap_mode="count",
+        heatmap_sigma_x=10.0,
+        heatmap_sigma_y=0.75,
+        heatmap_alpha=0.35,
+        show_month_lines=True,
+        rasterize=True,
+    )
+
+    visible = [axis for axis in figure.axes if axis.get_visible()]
+    assert len(figure.axes) == 6 and len(visible) == 5
+    assert [axis.get_title() for axis in visible] == [
+        "s0",
+        "s1",
+        "s2",
+        "s3",
+        "s4",
+    ]
+    labels = [label.get_text() for label in visible[0].get_yticklabels()]
+    assert labels == [str(year) for year in range(2025, 2019, -1)]
+    for axis in visible:
+        (points,) = axis.collections
+        assert points.get_rasterized()
+        assert axis.images[0].get_array().shape == (6, 366)
+        assert axis.get_ylim() == visible[0].get_ylim()
+
+
+def test_main_grid_rejects_sum(tmp_path, monkeypatch):
+    """Grid mode plots series separately, so it cannot sum them."""
+    data_dir = tmp_path / "tsd"
+    data_dir.mkdir()
+    (data_dir / "rain").write_text("2024-01-01\t1\n", encoding="utf8")
+    monkeypatch.setenv("TSD", str(data_dir))
+    monkeypatch.delenv("TSD_DIR", raising=False)
+
+    seasonal.main(["rain", "rain", "--grid", "--rasterize"])
+    with pytest.raises(SystemExit):
+        seasonal.main(["rain", "--grid", "--sum"])